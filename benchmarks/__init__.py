@@ -0,0 +1,10 @@
+"""
+Performance benchmarks for the verification pipeline.
+
+Usage:
+    python -m benchmarks.run -o results.json
+    python -m benchmarks.run -o results.json --baseline benchmarks/baseline.json
+    python -m benchmarks.compare results.json benchmarks/baseline.json
+    python -m benchmarks.loadgen --requests 500 --concurrency 16 --dummy
+    python -m benchmarks.import_time
+"""
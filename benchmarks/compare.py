@@ -0,0 +1,99 @@
+"""
+Compare benchmark results against a saved baseline.
+
+Usage:
+    python -m benchmarks.compare results.json baseline.json [--threshold 0.25]
+
+Exits with status 1 if any benchmark regressed.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+# Statistic compared between runs; the median is robust to scheduler noise
+COMPARE_METRIC = "p50_ms"
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = 0.25) -> Dict:
+    """
+    Compare two benchmark result documents.
+
+    Args:
+        current: Results from benchmarks.run
+        baseline: Saved baseline results
+        threshold: Relative slowdown that counts as a regression (0.25 = 25%)
+
+    Returns:
+        Dictionary with "regressions", "improvements", "unchanged" (lists of
+        {name, baseline_ms, current_ms, ratio}) and "missing"/"new" (names)
+    """
+    current_results = current["results"]
+    baseline_results = baseline["results"]
+    report = {"regressions": [], "improvements": [], "unchanged": [], "missing": [], "new": []}
+
+    for name, base in baseline_results.items():
+        if "skipped" in base:
+            continue
+        result = current_results.get(name)
+        if result is None or "skipped" in result:
+            report["missing"].append(name)
+            continue
+
+        ratio = result[COMPARE_METRIC] / base[COMPARE_METRIC] if base[COMPARE_METRIC] else 1.0
+        entry = {
+            "name": name,
+            "baseline_ms": base[COMPARE_METRIC],
+            "current_ms": result[COMPARE_METRIC],
+            "ratio": ratio
+        }
+        if ratio > 1 + threshold:
+            report["regressions"].append(entry)
+        elif ratio < 1 / (1 + threshold):
+            report["improvements"].append(entry)
+        else:
+            report["unchanged"].append(entry)
+
+    report["new"] = [name for name in current_results if name not in baseline_results]
+    return report
+
+def format_report(report: Dict) -> str:
+    """Render a comparison report as text."""
+    lines = []
+    for title, key in (("Regressions", "regressions"), ("Improvements", "improvements")):
+        if report[key]:
+            lines.append(f"{title}:")
+            for entry in sorted(report[key], key=lambda e: -abs(e["ratio"] - 1)):
+                lines.append(
+                    f"  {entry['name']}: {entry['baseline_ms']:.2f} ms -> "
+                    f"{entry['current_ms']:.2f} ms ({entry['ratio']:.2f}x)"
+                )
+    if report["missing"]:
+        lines.append(f"Missing from current run: {', '.join(report['missing'])}")
+    lines.append(
+        f"{len(report['regressions'])} regressed, {len(report['improvements'])} improved, "
+        f"{len(report['unchanged'])} unchanged"
+    )
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare",
+        description="Compare benchmark results against a baseline."
+    )
+    parser.add_argument("current", help="Results JSON from benchmarks.run")
+    parser.add_argument("baseline", help="Baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    with open(args.current) as f:
+        current = json.load(f)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    report = compare_results(current, baseline, args.threshold)
+    print(format_report(report))
+    return 1 if report["regressions"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Deterministic synthetic inputs for benchmarks and tests.
+
+Images are smooth random colour fields with mild per-pixel noise, which
+compress like photos rather than like flat colour, so encoded sizes and
+decode costs are realistic. Everything is derived from a seed: the same
+spec always produces the same bytes on the same Pillow version.
+"""
+import io
+import random
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+import numpy as np
+from PIL import ExifTags, Image
+from PIL.TiffImagePlugin import IFDRational
+
+# Named resolutions, from a small upload to a 12MP phone photo
+RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "640px": (640, 480),
+    "2mp": (1600, 1200),
+    "5mp": (2592, 1944),
+    "12mp": (4000, 3000)
+}
+
+# Tokyo Central Park Recycling Center, so GPS images resolve to a known location
+DEFAULT_GPS = (35.682839, 139.759455)
+
+# Bounding box of synthetic location catalogs (roughly Honshu)
+CATALOG_BOUNDS = ((33.5, 41.5), (130.5, 142.0))
+
+class ImageSpec(NamedTuple):
+    resolution: str
+    format: str  # 'JPEG' or 'PNG'
+    gps: bool
+
+    @property
+    def name(self) -> str:
+        return f"{self.format.lower()}-{self.resolution}-{'gps' if self.gps else 'nogps'}"
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return RESOLUTIONS[self.resolution]
+
+def image_specs(resolutions: Optional[List[str]] = None) -> List[ImageSpec]:
+    """
+    Corpus matrix: JPEG with and without GPS EXIF, and PNG without.
+
+    exifread does not read EXIF from PNG, so a PNG with GPS tags would
+    behave exactly like one without.
+
+    Args:
+        resolutions: Names from RESOLUTIONS (defaults to all)
+
+    Returns:
+        List of image specs
+    """
+    specs = []
+    for resolution in resolutions or list(RESOLUTIONS):
+        specs.append(ImageSpec(resolution, "JPEG", True))
+        specs.append(ImageSpec(resolution, "JPEG", False))
+        specs.append(ImageSpec(resolution, "PNG", False))
+    return specs
+
+def _to_dms(value: float) -> Tuple[IFDRational, IFDRational, IFDRational]:
+    value = abs(value)
+    degrees = int(value)
+    minutes = int((value - degrees) * 60)
+    seconds = round((value - degrees - minutes / 60) * 3600 * 100)
+    return IFDRational(degrees), IFDRational(minutes), IFDRational(seconds, 100)
+
+def gps_exif(coordinates: Tuple[float, float]) -> Image.Exif:
+    """Build EXIF data with a GPS IFD for the given (lat, lng)."""
+    lat, lng = coordinates
+    exif = Image.Exif()
+    exif[ExifTags.Base.Make] = "EcoWander"
+    exif.get_ifd(ExifTags.IFD.GPSInfo).update({
+        ExifTags.GPS.GPSLatitudeRef: 'N' if lat >= 0 else 'S',
+        ExifTags.GPS.GPSLatitude: _to_dms(lat),
+        ExifTags.GPS.GPSLongitudeRef: 'E' if lng >= 0 else 'W',
+        ExifTags.GPS.GPSLongitude: _to_dms(lng)
+    })
+    return exif
+
+def synthetic_image(size: Tuple[int, int], seed: int = 0) -> Image.Image:
+    """
+    Generate a photo-like RGB image.
+
+    Args:
+        size: (width, height)
+        seed: Random seed
+
+    Returns:
+        RGB image
+    """
+    width, height = size
+    rng = np.random.default_rng(seed)
+
+    # Low-frequency colour field, upscaled, plus fine grain
+    coarse = rng.integers(0, 256, size=(12, 16, 3), dtype=np.uint8)
+    field = np.asarray(Image.fromarray(coarse).resize(size, Image.BICUBIC), dtype=np.int16)
+    grain = rng.integers(-12, 13, size=(height, width, 1), dtype=np.int16)
+    return Image.fromarray(np.clip(field + grain, 0, 255).astype(np.uint8))
+
+def encode_image(
+    spec: ImageSpec,
+    seed: int = 0,
+    coordinates: Tuple[float, float] = DEFAULT_GPS,
+    quality: int = 90
+) -> bytes:
+    """
+    Encode a synthetic image for a spec.
+
+    Args:
+        spec: Image spec
+        seed: Random seed
+        coordinates: GPS position written when spec.gps is set
+        quality: JPEG quality
+
+    Returns:
+        Encoded image bytes
+    """
+    img = synthetic_image(spec.size, seed)
+    options = {"exif": gps_exif(coordinates)} if spec.gps else {}
+    if spec.format == "JPEG":
+        options["quality"] = quality
+
+    buffer = io.BytesIO()
+    img.save(buffer, spec.format, **options)
+    return buffer.getvalue()
+
+def build_corpus(specs: List[ImageSpec], seed: int = 0) -> Iterator[Tuple[ImageSpec, bytes]]:
+    """Yield (spec, encoded bytes) for each spec, generated lazily."""
+    for spec in specs:
+        yield spec, encode_image(spec, seed)
+
+def write_corpus(output_dir: str, specs: List[ImageSpec], seed: int = 0) -> List[Path]:
+    """
+    Write the corpus to files named after each spec.
+
+    Args:
+        output_dir: Directory to write to
+        specs: Image specs
+        seed: Random seed
+
+    Returns:
+        Paths of the written files
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for spec, data in build_corpus(specs, seed):
+        path = output_dir / f"{spec.name}.{'jpg' if spec.format == 'JPEG' else 'png'}"
+        path.write_bytes(data)
+        paths.append(path)
+    return paths
+
+def synthetic_catalog(size: int, seed: int = 0) -> List[Dict]:
+    """
+    Generate an eco-location catalog of the given size.
+
+    Args:
+        size: Number of locations
+        seed: Random seed
+
+    Returns:
+        List of eco-location dictionaries, as accepted by get_nearest_eco_location
+    """
+    rng = random.Random(seed)
+    (lat_min, lat_max), (lng_min, lng_max) = CATALOG_BOUNDS
+    challenge_types = ["recycling", "waste_management", "cherry_blossom", "nature_conservation"]
+
+    return [
+        {
+            "name": f"Synthetic Location {i}",
+            "coordinates": (rng.uniform(lat_min, lat_max), rng.uniform(lng_min, lng_max)),
+            "radius_meters": rng.choice([30, 50, 100, 200]),
+            "challenge_types": rng.sample(challenge_types, 2),
+            "description": "Synthetic benchmark location"
+        }
+        for i in range(size)
+    ]
@@ -0,0 +1,134 @@
+"""
+Import-time benchmark.
+
+Imports each module in a fresh interpreter with ``-X importtime``, reports
+its cumulative import time, and fails if it pulls in a heavy dependency it
+should only load on first use (TensorFlow, geopy, FastAPI...).
+
+Usage:
+    python -m benchmarks.import_time -o imports.json [--baseline baseline.json]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List, Optional
+from benchmarks.compare import compare_results, format_report
+from benchmarks.timing import summarize
+
+# Modules that short-lived tools import, and third-party packages each must
+# not load at import time
+IMPORT_BUDGETS: Dict[str, List[str]] = {
+    "ecowander.config.eco_locations": ["tensorflow", "geopy", "exifread", "PIL", "numpy"],
+    "ecowander.verification": ["tensorflow", "geopy", "exifread", "PIL", "numpy", "pydantic"],
+    "ecowander.verification.models": ["tensorflow", "geopy", "exifread", "PIL", "numpy"],
+    "ecowander.verification.photo_verifier": ["tensorflow", "geopy", "exifread"],
+    "ecowander.verification.model_registry": ["tensorflow", "geopy", "exifread", "PIL"],
+    "ecowander.verification.location_verifier": ["tensorflow", "geopy", "exifread"],
+    "ecowander.verification.fraud_detector": ["tensorflow", "geopy", "exifread"],
+    "ecowander.services.hashing_service": ["tensorflow", "geopy", "exifread"],
+    "ecowander.services.geo_utils": ["tensorflow", "geopy", "exifread", "PIL", "numpy"],
+    "ecowander.storage.queries": ["tensorflow", "geopy", "PIL", "numpy", "pydantic"],
+    "ecowander.batch": ["tensorflow", "geopy", "exifread", "PIL", "numpy", "pydantic"],
+    "ecowander.api.endpoints": ["tensorflow", "geopy", "exifread"]
+}
+
+def import_profile(module: str) -> Dict:
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        Dictionary with the cumulative import time in ms and the set of
+        top-level packages that were imported
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+
+    total_us = None
+    packages = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        name = name.strip()
+        packages.add(name.split(".")[0])
+        if name == module:
+            total_us = int(cumulative)
+
+    return {"ms": (total_us or 0) / 1000, "packages": packages}
+
+def run_import_benchmarks(
+    modules: Optional[List[str]] = None,
+    repeats: int = 5
+) -> Dict:
+    """
+    Measure import time of each module and check for forbidden imports.
+
+    Args:
+        modules: Modules to measure (defaults to IMPORT_BUDGETS)
+        repeats: Fresh interpreters per module
+
+    Returns:
+        Results document (see benchmarks.run) whose results also carry
+        the forbidden packages each module imported
+    """
+    results = {}
+    for module in modules or list(IMPORT_BUDGETS):
+        samples = [import_profile(module) for _ in range(max(1, repeats))]
+        forbidden = sorted(samples[0]["packages"] & set(IMPORT_BUDGETS.get(module, [])))
+        results[f"import[{module}]"] = {
+            **summarize([sample["ms"] for sample in samples]),
+            "forbidden_imports": forbidden
+        }
+
+    return {
+        "environment": {"python": sys.version.split()[0], "executable": sys.executable},
+        "config": {"repeats": repeats},
+        "results": results
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.import_time",
+        description="Measure module import times and check for eager heavy imports."
+    )
+    parser.add_argument("modules", nargs="*", help="Modules to measure (default: all budgeted)")
+    parser.add_argument("-o", "--output", help="Results JSON file")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--baseline", help="Compare against this baseline results file")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_import_benchmarks(args.modules or None, args.repeats)
+    status = 0
+    for name, result in results["results"].items():
+        line = f"{name}: {result['p50_ms']:.1f} ms"
+        if result["forbidden_imports"]:
+            line += f"  FORBIDDEN: {', '.join(result['forbidden_imports'])}"
+            status = 1
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report = compare_results(results, baseline, args.threshold)
+        print(format_report(report))
+        if report["regressions"]:
+            status = 1
+
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,383 @@
+"""
+Closed-loop load generator for the verification pipeline.
+
+Replays a synthetic mix of submissions (image sizes, GPS EXIF share,
+challenge types and duplicate rate) against either the in-process
+EcoActionVerifier or a running HTTP server, with at most ``concurrency``
+requests outstanding and an optional target arrival rate. Reports
+throughput, latency percentiles, CPU time and peak RSS.
+
+When a rate is set, latency is measured from each request's scheduled
+start rather than from when a worker got round to sending it, so a
+saturated system shows up as growing latency instead of a silently lower
+offered load.
+
+Usage:
+    python -m benchmarks.loadgen --requests 500 --concurrency 16 --dummy --dummy-latency 0.02
+    python -m benchmarks.loadgen --url http://127.0.0.1:8000 --rate 40 --server-pid 1234
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from benchmarks.corpus import DEFAULT_GPS, ImageSpec, encode_image
+from benchmarks.timing import summarize
+
+class Workload(NamedTuple):
+    requests: int = 200
+    duplicate_rate: float = 0.1  # share of submissions re-sending an earlier image
+    exif_share: float = 0.7  # share of images carrying GPS EXIF
+    resolution_mix: Dict[str, float] = {"640px": 0.3, "2mp": 0.4, "5mp": 0.2, "12mp": 0.1}
+    challenge_mix: Dict[str, float] = {"recycling": 0.6, "cherry_blossom": 0.2, "nature_conservation": 0.2}
+    unique_images: Optional[int] = None  # cap on distinct images per (resolution, EXIF) class
+    users: int = 50
+
+class Submission(NamedTuple):
+    image: bytes
+    spec: ImageSpec
+    challenge_type: str
+    location: Tuple[float, float]
+    user_id: str
+    duplicate: bool
+
+def build_plan(workload: Workload, seed: int = 0) -> List[Submission]:
+    """
+    Build a deterministic submission sequence for a workload.
+
+    Every non-duplicate submission gets a freshly generated image unless
+    ``unique_images`` caps the images per (resolution, EXIF) class, which
+    bounds corpus memory for long runs with large images. Past the cap
+    images are re-sent, so the duplicate rate the pipeline observes can
+    exceed ``duplicate_rate``; run_load() reports both.
+
+    Args:
+        workload: Workload mix
+        seed: Random seed
+
+    Returns:
+        List of submissions in send order
+    """
+    rng = random.Random(seed)
+    resolutions, resolution_weights = zip(*workload.resolution_mix.items())
+    challenges, challenge_weights = zip(*workload.challenge_mix.items())
+
+    pools: Dict[ImageSpec, List[bytes]] = {}
+    sent: List[Tuple[ImageSpec, bytes]] = []
+    plan = []
+    generated = 0
+
+    for i in range(workload.requests):
+        duplicate = bool(sent) and rng.random() < workload.duplicate_rate
+        if duplicate:
+            spec, image = rng.choice(sent)
+        else:
+            resolution = rng.choices(resolutions, resolution_weights)[0]
+            spec = ImageSpec(resolution, "JPEG", rng.random() < workload.exif_share)
+            pool = pools.setdefault(spec, [])
+            if workload.unique_images is None or len(pool) < workload.unique_images:
+                generated += 1
+                image = encode_image(spec, seed=seed * 1_000_000 + generated)
+                pool.append(image)
+            else:
+                image = pool[i % len(pool)]
+            sent.append((spec, image))
+
+        # Users stand within ~20 m of the reference location
+        location = (
+            DEFAULT_GPS[0] + rng.uniform(-0.0002, 0.0002),
+            DEFAULT_GPS[1] + rng.uniform(-0.0002, 0.0002)
+        )
+        plan.append(Submission(
+            image=image,
+            spec=spec,
+            challenge_type=rng.choices(challenges, challenge_weights)[0],
+            location=location,
+            user_id=f"load-user-{rng.randrange(workload.users)}",
+            duplicate=duplicate
+        ))
+
+    return plan
+
+class InProcessTarget:
+    """Sends submissions to an EcoActionVerifier in this process."""
+
+    def __init__(self, verifier, timeout: Optional[float] = None):
+        """
+        Args:
+            verifier: EcoActionVerifier to call
+            timeout: Per-request deadline in seconds, as the API applies
+                (None for no deadline)
+        """
+        self.verifier = verifier
+        self.timeout = timeout
+
+    async def __call__(self, submission: Submission) -> Dict:
+        from ecowander.services.deadline import Deadline
+
+        try:
+            result = await self.verifier.verify_eco_action_async(
+                submission.image,
+                submission.location,
+                submission.challenge_type,
+                user_id=submission.user_id,
+                deadline=Deadline(self.timeout)
+            )
+        except Exception as e:
+            return {"status": type(e).__name__}
+        return _outcome(result)
+
+    async def close(self) -> None:
+        pass
+
+class HttpTarget:
+    """Sends submissions to a running verification server."""
+
+    def __init__(self, url: str, timeout: float = 60.0, client=None):
+        """
+        Args:
+            url: Server base URL, e.g. http://127.0.0.1:8000
+            timeout: Per-request timeout in seconds
+            client: httpx.AsyncClient to use instead of creating one
+        """
+        if client is None:
+            try:
+                import httpx
+            except ImportError:
+                raise RuntimeError("HTTP load tests require httpx (pip install httpx)")
+            client = httpx.AsyncClient(base_url=url, timeout=timeout)
+        self.client = client
+
+    async def __call__(self, submission: Submission) -> Dict:
+        try:
+            response = await self.client.post(
+                "/verify",
+                params={
+                    "lat": submission.location[0],
+                    "lng": submission.location[1],
+                    "challenge_type": submission.challenge_type,
+                    "user_id": submission.user_id
+                },
+                content=submission.image,
+                headers={"Content-Type": "image/jpeg"}
+            )
+        except Exception as e:
+            return {"status": type(e).__name__}
+
+        if response.status_code != 200:
+            return {"status": str(response.status_code)}
+        return _outcome(response.json())
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+def _outcome(result: Dict) -> Dict:
+    return {
+        "status": "ok",
+        "verified": bool(result["is_verified"]),
+        "duplicate": bool(result["fraud_detection"].get("is_duplicate")),
+        "partial": bool(result.get("timed_out")),
+        "tier": result.get("tier", 0)
+    }
+
+def process_usage(pid: Optional[int] = None) -> Optional[Dict]:
+    """
+    CPU seconds and peak RSS of a process.
+
+    Args:
+        pid: Process to inspect (defaults to this one); other processes
+            are read from /proc and are only supported on Linux
+
+    Returns:
+        Dictionary with cpu_seconds and peak_rss_mb, or None if unavailable
+    """
+    if pid is None or pid == os.getpid():
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return {"cpu_seconds": usage.ru_utime + usage.ru_stime, "peak_rss_mb": usage.ru_maxrss / scale}
+
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Fields after the parenthesized command name; utime and stime are 14 and 15
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/status") as f:
+            peak_kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        return None
+
+    ticks = os.sysconf("SC_CLK_TCK")
+    return {"cpu_seconds": (int(fields[11]) + int(fields[12])) / ticks, "peak_rss_mb": peak_kb / 1024}
+
+def _usage_report(before: Optional[Dict], after: Optional[Dict], duration: float) -> Optional[Dict]:
+    if before is None or after is None:
+        return None
+    cpu_seconds = after["cpu_seconds"] - before["cpu_seconds"]
+    return {
+        "cpu_seconds": cpu_seconds,
+        "cpu_percent": 100 * cpu_seconds / duration if duration else 0.0,
+        "peak_rss_mb": after["peak_rss_mb"]
+    }
+
+async def run_load(
+    target,
+    plan: List[Submission],
+    concurrency: int = 8,
+    rate: Optional[float] = None,
+    server_pid: Optional[int] = None
+) -> Dict:
+    """
+    Drive a target with a submission plan.
+
+    Args:
+        target: InProcessTarget, HttpTarget or any async callable taking a
+            Submission and returning an outcome dictionary
+        plan: Submissions from build_plan()
+        concurrency: Max requests outstanding at once
+        rate: Target arrival rate in requests/second (None = as fast as
+            the concurrency allows)
+        server_pid: Server process whose CPU and memory to report
+
+    Returns:
+        Report with throughput, latency percentiles, outcome counts and
+        client (and server) CPU and peak RSS
+    """
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    tiers: Counter = Counter()
+    verified = duplicates_detected = partial = 0
+    pending = iter(enumerate(plan))
+
+    client_before, server_before = process_usage(), process_usage(server_pid) if server_pid else None
+    started = loop.time()
+
+    async def worker():
+        nonlocal verified, duplicates_detected, partial
+        for index, submission in pending:
+            if rate:
+                scheduled = started + index / rate
+                delay = scheduled - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                scheduled = loop.time()
+
+            outcome = await target(submission)
+            latencies.append((loop.time() - scheduled) * 1000)
+            statuses[outcome["status"]] += 1
+            verified += outcome.get("verified", False)
+            duplicates_detected += outcome.get("duplicate", False)
+            partial += outcome.get("partial", False)
+            if "tier" in outcome:
+                tiers[outcome["tier"]] += 1
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    duration = loop.time() - started
+
+    completed = statuses["ok"]
+    return {
+        "requests": len(plan),
+        "completed": completed,
+        "errors": {status: count for status, count in statuses.items() if status != "ok"},
+        "duration_seconds": duration,
+        "throughput_rps": completed / duration if duration else 0.0,
+        "offered_rate_rps": rate,
+        "concurrency": concurrency,
+        "latency": summarize(latencies) if latencies else None,
+        "verified": verified,
+        "partial": partial,
+        "requests_per_tier": dict(sorted(tiers.items())),
+        "duplicates_sent": sum(s.duplicate for s in plan),
+        "duplicates_detected": duplicates_detected,
+        "client": _usage_report(client_before, process_usage(), duration),
+        "server": _usage_report(server_before, process_usage(server_pid), duration) if server_pid else None
+    }
+
+def _parse_mix(values: Optional[List[str]], default: Dict[str, float]) -> Dict[str, float]:
+    """Parse NAME=WEIGHT arguments into a mix dictionary."""
+    if not values:
+        return default
+    mix = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        mix[name] = float(weight or 1)
+    return mix
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = Workload()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadgen",
+        description="Replay synthetic submissions against the verification pipeline."
+    )
+    parser.add_argument("--url", help="Server base URL (default: verify in this process)")
+    parser.add_argument("--server-pid", type=int, help="Server process to report CPU and RSS for")
+    parser.add_argument("--requests", type=int, default=defaults.requests, help="Submissions to send")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max outstanding requests")
+    parser.add_argument("--rate", type=float, help="Target requests/second (default: unthrottled)")
+    parser.add_argument("--duplicate-rate", type=float, default=defaults.duplicate_rate,
+                        help="Share of submissions re-sending an earlier image")
+    parser.add_argument("--exif-share", type=float, default=defaults.exif_share,
+                        help="Share of images with GPS EXIF")
+    parser.add_argument("--resolutions", nargs="+", metavar="NAME=WEIGHT",
+                        help="Resolution mix, e.g. 640px=0.5 12mp=0.5")
+    parser.add_argument("--challenges", nargs="+", metavar="NAME=WEIGHT",
+                        help="Challenge type mix, e.g. recycling=0.8 cherry_blossom=0.2")
+    parser.add_argument("--unique-images", type=int, default=defaults.unique_images,
+                        help="Cap on distinct images per resolution/EXIF class (default: no cap)")
+    parser.add_argument("--seed", type=int, default=0, help="Workload seed")
+    parser.add_argument("--dummy", action="store_true", help="Use mock photo verification (in-process)")
+    parser.add_argument("--dummy-latency", type=float, help="Simulated inference seconds with --dummy")
+    parser.add_argument("--model", help="Model file (default: MODEL_SETTINGS['model_path'])")
+    parser.add_argument("--timeout", type=float,
+                        help="Per-request deadline in seconds for in-process runs (default: none)")
+    parser.add_argument("-o", "--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    workload = Workload(
+        requests=args.requests,
+        duplicate_rate=args.duplicate_rate,
+        exif_share=args.exif_share,
+        resolution_mix=_parse_mix(args.resolutions, defaults.resolution_mix),
+        challenge_mix=_parse_mix(args.challenges, defaults.challenge_mix),
+        unique_images=args.unique_images
+    )
+    print(f"Generating {workload.requests} submissions...", file=sys.stderr)
+    plan = build_plan(workload, args.seed)
+
+    if args.url:
+        target = HttpTarget(args.url)
+    else:
+        if args.model:
+            from ecowander.config.settings import MODEL_SETTINGS
+            MODEL_SETTINGS["model_path"] = args.model
+        from ecowander.verification.models import EcoActionVerifier
+        verifier = EcoActionVerifier(dummy_mode=args.dummy, dummy_latency=args.dummy_latency)
+        verifier.warmup()
+        target = InProcessTarget(verifier, args.timeout)
+
+    async def run():
+        try:
+            return await run_load(target, plan, args.concurrency, args.rate, args.server_pid)
+        finally:
+            await target.close()
+
+    started = time.monotonic()
+    report = asyncio.run(run())
+    report["workload"] = {**workload._asdict(), "seed": args.seed, "target": args.url or "in-process"}
+    print(f"Finished in {time.monotonic() - started:.1f}s", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
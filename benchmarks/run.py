@@ -0,0 +1,240 @@
+"""
+Time every verification stage on a synthetic corpus.
+
+Stages timed per image: header validation (check_image),
+generate_image_hash, check_image_manipulation, get_image_location and
+photo preprocessing. get_nearest_eco_location is
+timed against catalogs of increasing size, and inference on the model
+input once, as is turning a verification result into its validated API
+response. Results are written as JSON and can be compared against a
+saved baseline (see benchmarks.compare).
+
+Usage:
+    python -m benchmarks.run -o results.json
+    python -m benchmarks.run -o results.json --quick --baseline baseline.json
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import platform
+import sys
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import PIL
+from benchmarks.compare import compare_results, format_report
+from benchmarks.corpus import DEFAULT_GPS, RESOLUTIONS, build_corpus, image_specs, synthetic_catalog
+from benchmarks.timing import measure
+
+CATALOG_SIZES = [10, 100, 1000, 10000, 100000]
+
+QUICK_RESOLUTIONS = ["640px", "2mp"]
+QUICK_CATALOG_SIZES = [10, 100, 1000]
+
+def _environment() -> Dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pillow": PIL.__version__
+    }
+
+def _load_verifier(log: Callable[[str], None]):
+    """Load the photo model, or return None if it is not available."""
+    from ecowander.verification.photo_verifier import PhotoVerifier
+
+    try:
+        verifier = PhotoVerifier()
+        verifier.warmup()
+        return verifier
+    except RuntimeError as e:
+        log(f"Model unavailable, skipping inference: {e}")
+        return None
+
+def _sample_result():
+    """A representative EcoActionResult, built without running the checks."""
+    import time
+    from ecowander.verification.results import (
+        EcoActionResult,
+        FraudResult,
+        LocationResult,
+        PhotoResult
+    )
+
+    labels = ("invalid_action", "valid_recycling", "valid_composting",
+              "valid_conservation", "cherry_blossom_activity")
+    scores = np.array([0.05, 0.8, 0.05, 0.05, 0.05], dtype=np.float32)
+    return EcoActionResult(
+        is_verified=True,
+        overall_score=0.9,
+        photo_verification=PhotoResult(labels, scores, time.time(), is_valid=True),
+        location_verification=LocationResult(
+            score=1.0,
+            distance_meters=12.5,
+            nearest_eco_location={"name": "Imperial Palace East Gardens",
+                                  "coordinates": DEFAULT_GPS},
+            user_coordinates=DEFAULT_GPS,
+            location_source="image",
+            timestamp_valid=True
+        ),
+        fraud_detection=FraudResult(
+            fraud_score=0.0,
+            image_hash="f0e4c2f76c58916e",
+            is_duplicate=False,
+            manipulation_detected={"is_edited": False},
+            user_id="user-1"
+        ),
+        challenge_type="recycling",
+        created_at=time.time()
+    )
+
+def run_benchmarks(
+    resolutions: Optional[List[str]] = None,
+    catalog_sizes: Optional[List[int]] = None,
+    min_time: float = 0.5,
+    seed: int = 0,
+    include_model: bool = True,
+    log: Callable[[str], None] = lambda message: None
+) -> Dict:
+    """
+    Run the benchmark suite.
+
+    Args:
+        resolutions: Image resolutions from corpus.RESOLUTIONS (defaults to all)
+        catalog_sizes: Location catalog sizes (defaults to CATALOG_SIZES)
+        min_time: Seconds to sample each benchmark for
+        seed: Corpus seed
+        include_model: Load the photo model for preprocessing and inference
+        log: Progress callback
+
+    Returns:
+        Results document with "environment", "config" and "results", where
+        results maps "stage[case]" names to latency summaries
+    """
+    from ecowander.services.geo_utils import get_image_location, get_nearest_eco_location
+    from ecowander.services.hashing_service import check_image_manipulation, generate_image_hash
+    from ecowander.services.image_processor import ImagePreprocessor
+    from ecowander.api.schemas import VerificationResponse
+    from ecowander.services.image_validation import check_image
+    from ecowander.config.settings import MODEL_SETTINGS
+
+    # exifread logs a warning for every image without EXIF
+    logging.getLogger("exifread").setLevel(logging.ERROR)
+
+    resolutions = resolutions or list(RESOLUTIONS)
+    catalog_sizes = catalog_sizes or CATALOG_SIZES
+    verifier = _load_verifier(log) if include_model else None
+
+    if verifier is not None:
+        preprocess = verifier._preprocess_image
+    else:
+        # Same decode path PhotoVerifier._preprocess_image uses
+        preprocess = ImagePreprocessor(
+            (MODEL_SETTINGS["input_width"], MODEL_SETTINGS["input_height"]),
+            allowed_formats=('JPEG', 'PNG')
+        ).decode
+
+    results: Dict[str, Dict] = {}
+
+    def record(name: str, fn: Callable, *args, **extra) -> None:
+        results[name] = {**measure(fn, *args, min_time=min_time), **extra}
+        log(f"{name}: p50 {results[name]['p50_ms']:.3f} ms ({results[name]['count']} runs)")
+
+    # Large PNGs exceed the upload byte limit; time the header check without
+    # it so it measures parsing rather than rejection (pixel limits still apply)
+    check_header = functools.partial(check_image, max_bytes=None)
+
+    model_input = None
+    for spec, data in build_corpus(image_specs(resolutions), seed):
+        size = {"bytes": len(data), "pixels": spec.size[0] * spec.size[1]}
+        record(f"check_image[{spec.name}]", check_header, data, **size)
+        record(f"generate_image_hash[{spec.name}]", generate_image_hash, data, **size)
+        record(f"check_image_manipulation[{spec.name}]", check_image_manipulation, data, **size)
+        record(f"get_image_location[{spec.name}]", get_image_location, data, **size)
+        record(f"preprocess_image[{spec.name}]", preprocess, data, **size)
+        if model_input is None and verifier is not None:
+            model_input = verifier._preprocess_image(data)
+
+    for catalog_size in catalog_sizes:
+        catalog = synthetic_catalog(catalog_size, seed)
+        record(
+            f"get_nearest_eco_location[{catalog_size}]",
+            get_nearest_eco_location, DEFAULT_GPS, catalog,
+            locations=catalog_size
+        )
+
+    sample = _sample_result()
+    record("serialize_result[to_dict]", sample.to_dict)
+    record("serialize_result[validate]", VerificationResponse.model_validate, sample.to_dict())
+
+    if verifier is not None:
+        record("inference[batch1]", verifier._run_inference, model_input)
+    else:
+        results["inference[batch1]"] = {"skipped": "model unavailable"}
+
+    return {
+        "created": datetime.now().isoformat(),
+        "environment": _environment(),
+        "config": {
+            "resolutions": resolutions,
+            "catalog_sizes": catalog_sizes,
+            "min_time": min_time,
+            "seed": seed,
+            "model_path": MODEL_SETTINGS["model_path"] if verifier is not None else None
+        },
+        "results": results
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmark verification stages on a synthetic corpus."
+    )
+    parser.add_argument("-o", "--output", required=True, help="Results JSON file")
+    parser.add_argument("--baseline", help="Compare against this baseline results file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative slowdown counted as a regression")
+    parser.add_argument("--quick", action="store_true",
+                        help="Small images and catalogs only")
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS),
+                        help="Image resolutions to benchmark")
+    parser.add_argument("--catalog-sizes", nargs="+", type=int,
+                        help="Location catalog sizes to benchmark")
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="Seconds to sample each benchmark for")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("--model", help="Model file (default: MODEL_SETTINGS['model_path'])")
+    parser.add_argument("--no-model", action="store_true", help="Skip model loading and inference")
+    args = parser.parse_args(argv)
+
+    if args.model:
+        from ecowander.config.settings import MODEL_SETTINGS
+        MODEL_SETTINGS["model_path"] = args.model
+
+    results = run_benchmarks(
+        resolutions=args.resolutions or (QUICK_RESOLUTIONS if args.quick else None),
+        catalog_sizes=args.catalog_sizes or (QUICK_CATALOG_SIZES if args.quick else None),
+        min_time=args.min_time,
+        seed=args.seed,
+        include_model=not args.no_model,
+        log=lambda message: print(message, file=sys.stderr)
+    )
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report = compare_results(results, baseline, args.threshold)
+        print(format_report(report))
+        return 1 if report["regressions"] else 0
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
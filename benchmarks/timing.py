@@ -0,0 +1,64 @@
+import time
+from typing import Callable, Dict, List
+import numpy as np
+
+def summarize(samples_ms: List[float]) -> Dict:
+    """
+    Summarize latency samples.
+
+    Args:
+        samples_ms: Latencies in milliseconds
+
+    Returns:
+        Dictionary with count, min, mean, p50, p95, p99 and max in ms
+    """
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "count": int(samples.size),
+        "min_ms": float(samples.min()),
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(samples.max())
+    }
+
+def measure(
+    fn: Callable,
+    *args,
+    min_time: float = 0.5,
+    max_repeats: int = 200,
+    warmup: int = 1
+) -> Dict:
+    """
+    Time repeated calls of fn(*args).
+
+    Calls are repeated until ``min_time`` seconds have been spent or
+    ``max_repeats`` calls have been made, so cheap stages collect many
+    samples and very slow ones still finish after a single call.
+
+    Args:
+        fn: Function to time
+        *args: Arguments for fn
+        min_time: Seconds to keep sampling for
+        max_repeats: Upper bound on timed calls
+        warmup: Untimed calls made first
+
+    Returns:
+        summarize() of the per-call latencies
+    """
+    for _ in range(warmup):
+        fn(*args)
+
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_repeats:
+        start = time.perf_counter()
+        fn(*args)
+        end = time.perf_counter()
+        samples.append((end - start) * 1000)
+        if end >= deadline:
+            break
+
+    return summarize(samples)
@@ -0,0 +1,95 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from ecowander.config.settings import API_SETTINGS
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; carries the HTTP response details."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """
+    Bounded work queue in front of the verification pipeline.
+    
+    At most ``max_in_flight`` requests run at once and at most ``max_queue``
+    wait for a slot. A request arriving at a full queue is rejected with 429;
+    a queued request that cannot get a slot within ``queue_timeout`` seconds
+    is rejected with 503. Both carry a Retry-After hint.
+    
+    Requests hold a reservation from admit() before their body is read,
+    so uploads in progress count against the same capacity: at most
+    ``max_in_flight + max_queue`` bodies are ever buffered at once.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        retry_after: Optional[int] = None
+    ):
+        self.max_in_flight = max_in_flight or API_SETTINGS["max_in_flight"]
+        self.max_queue = API_SETTINGS["max_queue"] if max_queue is None else max_queue
+        self.queue_timeout = queue_timeout or API_SETTINGS["queue_timeout"]
+        self.retry_after = retry_after or API_SETTINGS["retry_after_seconds"]
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0  # uploading, queued or running
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        return self._slots
+
+    def check(self) -> None:
+        """Fast-path rejection before any request body is read."""
+        if (
+            self.admitted >= self.max_in_flight + self.max_queue or
+            (self.in_flight >= self.max_in_flight and self.queued >= self.max_queue)
+        ):
+            raise AdmissionRejected(429, "Verification queue is full", self.retry_after)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Reserve capacity for a request, from before its upload until it finishes."""
+        self.check()
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.admitted -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a verification slot, waiting in the bounded queue if needed."""
+        slots = self._semaphore()
+        
+        if slots.locked():
+            # Not check(): admitted already counts this request's own
+            # reservation, and admit() bounds the queue through it
+            if self.queued >= self.max_queue:
+                raise AdmissionRejected(429, "Verification queue is full", self.retry_after)
+            self.queued += 1
+            try:
+                await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise AdmissionRejected(
+                    503, "Verification service overloaded", self.retry_after
+                )
+            finally:
+                self.queued -= 1
+        else:
+            await slots.acquire()
+        
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            slots.release()
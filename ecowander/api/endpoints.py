@@ -0,0 +1,386 @@
+"""
+HTTP verification endpoint.
+
+The image is sent as the raw request body (Content-Type image/jpeg or
+image/png) with the submission details as query parameters. It is
+buffered in memory only - no temporary files - and handed to the pipeline
+without copying. Requests are rejected as early as possible: from
+Content-Length before the body is read, and from the image header before
+anything is decoded.
+
+Each request gets a deadline (DEADLINE_SETTINGS["request_timeout"]) from
+the moment it arrives. Checks that would start after it has run out are
+skipped and the response lists them in "timed_out"; GET /stats/stages
+reports time spent and deadline overruns per stage.
+
+Under load, requests run at a degraded quality tier chosen from queue
+depth and recent latency (see services.degradation); every response
+records its tier and GET /stats/degradation reports the current one.
+
+Sampled and unusually slow requests are captured by SlowRequestProfiler
+(see services.profiling); GET /debug/profiles dumps the slowest captures.
+
+A new model version is rolled out with POST /model/{version}: it loads
+and warms in the background and takes over between requests, without a
+restart.
+
+Run with:
+    uvicorn ecowander.api.endpoints:app
+"""
+import asyncio
+import logging
+import queue
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from ecowander.api.admission import AdmissionController, AdmissionRejected
+from ecowander.api.schemas import (
+    DegradationStatsResponse,
+    ProfileCapturesResponse,
+    ErrorResponse,
+    HealthResponse,
+    ModelStatusResponse,
+    ReadinessResponse,
+    StageStatsResponse,
+    VerificationResponse
+)
+from ecowander.config.settings import API_SETTINGS, APP_SETTINGS, DATABASE_SETTINGS
+from ecowander.services.deadline import STAGE_STATS, request_deadline
+from ecowander.services.degradation import DegradationController
+from ecowander.services.profiling import SlowRequestProfiler
+from ecowander.services.image_validation import (
+    ImageRejected,
+    read_image_header,
+    validate_image_header
+)
+
+logger = logging.getLogger(__name__)
+
+class UploadRejected(Exception):
+    """Raised when an upload fails size, format or pixel limits."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+# HTTP status for each ImageRejected reason
+REJECTION_STATUS = {
+    "invalid": 400,
+    "format": 415,
+    "mode": 415,
+    "bytes": 413,
+    "dimensions": 413,
+    "pixels": 413
+}
+
+def _rejection(error: ImageRejected) -> UploadRejected:
+    return UploadRejected(REJECTION_STATUS.get(error.reason, 400), str(error))
+
+def _check_image_header(buffer: bytearray, complete: bool) -> bool:
+    """
+    Validate format, mode and dimensions from the image header without decoding.
+    
+    Args:
+        buffer: Bytes received so far
+        complete: Whether the whole body has been received
+        
+    Returns:
+        True once the header has been read and accepted, False if more
+        data is needed to parse it
+    """
+    try:
+        # Byte size is enforced while streaming; the buffer is still growing
+        header = read_image_header(buffer)._replace(byte_size=None)
+    except ImageRejected as e:
+        if e.reason == "invalid" and not complete:
+            return False
+        raise _rejection(e)
+    
+    try:
+        validate_image_header(header)
+    except ImageRejected as e:
+        raise _rejection(e)
+    return True
+
+async def _read_upload(request: Request) -> bytearray:
+    """Stream the request body into memory, enforcing size and header limits."""
+    max_size = APP_SETTINGS["max_image_size"]
+    peek_size = API_SETTINGS["header_peek_bytes"]
+
+    content_length = request.headers.get("content-length")
+    if content_length is not None and int(content_length) > max_size:
+        raise UploadRejected(413, f"Image exceeds {max_size} bytes")
+
+    buffer = bytearray()
+    header_checked = False
+    async for chunk in request.stream():
+        buffer += chunk
+        if len(buffer) > max_size:
+            raise UploadRejected(413, f"Image exceeds {max_size} bytes")
+        if not header_checked and len(buffer) >= peek_size:
+            header_checked = _check_image_header(buffer, complete=False)
+            # Only retry parsing once the buffer has grown substantially
+            peek_size = len(buffer) * 2
+
+    if not buffer:
+        raise UploadRejected(400, "Empty request body")
+    if not header_checked:
+        _check_image_header(buffer, complete=True)
+    return buffer
+
+def _capture_metadata(image_buffer: bytearray, challenge_type: str, tier: int, result) -> dict:
+    """Image and request details kept with a profile capture."""
+    try:
+        header = read_image_header(image_buffer)
+        image = {"format": header.format, "width": header.width, "height": header.height}
+    except ImageRejected:
+        image = {}
+    image["bytes"] = len(image_buffer)
+    
+    metadata = {"image": image, "challenge_type": challenge_type, "tier": tier}
+    if result is not None:
+        metadata["model_version"] = result.model_version
+        metadata["timed_out"] = result.timed_out
+    return metadata
+
+def _prepare_verifier(app: FastAPI) -> None:
+    """Load (if needed) and warm up the verifier; runs off the event loop."""
+    try:
+        if app.state.verifier is None:
+            from ecowander.verification.models import EcoActionVerifier
+            app.state.verifier = EcoActionVerifier()
+        
+        recheck_queue = app.state.verifier.fraud_detector.recheck_queue
+        if app.state.writer is not None and recheck_queue.handler is None:
+            # Store the verdicts of manipulation checks deferred under load
+            recheck_queue.handler = app.state.writer.submit_recheck
+        app.state.verifier.warmup()
+    except Exception:
+        logger.exception("Verifier warm-up failed")
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    owns_writer = app.state.writer is None and DATABASE_SETTINGS["persist_results"]
+    if owns_writer:
+        from ecowander.storage.writer import VerificationWriter
+        app.state.writer = VerificationWriter()
+    
+    # Warm up in the background so /health answers while the model loads;
+    # /ready and /verify return 503 until it is done.
+    loop = asyncio.get_running_loop()
+    app.state.warmup = loop.run_in_executor(None, _prepare_verifier, app)
+    
+    yield
+    
+    if owns_writer:
+        app.state.writer.close()
+
+def create_app(
+    verifier=None,
+    admission: Optional[AdmissionController] = None,
+    writer=None,
+    degradation: Optional[DegradationController] = None,
+    profiler: Optional[SlowRequestProfiler] = None
+) -> FastAPI:
+    """
+    Build the verification API.
+    
+    Args:
+        verifier: EcoActionVerifier to use (created and warmed at startup if None)
+        admission: Admission controller bounding concurrent work
+        writer: VerificationWriter persisting results (created at startup
+            if None and DATABASE_SETTINGS["persist_results"] is set)
+        degradation: Chooses each request's quality tier from load
+        profiler: Captures sampled and slow requests
+        
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI(title="EcoWander Verification", lifespan=_lifespan)
+    app.state.verifier = verifier
+    app.state.admission = admission or AdmissionController()
+    app.state.writer = writer
+    app.state.degradation = degradation or DegradationController()
+    app.state.profiler = profiler or SlowRequestProfiler()
+
+    def get_verifier():
+        verifier = app.state.verifier
+        if verifier is None or not verifier.is_ready:
+            raise AdmissionRejected(
+                503, "Verifier is warming up", app.state.admission.retry_after
+            )
+        return verifier
+
+    def get_registry():
+        verifier = app.state.verifier
+        registry = verifier.photo_verifier.registry if verifier is not None else None
+        if registry is None:
+            raise HTTPException(503, "No model registry (verifier loading or in dummy mode)")
+        return registry
+
+    def model_status(registry) -> dict:
+        loading = registry.loading
+        return {
+            "version": registry.version,
+            "available": registry.available_versions(),
+            "loading": loading[0] if loading and not loading[1].done() else None
+        }
+
+    @app.exception_handler(AdmissionRejected)
+    async def admission_rejected(request: Request, exc: AdmissionRejected):
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"detail": exc.detail},
+            headers={"Retry-After": str(exc.retry_after)}
+        )
+
+    @app.exception_handler(UploadRejected)
+    async def upload_rejected(request: Request, exc: UploadRejected):
+        return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+
+    @app.post(
+        "/verify",
+        response_model=VerificationResponse,
+        responses={
+            400: {"model": ErrorResponse},
+            413: {"model": ErrorResponse},
+            415: {"model": ErrorResponse},
+            429: {"model": ErrorResponse},
+            503: {"model": ErrorResponse}
+        }
+    )
+    async def verify(
+        request: Request,
+        lat: float = Query(..., ge=-90, le=90),
+        lng: float = Query(..., ge=-180, le=180),
+        challenge_type: str = Query(...),
+        user_id: Optional[str] = None,
+        timestamp: Optional[float] = None
+    ):
+        # The client's clock starts now, so queueing and upload count too
+        deadline = request_deadline()
+        started = time.monotonic()
+        admission = app.state.admission
+        verifier = get_verifier()
+        
+        # Reserve capacity before buffering the body, so uploads are bounded too
+        async with admission.admit():
+            degradation = app.state.degradation
+            tier = degradation.select(admission.queued)
+            
+            image_buffer = await _read_upload(request)
+            
+            async with admission.slot():
+                profiler = app.state.profiler
+                deadline.profile = profiler.start()
+                result = None
+                try:
+                    result = await verifier.verify_eco_action_async(
+                        image_buffer,
+                        (lat, lng),
+                        challenge_type,
+                        user_id=user_id,
+                        timestamp=timestamp,
+                        deadline=deadline,
+                        tier=tier
+                    )
+                except ImageRejected as e:
+                    raise _rejection(e)
+                except ValueError as e:
+                    raise UploadRejected(400, str(e))
+                finally:
+                    elapsed_ms = (time.monotonic() - started) * 1000
+                    degradation.observe(elapsed_ms)
+                    if deadline.profile is not None or profiler.is_slow(elapsed_ms):
+                        profiler.finish(
+                            deadline.profile, elapsed_ms, deadline.timings,
+                            _capture_metadata(image_buffer, challenge_type, tier, result)
+                        )
+        
+        if app.state.writer is not None:
+            try:
+                app.state.writer.submit(result, user_id=user_id)
+            except queue.Full:
+                logger.warning("Database writer backlog full; result not persisted")
+        
+        return result.to_dict()
+
+    @app.get("/health", response_model=HealthResponse)
+    async def health():
+        admission = app.state.admission
+        return {
+            "status": "ok",
+            "in_flight": admission.in_flight,
+            "queued": admission.queued
+        }
+
+    @app.get(
+        "/ready",
+        response_model=ReadinessResponse,
+        responses={503: {"model": ReadinessResponse}}
+    )
+    async def ready():
+        verifier = app.state.verifier
+        is_ready = verifier is not None and verifier.is_ready
+        body = {
+            "ready": is_ready,
+            "model_version": verifier.photo_verifier.model_version if verifier else None,
+            "warmup": verifier.photo_verifier.warmup_report if verifier else None
+        }
+        return JSONResponse(status_code=200 if is_ready else 503, content=body)
+
+    @app.get("/stats/stages", response_model=StageStatsResponse)
+    async def stage_stats():
+        return {"stages": STAGE_STATS.snapshot()}
+
+    @app.get("/stats/degradation", response_model=DegradationStatsResponse)
+    async def degradation_stats():
+        verifier = app.state.verifier
+        return {
+            **app.state.degradation.stats(),
+            "verdict_cache": verifier.verdict_cache.stats() if verifier else {},
+            "recheck_queue": verifier.fraud_detector.recheck_queue.stats() if verifier else {}
+        }
+
+    @app.get("/debug/profiles", response_model=ProfileCapturesResponse)
+    async def profiles():
+        """Slowest captured requests, slowest first."""
+        # Merging stage profiles is CPU work; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        return {"captures": await loop.run_in_executor(None, app.state.profiler.dump)}
+
+    @app.get(
+        "/model",
+        response_model=ModelStatusResponse,
+        responses={503: {"model": ErrorResponse}}
+    )
+    async def get_model():
+        return model_status(get_registry())
+
+    @app.post(
+        "/model/{version}",
+        status_code=202,
+        response_model=ModelStatusResponse,
+        responses={
+            404: {"model": ErrorResponse},
+            409: {"model": ErrorResponse},
+            503: {"model": ErrorResponse}
+        }
+    )
+    async def swap_model(version: str):
+        """Load and warm a model version in the background, then switch to it."""
+        registry = get_registry()
+        try:
+            registry.swap_in_background(version)
+        except KeyError:
+            raise HTTPException(404, f"Unknown model version '{version}'")
+        except RuntimeError as e:
+            raise HTTPException(409, str(e))
+        return model_status(registry)
+
+    return app
+
+app = create_app()
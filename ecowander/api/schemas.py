@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from ecowander.verification.models import VerificationResult
+
+class VerificationResponse(VerificationResult):
+    """Response body of POST /verify."""
+
+class ErrorResponse(BaseModel):
+    detail: str
+
+class HealthResponse(BaseModel):
+    status: str
+    in_flight: int
+    queued: int
+
+class ReadinessResponse(BaseModel):
+    ready: bool
+    model_version: Optional[str] = None
+    warmup: Optional[Dict] = None
+
+class StageStatsResponse(BaseModel):
+    stages: Dict[str, Dict[str, float]]
+
+class ProfileCapturesResponse(BaseModel):
+    captures: List[Dict]
+
+class DegradationStatsResponse(BaseModel):
+    tier: int
+    recent_p95_ms: Optional[float] = None
+    requests_per_tier: Dict[int, int]
+    verdict_cache: Dict[str, int]
+    recheck_queue: Dict[str, int]
+
+class ModelStatusResponse(BaseModel):
+    version: str
+    available: List[str]
+    loading: Optional[str] = None
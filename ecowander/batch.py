@@ -0,0 +1,354 @@
+"""
+Bulk verification of image archives.
+
+Reads a manifest (CSV or JSONL with image path, lat, lng, challenge and
+user columns) or walks a directory of images, verifies every image on a
+process pool and streams results to a JSONL file in input order. Progress
+is checkpointed so an interrupted run can be resumed with --resume.
+
+Usage:
+    python -m ecowander.batch manifest.jsonl -o results.jsonl
+    python -m ecowander.batch photos/ -o results.jsonl --challenge recycling
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from ecowander.config.settings import APP_SETTINGS
+
+# Accepted manifest column names for each record field
+MANIFEST_COLUMNS = {
+    "image_path": ("image_path", "path", "image"),
+    "lat": ("lat", "latitude"),
+    "lng": ("lng", "lon", "longitude"),
+    "challenge_type": ("challenge_type", "challenge"),
+    "user_id": ("user_id", "user")
+}
+
+# Per-process verifier, created once by the pool initializer
+_worker_verifier = None
+
+def iter_manifest(manifest_path: str) -> Iterator[Dict]:
+    """
+    Stream records from a CSV or JSONL manifest.
+
+    Args:
+        manifest_path: Path to a .csv or .jsonl manifest
+
+    Yields:
+        Record dictionaries with normalized field names. Relative image
+        paths are resolved against the manifest's directory.
+    """
+    path = Path(manifest_path)
+    base_dir = path.parent
+
+    with open(path, newline='') as f:
+        if path.suffix.lower() == ".csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        for row in rows:
+            record = {}
+            for field, aliases in MANIFEST_COLUMNS.items():
+                value = next((row[a] for a in aliases if row.get(a) not in (None, "")), None)
+                record[field] = value
+
+            if record["image_path"] is None:
+                raise ValueError(f"Manifest row without image path: {row}")
+            record["image_path"] = str(base_dir / record["image_path"])
+            yield record
+
+def iter_directory(root: str) -> Iterator[Dict]:
+    """
+    Stream records for every supported image under a directory.
+
+    Files are visited in sorted order so that record numbering is stable
+    between runs, which resuming relies on.
+
+    Args:
+        root: Directory to walk
+
+    Yields:
+        Record dictionaries with only image_path set
+    """
+    extensions = tuple(APP_SETTINGS["allowed_extensions"])
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(extensions):
+                yield {
+                    "image_path": os.path.join(dirpath, name),
+                    "lat": None,
+                    "lng": None,
+                    "challenge_type": None,
+                    "user_id": None
+                }
+
+def _init_worker(dummy_mode: bool) -> None:
+    """Pool initializer: load the model once per worker process."""
+    global _worker_verifier
+    from ecowander.verification.models import EcoActionVerifier
+    _worker_verifier = EcoActionVerifier(dummy_mode=dummy_mode)
+    if not _worker_verifier.is_ready:
+        _worker_verifier.warmup()
+
+def _verify_record(index: int, record: Dict) -> Dict:
+    """Verify one record in a worker process."""
+    output = {
+        "record": index,
+        "image_path": record["image_path"],
+        "user_id": record["user_id"]
+    }
+
+    try:
+        location = None
+        if record["lat"] is not None and record["lng"] is not None:
+            location = (float(record["lat"]), float(record["lng"]))
+
+        output["result"] = _worker_verifier.verify_eco_action(
+            record["image_path"],
+            location,
+            record["challenge_type"],
+            user_id=record["user_id"]
+        )
+    except Exception as e:
+        output["error"] = str(e)
+
+    return output
+
+def _json_default(value):
+    """Serialize result records, NumPy scalars and other stragglers."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+def _load_checkpoint(checkpoint_path: Path) -> Tuple[int, int, Optional[str]]:
+    """Return (records_done, output_offset, run_id) from a checkpoint file."""
+    if not checkpoint_path.exists():
+        return 0, 0, None
+
+    with open(checkpoint_path) as f:
+        state = json.load(f)
+    return state["records_done"], state["output_offset"], state.get("run_id")
+
+def _save_checkpoint(checkpoint_path: Path, records_done: int, output_offset: int, run_id: str) -> None:
+    """Atomically replace the checkpoint file."""
+    tmp_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump({"records_done": records_done, "output_offset": output_offset, "run_id": run_id}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, checkpoint_path)
+
+def run_batch(
+    records: Iterable[Dict],
+    output_path: str,
+    checkpoint_path: Optional[str] = None,
+    workers: int = os.cpu_count() or 1,
+    max_in_flight: Optional[int] = None,
+    resume: bool = False,
+    dummy_mode: bool = False,
+    checkpoint_every: int = 100,
+    defaults: Optional[Dict] = None,
+    writer=None
+) -> Dict:
+    """
+    Verify records on a process pool and stream results as JSONL.
+
+    At most ``max_in_flight`` records are queued or buffered at a time, and
+    results are written in input order, so memory stays bounded regardless
+    of the size of the input. Every ``checkpoint_every`` records the output
+    is flushed and the checkpoint records how many records and bytes have
+    been written; resuming truncates the output to that point and skips the
+    completed records.
+
+    Records between the last checkpoint and an interruption are verified
+    again on resume. Their database rows are keyed by the run id kept in
+    the checkpoint plus the record index, so the writer stores each
+    record once.
+
+    Args:
+        records: Iterable of record dictionaries (see iter_manifest)
+        output_path: JSONL file to write results to
+        checkpoint_path: Checkpoint file (defaults to output_path + ".checkpoint")
+        workers: Worker processes; 0 verifies in the current process
+        max_in_flight: Max records submitted but not yet written
+        resume: Continue from an existing checkpoint
+        dummy_mode: Use mock photo verification
+        checkpoint_every: Records between checkpoints
+        defaults: Values for record fields missing from the input
+        writer: Optional VerificationWriter to persist results to
+
+    Returns:
+        Summary dictionary with counts and elapsed time
+    """
+    output_path = Path(output_path)
+    checkpoint_path = Path(checkpoint_path or str(output_path) + ".checkpoint")
+    max_in_flight = max_in_flight or max(1, workers) * 4
+    defaults = {k: v for k, v in (defaults or {}).items() if v is not None}
+
+    resume = resume and output_path.exists()
+    start, offset, run_id = _load_checkpoint(checkpoint_path) if resume else (0, 0, None)
+    run_id = run_id or uuid.uuid4().hex
+    summary = {"processed": 0, "failed": 0, "verified": 0, "skipped": start}
+    started_at = time.monotonic()
+
+    if workers > 0:
+        mp_context = None
+        if not dummy_mode and "fork" in multiprocessing.get_all_start_methods():
+            # Load the model once here; forked workers share it copy-on-write
+            from ecowander.verification.model_registry import preload_model
+            preload_model()
+            mp_context = multiprocessing.get_context("fork")
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(dummy_mode,)
+        )
+    else:
+        _init_worker(dummy_mode)
+        executor = None
+
+    pending: Dict[Future, int] = {}
+    ready: Dict[int, Dict] = {}
+    next_index = start
+    source = enumerate(islice(records, start, None), start=start)
+    exhausted = False
+
+    out = open(output_path, 'r+b' if resume else 'wb')
+    try:
+        out.truncate(offset)
+        out.seek(offset)
+        # Record the run id before any row is written under it
+        _save_checkpoint(checkpoint_path, start, offset, run_id)
+
+        while True:
+            # Keep the pipeline full without reading ahead unboundedly
+            while not exhausted and len(pending) + len(ready) < max_in_flight:
+                item = next(source, None)
+                if item is None:
+                    exhausted = True
+                    break
+                index, record = item
+                record = {**record, **{k: v for k, v in defaults.items() if record.get(k) is None}}
+                if executor is None:
+                    ready[index] = _verify_record(index, record)
+                else:
+                    pending[executor.submit(_verify_record, index, record)] = index
+
+            if not pending and not ready:
+                break
+
+            if pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ready[pending.pop(future)] = future.result()
+
+            # Write completed results in input order
+            while next_index in ready:
+                output = ready.pop(next_index)
+                line = json.dumps(output, default=_json_default) + "\n"
+                out.write(line.encode("utf-8"))
+                next_index += 1
+
+                summary["processed"] += 1
+                if "error" in output:
+                    summary["failed"] += 1
+                else:
+                    if output["result"]["is_verified"]:
+                        summary["verified"] += 1
+                    if writer is not None:
+                        # Block rather than drop rows when the writer lags
+                        writer.submit(
+                            output["result"], user_id=output["user_id"], block=True,
+                            batch_key=f"{run_id}:{output['record']}"
+                        )
+
+                if (next_index - start) % checkpoint_every == 0:
+                    out.flush()
+                    os.fsync(out.fileno())
+                    _save_checkpoint(checkpoint_path, next_index, out.tell(), run_id)
+
+        out.flush()
+        os.fsync(out.fileno())
+        _save_checkpoint(checkpoint_path, next_index, out.tell(), run_id)
+
+    finally:
+        out.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    summary["elapsed_seconds"] = time.monotonic() - started_at
+    return summary
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m ecowander.batch",
+        description="Verify images in bulk from a manifest or directory."
+    )
+    parser.add_argument("source", help="CSV/JSONL manifest or image directory")
+    parser.add_argument("-o", "--output", required=True, help="JSONL results file")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: OUTPUT.checkpoint)")
+    parser.add_argument("--resume", action="store_true", help="Resume from the checkpoint")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (0 = run in this process)")
+    parser.add_argument("--max-in-flight", type=int, help="Max records queued at once")
+    parser.add_argument("--checkpoint-every", type=int, default=100,
+                        help="Records between checkpoints")
+    parser.add_argument("--challenge", help="Default challenge type")
+    parser.add_argument("--user", help="Default user id")
+    parser.add_argument("--lat", type=float, help="Default latitude")
+    parser.add_argument("--lng", type=float, help="Default longitude")
+    parser.add_argument("--dummy", action="store_true", help="Use mock photo verification")
+    parser.add_argument("--db", help="Also write results to this SQLite database")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.source):
+        records = iter_directory(args.source)
+    else:
+        records = iter_manifest(args.source)
+
+    writer = None
+    if args.db:
+        from ecowander.storage.writer import VerificationWriter
+        writer = VerificationWriter(args.db)
+
+    summary = run_batch(
+        records,
+        args.output,
+        checkpoint_path=args.checkpoint,
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        resume=args.resume,
+        dummy_mode=args.dummy,
+        checkpoint_every=args.checkpoint_every,
+        defaults={
+            "challenge_type": args.challenge,
+            "user_id": args.user,
+            "lat": args.lat,
+            "lng": args.lng
+        },
+        writer=writer
+    )
+    if writer is not None:
+        writer.close()
+
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,8 +5,14 @@ from pathlib import Path
 MODEL_SETTINGS = {
     "model_name": "eco_action_verifier",
     "model_path": str(Path(__file__).parent.parent.parent / "models" / "eco_action_model.tflite"),
+    # Versioned models live in <model_dir>/<version>/ next to their label_map.txt
+    "model_dir": str(Path(__file__).parent.parent.parent / "models"),
+    "model_version": None,  # version served at startup; None serves model_path
     "input_width": 224,
-    "input_height": 224
+    "input_height": 224,
+    "warmup_iterations": 3,  # synthetic inferences per batch size at startup
+    "serving_batch_sizes": [1],  # input batch sizes to warm up
+    "dummy_latency": 0.0  # seconds of simulated inference in dummy mode
 }
 
 # Verification thresholds
@@ -20,7 +26,11 @@ VERIFICATION_THRESHOLDS = {
 APP_SETTINGS = {
     "debug": True,
     "max_image_size": 5 * 1024 * 1024,  # 5MB
-    "allowed_extensions": [".jpg", ".jpeg", ".png"]
+    "max_image_pixels": 24_000_000,  # 24 megapixels
+    "max_image_dimension": 8192,  # pixels per side
+    "allowed_extensions": [".jpg", ".jpeg", ".png"],
+    "allowed_formats": ["JPEG", "PNG"],  # PIL format names, checked from the header
+    "allowed_image_modes": ["1", "L", "LA", "P", "PA", "RGB", "RGBA", "CMYK", "I", "I;16"]
 }
 
 # Cherry blossom season (March 20 - April 15)
@@ -29,4 +39,81 @@ CHERRY_BLOSSOM_SEASON = {
     "start_day": 20,
     "end_month": 4,
     "end_day": 15
+}
+
+# Async execution settings
+ASYNC_SETTINGS = {
+    "decode_workers": 4,  # threads for file I/O, decoding and hashing
+    "inference_workers": 1,  # threads for TFLite inference
+    "concurrency_limits": {  # max concurrent calls per async entry point
+        "verify_eco_action": 32,
+        "verify_photo": 16,
+        "detect_fraud": 16
+    }
+}
+
+# Request deadlines
+DEADLINE_SETTINGS = {
+    "request_timeout": 3.0,  # seconds; mobile clients give up after 3s
+    # Seconds that must be left for a stage to start, roughly its typical cost
+    "min_stage_budget": {
+        "decode": 0.05,
+        "inference": 0.03,
+        "challenge_rules": 0.05,
+        "hash": 0.02,
+        "manipulation": 0.05,
+        "location": 0.01
+    }
+}
+
+# Load-adaptive quality tiers (see services.degradation)
+DEGRADATION_SETTINGS = {
+    "forced_tier": None,  # 0-3 pins every request to one tier; None chooses by load
+    "queue_depth_thresholds": [8, 24, 48],  # queued requests at which tiers 1, 2, 3 start
+    "latency_thresholds_ms": [1000, 1800, 2500],  # recent p95 at which tiers 1, 2, 3 start
+    "latency_window": 200,  # recent requests the p95 is taken over
+    "thumbnail_size": 512,  # longest side analysed by the thumbnail checks
+    "recheck_queue_size": 1000,  # deferred manipulation checks waiting to run
+    "recheck_queue_bytes": 256 * 1024 * 1024,  # image buffers those checks may hold
+    "recheck_workers": 1,
+    "verdict_cache_size": 10000  # (image hash, model version) verdicts kept for reuse
+}
+
+# Slow-request profiling (see services.profiling)
+PROFILING_SETTINGS = {
+    "sample_every": 0,  # profile one in N requests with cProfile; 0 profiles none
+    "slow_threshold_ms": 2000,  # slower requests are captured even if not profiled
+    "top_k": 20,  # slowest captures kept
+    "trace_memory": False,  # also diff tracemalloc snapshots of profiled requests (costly)
+    "top_functions": 25,  # functions listed per capture, by cumulative time
+    "top_allocations": 10  # allocation sites listed per capture
+}
+
+# HTTP API settings
+API_SETTINGS = {
+    "max_in_flight": 32,  # verifications running at once
+    "max_queue": 64,  # requests waiting for a slot before 429
+    "queue_timeout": 2.0,  # seconds a request may wait for a slot before 503
+    "retry_after_seconds": 1,
+    "header_peek_bytes": 64 * 1024  # bytes buffered before checking the image header
+}
+
+# Database settings
+DATABASE_SETTINGS = {
+    "path": str(Path(__file__).parent.parent.parent / "data" / "ecowander.db"),
+    "persist_results": True,  # write API verification results to the database
+    "journal_mode": "WAL",  # readers never block the writer
+    "synchronous": "NORMAL",  # with WAL: safe against crashes, fsync only at checkpoints
+    "busy_timeout_ms": 5000,
+    "batch_size": 200,  # max rows per write transaction
+    "flush_interval": 0.05,  # seconds a row may wait for its batch to fill
+    "max_pending": 10000,  # rows queued for the writer before submit() fails
+    "read_pool_size": 4
+}
+
+# Duplicate-detection hash index, built by python -m ecowander.index_builder
+HASH_INDEX_SETTINGS = {
+    # Opened by FraudDetector at startup if it exists
+    "path": str(Path(__file__).parent.parent.parent / "data" / "hash_index.bin"),
+    "chunk_size": 64  # files hashed per worker task
 }
\ No newline at end of file
@@ -0,0 +1,242 @@
+"""
+Offline builder for the duplicate-detection hash index.
+
+Walks an image directory (or reads a batch manifest), computes the
+perceptual hash of every image on a process pool, and writes a sorted,
+memory-mapped index (see services.hash_index) that FraudDetector opens
+at startup. Archive photos are not uploads, so the upload byte and pixel
+limits do not apply; files that cannot be hashed are counted in the
+summary by reason and logged.
+
+Indexed files are listed next to the index (INDEX.files, with size,
+modification time and hash), so --incremental only hashes files that are
+new or changed since the last build. The index is rewritten from that
+list: hashes of files that changed or are no longer in the source are
+dropped, so the source must list the whole archive on every build.
+
+Usage:
+    python -m ecowander.index_builder photos/ -o data/hash_index.bin
+    python -m ecowander.index_builder photos/ -o data/hash_index.bin --incremental
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from ecowander.config.settings import HASH_INDEX_SETTINGS
+from ecowander.services.hash_index import write_hash_index
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 16  # generate_image_hash default
+HASH_WIDTH = HASH_SIZE * HASH_SIZE // 8
+
+# No byte, pixel or dimension budget: JPEGs are decoded in draft mode, and
+# Pillow's own decompression-bomb guard still applies
+HASH_LIMITS = {"max_bytes": None, "max_pixels": None, "max_dimension": None}
+
+# (path, size, mtime_ns, perceptual hash, failure reason, error message) for one file
+FileHash = Tuple[str, int, int, Optional[bytes], Optional[str], Optional[str]]
+
+# (size, mtime_ns, perceptual hash) of an indexed file
+IndexedFile = Tuple[int, int, bytes]
+
+def _hash_files(paths: List[str]) -> List[FileHash]:
+    """Hash a chunk of files in a worker process."""
+    from ecowander.services.hashing_service import generate_image_hash
+    from ecowander.services.image_validation import ImageRejected
+
+    results = []
+    for path in paths:
+        size = mtime_ns = 0
+        try:
+            stat = os.stat(path)
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            image_hash = bytes.fromhex(generate_image_hash(path, HASH_SIZE, **HASH_LIMITS))
+            results.append((path, size, mtime_ns, image_hash, None, None))
+        except ImageRejected as e:
+            # Unsupported format or mode
+            results.append((path, size, mtime_ns, None, e.reason, str(e)))
+        except OSError as e:
+            results.append((path, size, mtime_ns, None, "unreadable", str(e)))
+        except ValueError as e:
+            results.append((path, size, mtime_ns, None, "invalid", str(e)))
+    return results
+
+def _files_path(index_path: str) -> str:
+    return index_path + ".files"
+
+def _load_indexed_files(index_path: str) -> Dict[str, IndexedFile]:
+    """Files already in the index, as {path: (size, mtime_ns, hash)}."""
+    indexed = {}
+    with open(_files_path(index_path)) as f:
+        for line in f:
+            size, mtime_ns, image_hash, path = line.rstrip("\n").split("\t", 3)
+            indexed[path] = (int(size), int(mtime_ns), bytes.fromhex(image_hash))
+    return indexed
+
+def _unchanged_entry(path: str, indexed: Dict[str, IndexedFile]) -> Optional[IndexedFile]:
+    """The indexed entry of a file, if the file has not changed since."""
+    entry = indexed.get(path)
+    if entry is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return entry if entry[:2] == (stat.st_size, stat.st_mtime_ns) else None
+
+def _chunks(paths: Iterable[str], size: int) -> Iterator[List[str]]:
+    paths = iter(paths)
+    while True:
+        chunk = list(islice(paths, size))
+        if not chunk:
+            return
+        yield chunk
+
+def build_hash_index(
+    paths: Iterable[str],
+    index_path: str,
+    workers: int = os.cpu_count() or 1,
+    incremental: bool = False,
+    chunk_size: Optional[int] = None,
+    max_in_flight: Optional[int] = None
+) -> Dict:
+    """
+    Hash image files on a process pool and write the hash index.
+
+    Args:
+        paths: Image files to index
+        index_path: Index file to write
+        workers: Worker processes; 0 hashes in the current process
+        incremental: Reuse the hashes of files unchanged since the last
+            build and only hash the rest; files not in paths are dropped
+        chunk_size: Files per worker task (defaults to HASH_INDEX_SETTINGS)
+        max_in_flight: Max chunks submitted but not yet collected
+
+    Returns:
+        Summary dictionary with counts and elapsed time; "failures" counts
+        the files that could not be hashed by reason, and "dropped" the
+        previously indexed files that changed or are gone
+    """
+    chunk_size = chunk_size or HASH_INDEX_SETTINGS["chunk_size"]
+    max_in_flight = max_in_flight or max(1, workers) * 4
+    started_at = time.monotonic()
+
+    files_path = _files_path(index_path)
+    indexed = _load_indexed_files(index_path) if incremental and os.path.exists(files_path) else {}
+    summary = {"files": 0, "hashed": 0, "skipped": 0, "failed": 0}
+    failures: Counter = Counter()
+
+    # Fixed-width records packed back to back, not millions of bytes objects
+    image_hashes = bytearray()
+
+    # The file list is the source of truth for the next incremental build;
+    # it replaces the old one only after the index has been written
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    files_out = open(files_path + ".tmp", "w")
+
+    def add(path: str, size: int, mtime_ns: int, image_hash: bytes) -> None:
+        image_hashes.extend(image_hash)
+        files_out.write(f"{size}\t{mtime_ns}\t{image_hash.hex()}\t{path}\n")
+
+    def unindexed() -> Iterator[str]:
+        for path in paths:
+            summary["files"] += 1
+            entry = _unchanged_entry(path, indexed)
+            if entry is None:
+                yield path
+            else:
+                summary["skipped"] += 1
+                add(path, *entry)
+
+    def collect(results: List[FileHash]) -> None:
+        for path, size, mtime_ns, image_hash, reason, error in results:
+            if reason is not None:
+                summary["failed"] += 1
+                failures[reason] += 1
+                logger.warning("Not indexed (%s): %s: %s", reason, path, error)
+                continue
+            summary["hashed"] += 1
+            add(path, size, mtime_ns, image_hash)
+
+    try:
+        _hash_all(_chunks(unindexed(), chunk_size), collect, workers, max_in_flight)
+    finally:
+        files_out.close()
+
+    summary["image_hashes"] = write_hash_index(
+        index_path, np.frombuffer(image_hashes, dtype=f"S{HASH_WIDTH}"), HASH_WIDTH
+    )
+    os.replace(files_path + ".tmp", files_path)
+    summary["failures"] = dict(failures)
+    summary["dropped"] = len(indexed) - summary["skipped"]
+    summary["elapsed_seconds"] = time.monotonic() - started_at
+    return summary
+
+def _hash_all(
+    chunks: Iterator[List[str]],
+    collect: Callable[[List[FileHash]], None],
+    workers: int,
+    max_in_flight: int
+) -> None:
+    """Hash chunks of files on a process pool (or inline), passing results to collect."""
+    if workers > 0:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: List[Future] = []
+            exhausted = False
+            while True:
+                # Keep the pool busy without listing the whole archive up front
+                while not exhausted and len(pending) < max_in_flight:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    pending.append(executor.submit(_hash_files, chunk))
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    collect(future.result())
+    else:
+        for chunk in chunks:
+            collect(_hash_files(chunk))
+
+def main(argv: Optional[list] = None) -> int:
+    from ecowander.batch import iter_directory, iter_manifest
+
+    parser = argparse.ArgumentParser(
+        prog="python -m ecowander.index_builder",
+        description="Build the duplicate-detection hash index from an image archive."
+    )
+    parser.add_argument("source", help="Image directory or CSV/JSONL manifest")
+    parser.add_argument("-o", "--output", default=HASH_INDEX_SETTINGS["path"],
+                        help="Index file (default: HASH_INDEX_SETTINGS path)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only hash files new or changed since the last build")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (0 = run in this process)")
+    parser.add_argument("--chunk-size", type=int, help="Files per worker task")
+    args = parser.parse_args(argv)
+
+    records = iter_directory(args.source) if os.path.isdir(args.source) else iter_manifest(args.source)
+    summary = build_hash_index(
+        (record["image_path"] for record in records),
+        args.output,
+        workers=args.workers,
+        incremental=args.incremental,
+        chunk_size=args.chunk_size
+    )
+
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Request deadlines and per-stage time budgets.
+
+A Deadline is created when a request arrives and passed to every stage of
+the verification flow. Before expensive work (decoding, hashing, the
+manipulation filter, inference) a stage checks that enough of the budget
+is left; if not, it raises DeadlineExceeded and the verifier returns a
+partial result marked with the stage that was cut short, instead of
+spending capacity on an answer the client has stopped waiting for.
+
+A request picked for profiling carries its RequestProfile on the deadline,
+so every stage is profiled on whichever thread it runs.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Optional
+from ecowander.config.settings import DEADLINE_SETTINGS
+
+if TYPE_CHECKING:
+    from ecowander.services.profiling import RequestProfile
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage would start with less than its minimum budget left."""
+
+    def __init__(self, stage: str, remaining: float):
+        """
+        Args:
+            stage: Stage that was skipped
+            remaining: Seconds left on the deadline (negative once expired)
+        """
+        super().__init__(f"Deadline exceeded before '{stage}' ({remaining * 1000:.0f} ms left)")
+        self.stage = stage
+        self.remaining = remaining
+
+class StageStats:
+    """Thread-safe per-stage counters of runs, skips and deadline overruns."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict] = {}
+
+    def _entry(self, stage: str) -> Dict:
+        entry = self._stages.get(stage)
+        if entry is None:
+            entry = self._stages[stage] = {
+                "runs": 0,
+                "skipped": 0,
+                "overruns": 0,
+                "total_ms": 0.0,
+                "overrun_ms": 0.0,
+                "max_overrun_ms": 0.0
+            }
+        return entry
+
+    def record_run(self, stage: str, elapsed: float, overrun: float) -> None:
+        """
+        Record a completed stage.
+
+        Args:
+            stage: Stage name
+            elapsed: Seconds the stage took
+            overrun: Seconds it finished past the deadline (0 if on time)
+        """
+        with self._lock:
+            entry = self._entry(stage)
+            entry["runs"] += 1
+            entry["total_ms"] += elapsed * 1000
+            if overrun > 0:
+                entry["overruns"] += 1
+                entry["overrun_ms"] += overrun * 1000
+                entry["max_overrun_ms"] = max(entry["max_overrun_ms"], overrun * 1000)
+
+    def record_skip(self, stage: str) -> None:
+        """Record a stage skipped for lack of budget."""
+        with self._lock:
+            self._entry(stage)["skipped"] += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Copy of the counters, with mean stage time added."""
+        with self._lock:
+            return {
+                stage: {**entry, "mean_ms": entry["total_ms"] / entry["runs"] if entry["runs"] else 0.0}
+                for stage, entry in self._stages.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+# Process-wide stage statistics, served by GET /stats/stages
+STAGE_STATS = StageStats()
+
+class Deadline:
+    """Time budget for one verification, shared by all of its stages."""
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        min_stage_budget: Optional[Dict[str, float]] = None,
+        stats: Optional[StageStats] = None,
+        clock: Callable[[], float] = time.monotonic,
+        profile: Optional["RequestProfile"] = None
+    ):
+        """
+        Args:
+            timeout: Seconds from now until the deadline; None never expires
+            min_stage_budget: Seconds that must remain for each stage to
+                start (overrides DEADLINE_SETTINGS["min_stage_budget"])
+            stats: Where stage timings are recorded (defaults to STAGE_STATS)
+            clock: Monotonic clock, in seconds
+            profile: Profile of this request, if it was picked for profiling
+        """
+        self._clock = clock
+        self.expires_at = math.inf if timeout is None else clock() + timeout
+        self.min_stage_budget = dict(DEADLINE_SETTINGS["min_stage_budget"])
+        if min_stage_budget:
+            self.min_stage_budget.update(min_stage_budget)
+        self.stats = STAGE_STATS if stats is None else stats
+        self.profile = profile
+        # Milliseconds spent in each stage of this request
+        self.timings: Dict[str, float] = {}
+
+    def remaining(self) -> float:
+        """Seconds left; math.inf without a deadline, negative once expired."""
+        return self.expires_at - self._clock()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, stage: str) -> None:
+        """
+        Make sure there is budget left to start a stage.
+
+        Raises:
+            DeadlineExceeded: If less than the stage's minimum budget remains
+        """
+        remaining = self.remaining()
+        if remaining < self.min_stage_budget.get(stage, 0.0) or remaining <= 0:
+            self.stats.record_skip(stage)
+            raise DeadlineExceeded(stage, remaining)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Run one stage under the deadline, recording its time and any overrun.
+
+        Raises:
+            DeadlineExceeded: Before the stage starts, if its budget is gone
+        """
+        self.check(name)
+        start = self._clock()
+        try:
+            if self.profile is None:
+                yield
+            else:
+                with self.profile.stage(name):
+                    yield
+        finally:
+            end = self._clock()
+            self.timings[name] = self.timings.get(name, 0.0) + (end - start) * 1000
+            self.stats.record_run(name, end - start, max(0.0, end - self.expires_at))
+
+def request_deadline(
+    timeout: Optional[float] = None,
+    profile: Optional["RequestProfile"] = None
+) -> Deadline:
+    """Deadline for an incoming request (timeout defaults to DEADLINE_SETTINGS)."""
+    return Deadline(
+        DEADLINE_SETTINGS["request_timeout"] if timeout is None else timeout, profile=profile
+    )
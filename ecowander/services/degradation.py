@@ -0,0 +1,266 @@
+"""
+Load-adaptive quality tiers.
+
+Under load the pipeline trades a little verification quality for bounded
+latency instead of queueing. Each request runs at one tier:
+
+    0  Full checks.
+    1  The manipulation filter and cherry blossom colour analysis run on
+       thumbnails (DEGRADATION_SETTINGS["thumbnail_size"]).
+    2  As tier 1, and the manipulation filter is deferred to a background
+       re-check queue instead of running in the request.
+    3  As tier 2, and photos whose (perceptual hash, model version) has
+       been classified before reuse the cached model verdict.
+
+DegradationController picks the tier from queue depth and recent latency;
+every result records the tier it was produced at.
+"""
+import bisect
+import logging
+import queue
+import threading
+from collections import Counter, OrderedDict, deque
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from ecowander.config.settings import DEGRADATION_SETTINGS
+from ecowander.services.image_source import image_source_size
+
+logger = logging.getLogger(__name__)
+
+MAX_TIER = 3
+
+class DegradationController:
+    """Chooses the quality tier for each request from queue depth and recent latency."""
+
+    def __init__(
+        self,
+        queue_depth_thresholds: Optional[Tuple[int, ...]] = None,
+        latency_thresholds_ms: Optional[Tuple[float, ...]] = None,
+        latency_window: Optional[int] = None,
+        forced_tier: Optional[int] = None
+    ):
+        """
+        Args:
+            queue_depth_thresholds: Queued requests at which tiers 1, 2 and 3 start
+            latency_thresholds_ms: Recent p95 latency at which tiers 1, 2 and 3 start
+            latency_window: Number of recent requests the p95 is taken over
+            forced_tier: Always use this tier (defaults to DEGRADATION_SETTINGS;
+                None chooses by load)
+        """
+        self.queue_depth_thresholds = sorted(
+            queue_depth_thresholds or DEGRADATION_SETTINGS["queue_depth_thresholds"]
+        )
+        self.latency_thresholds_ms = sorted(
+            latency_thresholds_ms or DEGRADATION_SETTINGS["latency_thresholds_ms"]
+        )
+        self.forced_tier = (
+            DEGRADATION_SETTINGS["forced_tier"] if forced_tier is None else forced_tier
+        )
+        self._latencies = deque(maxlen=latency_window or DEGRADATION_SETTINGS["latency_window"])
+        self._lock = threading.Lock()
+        self.tier = 0
+        self.requests_per_tier: Counter = Counter()
+
+    def observe(self, latency_ms: float) -> None:
+        """Record the latency of a finished request."""
+        with self._lock:
+            self._latencies.append(latency_ms)
+
+    def recent_p95_ms(self) -> Optional[float]:
+        """95th percentile latency over the recent window, or None before any request."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def select(self, queue_depth: int) -> int:
+        """
+        Pick the tier for a new request.
+
+        Args:
+            queue_depth: Requests currently waiting for a verification slot
+
+        Returns:
+            Tier 0 (full quality) to MAX_TIER
+        """
+        if self.forced_tier is not None:
+            tier = self.forced_tier
+        else:
+            tier = bisect.bisect_right(self.queue_depth_thresholds, queue_depth)
+            p95 = self.recent_p95_ms()
+            if p95 is not None:
+                tier = max(tier, bisect.bisect_right(self.latency_thresholds_ms, p95))
+        tier = min(max(tier, 0), MAX_TIER)
+
+        with self._lock:
+            if tier != self.tier:
+                logger.info("Quality tier %d -> %d (queue depth %d)", self.tier, tier, queue_depth)
+            self.tier = tier
+            self.requests_per_tier[tier] += 1
+        return tier
+
+    def stats(self) -> Dict:
+        with self._lock:
+            requests = dict(self.requests_per_tier)
+        return {"tier": self.tier, "recent_p95_ms": self.recent_p95_ms(), "requests_per_tier": requests}
+
+class CachedVerdict(NamedTuple):
+    labels: Tuple[str, ...]
+    scores: object  # Model output array, shared and never written to
+    model_version: Optional[str]
+
+class VerdictCache:
+    """LRU cache of photo model output keyed by (perceptual hash, model version)."""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or DEGRADATION_SETTINGS["verdict_cache_size"]
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], CachedVerdict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image_hash: str, model_version: Optional[str]) -> Optional[CachedVerdict]:
+        key = (image_hash, model_version)
+        with self._lock:
+            verdict = self._entries.get(key)
+            if verdict is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return verdict
+
+    def put(self, image_hash: str, photo_result) -> None:
+        """Remember the model output of a PhotoResult (ignored if it has no scores)."""
+        if photo_result.scores is None:
+            return
+        key = (image_hash, photo_result.model_version)
+        verdict = CachedVerdict(photo_result.labels, photo_result.scores, photo_result.model_version)
+        with self._lock:
+            self._entries[key] = verdict
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+class RecheckJob(NamedTuple):
+    image: object  # ImageSource safe to read after the request (see as_shared_source)
+    image_hash: Optional[str]
+    user_id: Optional[str]
+
+def _held_bytes(job: RecheckJob) -> int:
+    """Memory a queued job keeps alive: its buffer, or nothing for a path."""
+    if isinstance(job.image, (bytes, bytearray, memoryview)):
+        return image_source_size(job.image)
+    return 0
+
+def _log_recheck(job: RecheckJob, result: Dict) -> None:
+    if result.get("is_edited"):
+        logger.warning(
+            "Deferred manipulation check flagged image %s (user %s) as edited",
+            job.image_hash, job.user_id
+        )
+
+class ManipulationRecheckQueue:
+    """
+    Bounded background queue running deferred full-quality manipulation checks.
+
+    Jobs hold the uploaded image until they run, so the queue is bounded
+    both by job count and by the bytes of image buffers it keeps alive.
+    Worker threads start on first use. When either bound is reached,
+    submit() returns False and the caller checks the image itself.
+
+    Without a handler verdicts are only logged; the API sets the handler
+    to VerificationWriter.submit_recheck so that they are stored.
+    """
+
+    def __init__(
+        self,
+        handler: Optional[Callable[[RecheckJob, Dict], None]] = None,
+        max_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ):
+        """
+        Args:
+            handler: Called with each job and its check_image_manipulation
+                result (defaults to logging images found to be edited)
+            max_size: Jobs held before submit() refuses more
+            workers: Worker threads
+            max_bytes: Image buffer bytes held before submit() refuses more
+        """
+        self.handler = handler
+        self.workers = workers or DEGRADATION_SETTINGS["recheck_workers"]
+        self.max_bytes = max_bytes or DEGRADATION_SETTINGS["recheck_queue_bytes"]
+        self._queue: queue.Queue = queue.Queue(
+            maxsize=max_size or DEGRADATION_SETTINGS["recheck_queue_size"]
+        )
+        self._threads = []
+        self._lock = threading.Lock()
+        self.pending_bytes = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def submit(self, job: RecheckJob) -> bool:
+        """Queue a job; returns False if the queue is full."""
+        self._start()
+        held = _held_bytes(job)
+        with self._lock:
+            if self.pending_bytes + held > self.max_bytes:
+                self.rejected += 1
+                return False
+            self.pending_bytes += held
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self.pending_bytes -= held
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def join(self) -> None:
+        """Block until every queued job has been checked."""
+        self._queue.join()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run, name=f"ecowander-recheck-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self) -> None:
+        from ecowander.services.hashing_service import check_image_manipulation
+
+        while True:
+            job = self._queue.get()
+            try:
+                (self.handler or _log_recheck)(job, check_image_manipulation(job.image))
+            except Exception:
+                logger.exception("Deferred manipulation check failed for %s", job.image_hash)
+            finally:
+                with self._lock:
+                    self.pending_bytes -= _held_bytes(job)
+                    self.completed += 1
+                self._queue.task_done()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "pending": self._queue.qsize(),
+                "pending_bytes": self.pending_bytes,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
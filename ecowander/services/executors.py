@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from ecowander.config.settings import ASYNC_SETTINGS
+
+class VerificationExecutors:
+    """Executor pools and concurrency limits backing the async verification API."""
+
+    def __init__(
+        self,
+        decode_workers: Optional[int] = None,
+        inference_workers: Optional[int] = None,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        decode_executor: Optional[Executor] = None,
+        inference_executor: Optional[Executor] = None
+    ):
+        """
+        Initialize executor pools.
+
+        Args:
+            decode_workers: Threads for file I/O, decoding and hashing
+            inference_workers: Threads for model inference
+            concurrency_limits: Max concurrent calls per entry point name
+            decode_executor: Existing executor to use for decode work
+            inference_executor: Existing executor to use for inference work
+        """
+        self._owns_decode = decode_executor is None
+        self._owns_inference = inference_executor is None
+
+        self.decode_executor = decode_executor or ThreadPoolExecutor(
+            max_workers=decode_workers or ASYNC_SETTINGS["decode_workers"],
+            thread_name_prefix="ecowander-decode"
+        )
+        self.inference_executor = inference_executor or ThreadPoolExecutor(
+            max_workers=inference_workers or ASYNC_SETTINGS["inference_workers"],
+            thread_name_prefix="ecowander-inference"
+        )
+        self.concurrency_limits = dict(ASYNC_SETTINGS["concurrency_limits"])
+        if concurrency_limits:
+            self.concurrency_limits.update(concurrency_limits)
+
+        # Semaphores are bound to the event loop they are used on
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def run_decode(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run CPU/IO-bound decode work on the decode pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.decode_executor, partial(func, *args, **kwargs)
+        )
+
+    async def run_inference(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run model inference on the inference pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.inference_executor, partial(func, *args, **kwargs)
+        )
+
+    def limit(self, name: str) -> asyncio.Semaphore:
+        """
+        Get the concurrency limiter for an entry point.
+
+        Args:
+            name: Entry point name (e.g. "verify_photo")
+
+        Returns:
+            Semaphore to use as ``async with executors.limit(name):``
+        """
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        if name not in semaphores:
+            if name not in self.concurrency_limits:
+                raise KeyError(f"No concurrency limit configured for '{name}'")
+            semaphores[name] = asyncio.Semaphore(self.concurrency_limits[name])
+        return semaphores[name]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down executor pools created by this instance."""
+        if self._owns_decode:
+            self.decode_executor.shutdown(wait=wait)
+        if self._owns_inference:
+            self.inference_executor.shutdown(wait=wait)
+
+_default_executors: Optional[VerificationExecutors] = None
+_default_lock = threading.Lock()
+
+def get_default_executors() -> VerificationExecutors:
+    """Return the process-wide executors, creating them on first use."""
+    global _default_executors
+    with _default_lock:
+        if _default_executors is None:
+            _default_executors = VerificationExecutors()
+        return _default_executors
+
+def set_default_executors(executors: Optional[VerificationExecutors]) -> None:
+    """Replace the process-wide executors (e.g. from application startup)."""
+    global _default_executors
+    with _default_lock:
+        _default_executors = executors
@@ -1,19 +1,21 @@
-import exifread
-from geopy.distance import geodesic
 from typing import Tuple, Optional, Dict, List
+from ecowander.services.image_source import ImageSource, open_image_source
 
-def get_image_location(image_path: str) -> Optional[Tuple[float, float]]:
+def get_image_location(image_path: ImageSource) -> Optional[Tuple[float, float]]:
     """
     Extract GPS coordinates from image EXIF data.
     
     Args:
-        image_path: Path to image file
+        image_path: Path, encoded image buffer or binary file-like object
         
     Returns:
         Tuple of (latitude, longitude) or None if no EXIF data
     """
+    # Deferred: only callers that read EXIF pay for importing exifread
+    import exifread
+    
     try:
-        with open(image_path, 'rb') as f:
+        with open_image_source(image_path) as f:
             tags = exifread.process_file(f, details=False)
             
             if not all(k in tags for k in ['GPS GPSLatitude', 'GPS GPSLongitude']):
@@ -41,16 +43,20 @@ def get_nearest_eco_location(
     
     Args:
         coordinates: Tuple of (lat, lng)
-        eco_locations: List of eco-location dictionaries
+        eco_locations: List of eco-location dictionaries or EcoLocation models
         
     Returns:
         Tuple of (nearest_location, distance_in_meters)
     """
+    # Deferred: geopy takes longer to import than the catalog takes to load
+    from geopy.distance import geodesic
+    
     nearest = None
     min_distance = float('inf')
     
     for loc in eco_locations:
-        distance = geodesic(coordinates, loc['coordinates']).meters
+        loc_coords = loc['coordinates'] if isinstance(loc, dict) else loc.coordinates
+        distance = geodesic(coordinates, loc_coords).meters
         if distance < min_distance:
             min_distance = distance
             nearest = loc
@@ -0,0 +1,117 @@
+"""
+Sorted, memory-mapped index of known image hashes.
+
+The file holds a fixed header followed by a sorted array of fixed-width
+perceptual hashes (generate_image_hash, as raw bytes). Lookups
+binary-search the mapped file, so an index of millions of photos opens
+instantly and is shared between worker processes through the page cache.
+A byte-identical copy has the same perceptual hash, so no file digests
+are kept.
+
+Layout (little-endian):
+    magic (8 bytes), hash width (u32), hash count (u64), hashes...
+"""
+import mmap
+import os
+import struct
+from typing import Iterable, Optional
+import numpy as np
+from ecowander.config.settings import HASH_INDEX_SETTINGS
+
+MAGIC = b"EWHASH2\0"
+_HEADER = struct.Struct("<8sIQ")
+
+class HashIndex:
+    """Read-only view of a hash index file."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Index file written by write_hash_index
+
+        Raises:
+            ValueError: If the file is not a valid hash index
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, hash_width, hash_count = _HEADER.unpack_from(self._mmap)
+        except struct.error:
+            magic = None
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a hash index: {path}")
+
+        self.hash_width = hash_width
+        self._hash_offset = _HEADER.size
+        if len(self._mmap) != self._hash_offset + hash_count * hash_width:
+            self._mmap.close()
+            raise ValueError(f"Truncated hash index: {path}")
+
+        # Fixed-width byte strings sort like the raw bytes, so numpy can
+        # binary-search the mapped records directly
+        self.image_hashes = np.frombuffer(
+            self._mmap, dtype=f"S{hash_width}", count=hash_count, offset=self._hash_offset
+        )
+
+    @classmethod
+    def open_default(cls) -> Optional["HashIndex"]:
+        """Open HASH_INDEX_SETTINGS["path"], or return None if there is no index."""
+        path = HASH_INDEX_SETTINGS["path"]
+        return cls(path) if os.path.exists(path) else None
+
+    def __len__(self) -> int:
+        return len(self.image_hashes)
+
+    def __contains__(self, image_hash: object) -> bool:
+        """Whether a perceptual hash (hex string from generate_image_hash) is indexed."""
+        if not isinstance(image_hash, str):
+            return False
+        try:
+            key = bytes.fromhex(image_hash)
+        except ValueError:
+            return False
+        if len(key) != self.hash_width or not len(self.image_hashes):
+            return False
+        i = int(self.image_hashes.searchsorted(np.bytes_(key)))
+        # Compare the raw record: numpy strips trailing NUL bytes from values
+        start = self._hash_offset + i * self.hash_width
+        return i < len(self.image_hashes) and self._mmap[start:start + self.hash_width] == key
+
+    def close(self) -> None:
+        # The array borrows the mapping, so drop it first
+        self.image_hashes = None
+        self._mmap.close()
+
+def _sorted_records(records: Iterable[bytes], width: int) -> np.ndarray:
+    if not isinstance(records, np.ndarray):
+        records = np.array(list(records), dtype=f"S{width}")
+    return np.unique(records.astype(f"S{width}", copy=False))
+
+def write_hash_index(path: str, image_hashes: Iterable[bytes], hash_width: int) -> int:
+    """
+    Write a hash index, sorting and de-duplicating the records.
+
+    The file is written next to its destination and renamed over it, so
+    readers never see a partial index.
+
+    Args:
+        path: Destination file
+        image_hashes: Perceptual hashes as raw bytes, hash_width each
+        hash_width: Bytes per perceptual hash
+
+    Returns:
+        Number of distinct perceptual hashes written
+    """
+    hashes = _sorted_records(image_hashes, hash_width)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, hash_width, len(hashes)))
+        f.write(hashes.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(hashes)
@@ -1,22 +1,56 @@
 import hashlib
 from PIL import Image, ImageFilter
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
+from ecowander.services.image_source import ImageSource, open_image_source, stream_size
+from ecowander.services.image_validation import (
+    ImageRejected,
+    header_from_image,
+    validate_image_header
+)
 
-def generate_image_hash(image_path: str, hash_size: int = 16) -> str:
+# JPEGs are decoded in draft mode at no less than hash_size * HASH_DRAFT_SCALE
+# pixels a side. The offline index builder hashes with this same function,
+# so indexed and live hashes of a photo match.
+HASH_DRAFT_SCALE = 8
+
+def _decode_limits(limits: Dict) -> Dict:
+    """
+    Header limits for a decoding stage.
+    
+    The pixel and dimension budgets bound the decode for every caller; the
+    encoded byte size is an upload limit, checked at admission, so it only
+    applies here when given explicitly.
+    """
+    return {"max_bytes": None, **limits}
+
+def generate_image_hash(image_path: ImageSource, hash_size: int = 16, **limits) -> str:
     """
     Generate perceptual hash for image.
     
     Args:
-        image_path: Path to image file
+        image_path: Path, encoded image buffer or binary file-like object
         hash_size: Size of hash to generate
+        **limits: Overrides passed to validate_image_header; the upload
+            byte limit only applies if max_bytes is given
         
     Returns:
         Hexadecimal hash string
+        
+    Raises:
+        ImageRejected: If the image header fails validation
+        ValueError: If the image cannot be hashed
     """
     try:
         # Open and process image
-        with Image.open(image_path) as img:
+        with open_image_source(image_path) as f, Image.open(f) as img:
+            # Refuse oversized images before decoding anything
+            validate_image_header(header_from_image(img, stream_size(f)), **_decode_limits(limits))
+            
+            # Let libjpeg decode straight to a small grayscale image
+            draft_size = hash_size * HASH_DRAFT_SCALE
+            img.draft('L', (draft_size, draft_size))
+            
             # Convert to grayscale and resize
             img = img.convert('L').resize(
                 (hash_size, hash_size), 
@@ -38,21 +72,35 @@ def generate_image_hash(image_path: str, hash_size: int = 16) -> str:
             
             return hash_hex
             
+    except ImageRejected:
+        raise
     except Exception as e:
         raise ValueError(f"Hash generation failed: {str(e)}")
 
-def check_image_manipulation(image_path: str) -> Dict:
+def check_image_manipulation(
+    image_path: ImageSource,
+    max_size: Optional[int] = None,
+    **limits
+) -> Dict:
     """
     Check for signs of image manipulation.
     
     Args:
-        image_path: Path to image file
+        image_path: Path, encoded image buffer or binary file-like object
+        max_size: If set, decode (in JPEG draft mode where possible) and
+            filter a thumbnail no larger than this on either side; cheaper
+            but less sensitive than the full-resolution check
+        **limits: Overrides passed to validate_image_header; the upload
+            byte limit only applies if max_bytes is given
         
     Returns:
         Dictionary with manipulation detection results
     """
     try:
-        with Image.open(image_path) as img:
+        with open_image_source(image_path) as f, Image.open(f) as img:
+            # The edge filter runs at full resolution; bound it before decoding
+            validate_image_header(header_from_image(img, stream_size(f)), **_decode_limits(limits))
+            
             # Check basic manipulation indicators
             results = {
                 "has_transparency": img.mode in ('RGBA', 'LA'),
@@ -62,11 +110,15 @@ def check_image_manipulation(image_path: str) -> Dict:
                 "is_edited": False
             }
             
+            if max_size:
+                img.thumbnail((max_size, max_size))
+                results["analyzed_size"] = list(img.size)
+            
             # Simple edge detection analysis
             edges = img.filter(ImageFilter.FIND_EDGES())
             edge_var = np.array(edges).var()
-            results["edge_variance"] = edge_var
-            results["is_edited"] = edge_var > 500  # Arbitrary threshold
+            results["edge_variance"] = float(edge_var)
+            results["is_edited"] = bool(edge_var > 500)  # Arbitrary threshold
             
             return results
             
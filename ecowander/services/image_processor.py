@@ -1,17 +1,121 @@
-from PIL import Image, ImageOps
+from PIL import Image
 import numpy as np
-from typing import Tuple
+from typing import NamedTuple, Optional, Sequence, Tuple
+from ecowander.services.image_source import ImageSource, open_image_source, stream_size
+from ecowander.services.image_validation import header_from_image, validate_image_header
+
+# Resize policy for every model input: the whole frame is stretched to the
+# target size with bicubic filtering - no cropping, no letterboxing. This is
+# how PhotoVerifier has always fed the model, so predictions stay comparable.
+RESIZE_FILTER = Image.BICUBIC
+
+# Decode and box-reduce only down to this multiple of the target size, then
+# let RESIZE_FILTER do the final step, which keeps the quality of a full
+# bicubic resize at a fraction of the cost.
+REDUCING_GAP = 2.0
+
+class DecodedImage(NamedTuple):
+    pixels: np.ndarray  # uint8 array of shape (height, width, 3)
+    original_size: Tuple[int, int]
+    format: Optional[str]
+
+class ImagePreprocessor:
+    """
+    Decode images directly at model-input size.
+    
+    JPEGs are decoded with draft(), which lets libjpeg scale by 1/2, 1/4
+    or 1/8 during decoding, so a 4000x3000 photo is never materialized at
+    full size. Remaining downscaling uses reduce() (via reducing_gap) and a
+    final RESIZE_FILTER resize.
+    """
+    
+    def __init__(
+        self,
+        target_size: Tuple[int, int] = (224, 224),
+        allowed_formats: Optional[Sequence[str]] = None
+    ):
+        """
+        Args:
+            target_size: Target dimensions (width, height)
+            allowed_formats: PIL format names to accept (defaults to
+                APP_SETTINGS["allowed_formats"])
+        """
+        self.target_size = target_size
+        self.allowed_formats = allowed_formats
+        
+    def decode(self, image_path: ImageSource) -> DecodedImage:
+        """
+        Decode and resize an image to target size.
+        
+        Args:
+            image_path: Path, encoded image buffer or binary file-like object
+            
+        Returns:
+            DecodedImage with uint8 RGB pixels at target size
+            
+        Raises:
+            ImageRejected: If the header fails validation; nothing is decoded
+        """
+        width, height = self.target_size
+        
+        with open_image_source(image_path) as f, Image.open(f) as img:
+            # Only the decode budget; the byte size is checked at upload admission
+            validate_image_header(
+                header_from_image(img, stream_size(f)),
+                allowed_formats=self.allowed_formats,
+                max_bytes=None
+            )
+                
+            original_size, image_format = img.size, img.format
+            
+            # No-op for formats other than JPEG
+            img.draft('RGB', (int(width * REDUCING_GAP), int(height * REDUCING_GAP)))
+            
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            img = img.resize(self.target_size, RESIZE_FILTER, reducing_gap=REDUCING_GAP)
+            
+            return DecodedImage(np.asarray(img), original_size, image_format)
+            
+    def to_model_input(
+        self,
+        pixels: np.ndarray,
+        out: Optional[np.ndarray] = None,
+        normalize: bool = True
+    ) -> np.ndarray:
+        """
+        Convert decoded pixels to a float32 batch of one.
+        
+        Args:
+            pixels: uint8 array from decode()
+            out: Preallocated (1, height, width, 3) float32 buffer to fill
+            normalize: Whether to scale pixel values to 0-1
+            
+        Returns:
+            The filled buffer
+        """
+        if out is None:
+            out = np.empty((1, *pixels.shape), dtype=np.float32)
+            
+        if normalize:
+            np.divide(pixels, np.float32(255.0), out=out[0])
+        else:
+            out[0] = pixels
+        return out
 
 def process_image_for_model(
-    image_path: str,
+    image_path: ImageSource,
     target_size: Tuple[int, int] = (224, 224),
     normalize: bool = True
 ) -> np.ndarray:
     """
     Process image for model input.
     
+    Uses the same decoding and resize policy as PhotoVerifier (see
+    ImagePreprocessor and RESIZE_FILTER).
+    
     Args:
-        image_path: Path to image file
+        image_path: Path, encoded image buffer or binary file-like object
         target_size: Target dimensions (width, height)
         normalize: Whether to normalize pixel values
         
@@ -19,43 +123,29 @@ def process_image_for_model(
         Numpy array with processed image
     """
     try:
-        with Image.open(image_path) as img:
-            # Convert to RGB if not already
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Resize and maintain aspect ratio
-            img = ImageOps.fit(img, target_size)
-            
-            # Convert to array and normalize
-            img_array = np.array(img, dtype=np.float32)
-            if normalize:
-                img_array /= 255.0
-            
-            # Add batch dimension
-            img_array = np.expand_dims(img_array, axis=0)
-            
-            return img_array
+        preprocessor = ImagePreprocessor(target_size)
+        decoded = preprocessor.decode(image_path)
+        return preprocessor.to_model_input(decoded.pixels, normalize=normalize)
             
     except Exception as e:
         raise ValueError(f"Image processing failed: {str(e)}")
 
 def detect_pink_pixels(
-    image_path: str,
+    image_path: ImageSource,
     threshold: float = 0.1
 ) -> float:
     """
     Detect percentage of pink pixels in image.
     
     Args:
-        image_path: Path to image file
+        image_path: Path, encoded image buffer or binary file-like object
         threshold: Minimum pink intensity (0-1)
         
     Returns:
         Percentage of pink pixels (0-1)
     """
     try:
-        with Image.open(image_path) as img:
+        with open_image_source(image_path) as f, Image.open(f) as img:
             img = img.convert('RGB')
             pixels = np.array(img)
             
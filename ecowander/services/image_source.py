@@ -0,0 +1,129 @@
+import io
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Union
+
+# Anything the verification entry points accept as an image
+ImageSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+class BufferReader(io.RawIOBase):
+    """Seekable read-only stream over a memoryview, without copying the buffer."""
+
+    def __init__(self, buffer: Union[bytearray, memoryview]):
+        view = memoryview(buffer)
+        self._view = view if view.format == 'B' and view.ndim == 1 else view.cast('B')
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        chunk = self._view[self._pos:self._pos + len(b)]
+        n = len(chunk)
+        b[:n] = chunk
+        self._pos += n
+        return n
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else self._pos + size
+        data = self._view[self._pos:end].tobytes()
+        self._pos += len(data)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self._pos = max(0, self._pos)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+def _is_stream(source: ImageSource) -> bool:
+    return hasattr(source, "read")
+
+@contextmanager
+def open_image_source(source: ImageSource) -> Iterator[BinaryIO]:
+    """
+    Open an image source as a binary stream.
+
+    Paths are opened (and closed) here. In-memory buffers are wrapped
+    without copying. Caller-owned streams are rewound and yielded as-is,
+    and are left open.
+
+    Args:
+        source: Path, bytes, bytearray, memoryview or binary file-like object
+
+    Yields:
+        Readable, seekable binary stream positioned at the start
+    """
+    if isinstance(source, bytes):
+        # BytesIO shares the immutable buffer instead of copying it
+        yield io.BytesIO(source)
+    elif isinstance(source, (bytearray, memoryview)):
+        yield BufferReader(source)
+    elif _is_stream(source):
+        if source.seekable():
+            source.seek(0)
+            yield source
+        else:
+            yield io.BytesIO(source.read())
+    else:
+        with open(source, 'rb') as f:
+            yield f
+
+def as_shared_source(source: ImageSource) -> ImageSource:
+    """
+    Make an image source safe to read from several threads at once.
+
+    Paths and buffers are returned unchanged. Streams keep a single read
+    position, so they are read into memory once.
+
+    Args:
+        source: Image source
+
+    Returns:
+        Equivalent source that concurrent readers can each open
+    """
+    if _is_stream(source):
+        with open_image_source(source) as f:
+            return f.read()
+    return source
+
+def image_source_size(source: ImageSource) -> int:
+    """Size in bytes of an image source."""
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    if isinstance(source, memoryview):
+        return source.nbytes
+    if _is_stream(source):
+        with open_image_source(source) as f:
+            return stream_size(f)
+    return os.path.getsize(source)
+
+def stream_size(f: BinaryIO) -> int:
+    """Size in bytes of an open seekable stream, leaving its position unchanged."""
+    position = f.tell()
+    size = f.seek(0, io.SEEK_END)
+    f.seek(position)
+    return size
+
+def describe_image_source(source: ImageSource) -> str:
+    """Short human-readable description of an image source for logs."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return f"<{image_source_size(source)}-byte buffer>"
+    if _is_stream(source):
+        return str(getattr(source, "name", "<stream>"))
+    return str(source)
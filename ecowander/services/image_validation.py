@@ -0,0 +1,125 @@
+from PIL import Image, UnidentifiedImageError
+from typing import NamedTuple, Optional, Sequence
+from ecowander.config.settings import APP_SETTINGS
+from ecowander.services.image_source import ImageSource, open_image_source, stream_size
+
+# Default for limits left out of validate_image_header; None disables a check
+_FROM_SETTINGS = object()
+
+class ImageRejected(ValueError):
+    """Raised when an image fails header validation."""
+
+    def __init__(self, reason: str, message: str):
+        """
+        Args:
+            reason: One of "invalid", "format", "mode", "bytes", "dimensions", "pixels"
+            message: Human-readable explanation
+        """
+        super().__init__(message)
+        self.reason = reason
+
+class ImageHeader(NamedTuple):
+    format: Optional[str]
+    width: int
+    height: int
+    mode: str
+    byte_size: Optional[int]
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+def header_from_image(img: Image.Image, byte_size: Optional[int] = None) -> ImageHeader:
+    """Describe an opened (not yet decoded) PIL image."""
+    return ImageHeader(img.format, img.width, img.height, img.mode, byte_size)
+
+def read_image_header(image_path: ImageSource) -> ImageHeader:
+    """
+    Read format, dimensions and mode from the image header.
+
+    Only the header is parsed; no pixel data is decoded.
+
+    Args:
+        image_path: Path, encoded image buffer or binary file-like object
+
+    Returns:
+        ImageHeader for the image
+
+    Raises:
+        ImageRejected: If the data is not a readable image, or is so large
+            that Pillow refuses to open it
+    """
+    with open_image_source(image_path) as f:
+        try:
+            with Image.open(f) as img:
+                header = header_from_image(img, stream_size(f))
+        except Image.DecompressionBombError as e:
+            raise ImageRejected("pixels", str(e))
+        except (UnidentifiedImageError, SyntaxError, OSError) as e:
+            # OSError covers headers truncated mid-way
+            raise ImageRejected("invalid", f"Invalid image file: {e}")
+
+    return header
+
+def validate_image_header(
+    header: ImageHeader,
+    allowed_formats: Optional[Sequence[str]] = None,
+    max_bytes: Optional[int] = _FROM_SETTINGS,
+    max_pixels: Optional[int] = _FROM_SETTINGS,
+    max_dimension: Optional[int] = _FROM_SETTINGS
+) -> ImageHeader:
+    """
+    Check an image header against the configured limits.
+
+    Limits not passed default to APP_SETTINGS; passing None, or a setting
+    of None, disables that check.
+
+    Args:
+        header: Header from read_image_header or header_from_image
+        allowed_formats: PIL format names to accept
+        max_bytes: Max encoded size (skipped if header.byte_size is unknown)
+        max_pixels: Max width * height
+        max_dimension: Max width or height
+
+    Returns:
+        The header, if it passes
+
+    Raises:
+        ImageRejected: On the first limit the image exceeds
+    """
+    allowed_formats = allowed_formats or APP_SETTINGS["allowed_formats"]
+    allowed_modes = APP_SETTINGS["allowed_image_modes"]
+    if max_bytes is _FROM_SETTINGS:
+        max_bytes = APP_SETTINGS["max_image_size"]
+    if max_pixels is _FROM_SETTINGS:
+        max_pixels = APP_SETTINGS["max_image_pixels"]
+    if max_dimension is _FROM_SETTINGS:
+        max_dimension = APP_SETTINGS["max_image_dimension"]
+
+    if allowed_formats and header.format not in allowed_formats:
+        raise ImageRejected("format", f"Unsupported image format: {header.format}")
+    if allowed_modes and header.mode not in allowed_modes:
+        raise ImageRejected("mode", f"Unsupported image mode: {header.mode}")
+    if max_bytes and header.byte_size is not None and header.byte_size > max_bytes:
+        raise ImageRejected("bytes", f"Image exceeds {max_bytes} bytes")
+    if max_dimension and max(header.width, header.height) > max_dimension:
+        raise ImageRejected("dimensions", f"Image dimensions {header.width}x{header.height} too large")
+    if max_pixels and header.pixels > max_pixels:
+        raise ImageRejected("pixels", f"Image has too many pixels ({header.width}x{header.height})")
+    return header
+
+def check_image(image_path: ImageSource, **limits) -> ImageHeader:
+    """
+    Read and validate an image header before any decoding.
+
+    Args:
+        image_path: Path, encoded image buffer or binary file-like object
+        **limits: Overrides passed to validate_image_header
+
+    Returns:
+        ImageHeader for the accepted image
+
+    Raises:
+        ImageRejected: If the image is unreadable or exceeds a limit
+    """
+    return validate_image_header(read_image_header(image_path), **limits)
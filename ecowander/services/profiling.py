@@ -0,0 +1,273 @@
+"""
+Sampled profiling of slow requests.
+
+SlowRequestProfiler picks one in PROFILING_SETTINGS["sample_every"]
+requests to profile. A profiled request carries a RequestProfile on its
+Deadline, and each stage it runs (decode, inference, hashing, ...) is
+profiled with its own cProfile.Profile on whichever pool thread runs it;
+the stage profiles are merged when the capture is read. With
+"trace_memory" set, tracemalloc snapshots taken around the request are
+diffed as well. Snapshots cover the whole process, so allocations of
+concurrent requests show up too.
+
+Requests slower than "slow_threshold_ms" are captured even if they were
+not profiled, with their stage timings and image metadata only. The
+"top_k" slowest captures are kept and served by GET /debug/profiles.
+"""
+import cProfile
+import heapq
+import itertools
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+from ecowander.config.settings import PROFILING_SETTINGS
+
+class RequestProfile:
+    """cProfile (and optionally tracemalloc) state of one profiled request."""
+
+    def __init__(self, trace_memory: bool = False):
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._memory_start: Optional[tracemalloc.Snapshot] = None
+        self.allocations: Optional[List[Dict]] = None
+        self.peak_memory_kb: Optional[float] = None
+        if trace_memory:
+            _start_tracing()
+            self._memory_start = _snapshot()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile one stage on the current thread."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            with self._lock:
+                self._profiles.append(profiler)
+
+    def finish(self, top_allocations: int) -> None:
+        """Stop memory tracing and keep the largest allocation differences."""
+        if self._memory_start is None:
+            return
+        try:
+            stats = _snapshot().compare_to(self._memory_start, "lineno")
+            self.peak_memory_kb = tracemalloc.get_traced_memory()[1] / 1024
+            self.allocations = [
+                {
+                    "location": str(stat.traceback[0]),
+                    "size_diff_kb": stat.size_diff / 1024,
+                    "count_diff": stat.count_diff
+                }
+                for stat in stats[:top_allocations]
+            ]
+        finally:
+            self._memory_start = None
+            _stop_tracing()
+
+    def stats(self) -> Optional[pstats.Stats]:
+        """Stage profiles merged into one, or None if no stage ran."""
+        with self._lock:
+            profiles = list(self._profiles)
+        return pstats.Stats(*profiles) if profiles else None
+
+# Profiled requests currently tracing memory; tracemalloc runs while any do
+_tracing_lock = threading.Lock()
+_tracing_requests = 0
+_tracing_started = False
+
+def _start_tracing() -> None:
+    global _tracing_requests, _tracing_started
+    with _tracing_lock:
+        if _tracing_requests == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_requests += 1
+
+def _stop_tracing() -> None:
+    global _tracing_requests, _tracing_started
+    with _tracing_lock:
+        _tracing_requests -= 1
+        # Leave tracing alone if something else started it
+        if _tracing_requests == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+
+@dataclass(eq=False)
+class ProfileCapture:
+    """One captured request: timings, metadata and its profile if it was profiled."""
+    elapsed_ms: float
+    captured_at: float
+    stage_timings: Dict[str, float]
+    metadata: Dict
+    profile: Optional[RequestProfile] = None
+    _stats: Optional[pstats.Stats] = field(default=None, repr=False)
+
+    @property
+    def stats(self) -> Optional[pstats.Stats]:
+        if self._stats is None and self.profile is not None:
+            self._stats = self.profile.stats()
+        return self._stats
+
+    def to_dict(self, top_functions: int) -> Dict:
+        """JSON-ready summary with the top functions by cumulative time."""
+        result = {
+            "elapsed_ms": self.elapsed_ms,
+            "captured_at": self.captured_at,
+            "profiled": self.profile is not None,
+            "stage_timings": self.stage_timings,
+            "metadata": self.metadata
+        }
+        stats = self.stats
+        if stats is not None:
+            rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+            result["functions"] = [
+                {
+                    "function": pstats.func_std_string(func),
+                    "calls": calls,
+                    "total_ms": total * 1000,
+                    "cumulative_ms": cumulative * 1000
+                }
+                for func, (_, calls, total, cumulative, _) in rows[:top_functions]
+            ]
+        if self.profile is not None and self.profile.allocations is not None:
+            result["allocations"] = self.profile.allocations
+            result["peak_memory_kb"] = self.profile.peak_memory_kb
+        return result
+
+class SlowRequestProfiler:
+    """Profiles sampled requests and keeps the slowest captures."""
+
+    def __init__(
+        self,
+        sample_every: Optional[int] = None,
+        slow_threshold_ms: Optional[float] = None,
+        top_k: Optional[int] = None,
+        trace_memory: Optional[bool] = None
+    ):
+        """
+        Args:
+            sample_every: Profile one in this many requests; 0 profiles none
+            slow_threshold_ms: Capture requests at least this slow even if
+                they were not profiled
+            top_k: Number of slowest captures kept
+            trace_memory: Diff tracemalloc snapshots of profiled requests
+
+        All default to PROFILING_SETTINGS.
+        """
+        def setting(value, key):
+            return PROFILING_SETTINGS[key] if value is None else value
+
+        self.sample_every = setting(sample_every, "sample_every")
+        self.slow_threshold_ms = setting(slow_threshold_ms, "slow_threshold_ms")
+        self.top_k = setting(top_k, "top_k")
+        self.trace_memory = setting(trace_memory, "trace_memory")
+        self._requests = itertools.count(1)
+        self._sequence = itertools.count()
+        # Min-heap of (elapsed_ms, sequence, capture): the fastest is evicted first
+        self._captures: List = []
+        self._lock = threading.Lock()
+
+    def start(self) -> Optional[RequestProfile]:
+        """Profile for a new request, or None if it was not sampled."""
+        if not self.sample_every or next(self._requests) % self.sample_every:
+            return None
+        return RequestProfile(trace_memory=self.trace_memory)
+
+    def is_slow(self, elapsed_ms: float) -> bool:
+        return self.slow_threshold_ms is not None and elapsed_ms >= self.slow_threshold_ms
+
+    def finish(
+        self,
+        profile: Optional[RequestProfile],
+        elapsed_ms: float,
+        stage_timings: Optional[Dict[str, float]] = None,
+        metadata: Optional[Dict] = None
+    ) -> Optional[ProfileCapture]:
+        """
+        Record a finished request if it was profiled or slow.
+
+        Args:
+            profile: The request's profile from start()
+            elapsed_ms: End-to-end request latency
+            stage_timings: Milliseconds per stage (Deadline.timings)
+            metadata: Image and request details to keep with the capture
+
+        Returns:
+            The capture if the request was profiled or slow, else None
+        """
+        if profile is not None:
+            profile.finish(PROFILING_SETTINGS["top_allocations"])
+        elif not self.is_slow(elapsed_ms):
+            return None
+
+        capture = ProfileCapture(
+            elapsed_ms=elapsed_ms,
+            captured_at=time.time(),
+            stage_timings=dict(stage_timings or {}),
+            metadata=metadata or {},
+            profile=profile
+        )
+        entry = (elapsed_ms, next(self._sequence), capture)
+        with self._lock:
+            if len(self._captures) < self.top_k:
+                heapq.heappush(self._captures, entry)
+            elif self._captures and elapsed_ms > self._captures[0][0]:
+                heapq.heapreplace(self._captures, entry)
+        return capture
+
+    def captures(self) -> List[ProfileCapture]:
+        """Kept captures, slowest first."""
+        with self._lock:
+            entries = sorted(self._captures, reverse=True, key=lambda entry: entry[:2])
+        return [capture for _, _, capture in entries]
+
+    def dump(self, directory: Optional[str] = None, top_functions: Optional[int] = None) -> List[Dict]:
+        """
+        Summarize the kept captures, slowest first.
+
+        Args:
+            directory: If given, also write captures.json and a pstats
+                file (capture-<n>.prof) for each profiled capture there
+            top_functions: Functions listed per capture (defaults to
+                PROFILING_SETTINGS)
+
+        Returns:
+            JSON-ready capture summaries
+        """
+        top_functions = top_functions or PROFILING_SETTINGS["top_functions"]
+        summaries = []
+        for index, capture in enumerate(self.captures()):
+            summary = capture.to_dict(top_functions)
+            if directory is not None and capture.stats is not None:
+                os.makedirs(directory, exist_ok=True)
+                summary["profile_path"] = os.path.join(directory, f"capture-{index}.prof")
+                capture.stats.dump_stats(summary["profile_path"])
+            summaries.append(summary)
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, "captures.json"), "w") as f:
+                json.dump(summaries, f, indent=2)
+        return summaries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._captures.clear()
@@ -0,0 +1,224 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+from ecowander.config.settings import DATABASE_SETTINGS
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS verifications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT,
+        image_hash TEXT,
+        challenge_type TEXT,
+        confidence REAL,
+        location_score REAL,
+        fraud_score REAL,
+        is_verified INTEGER,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        metadata TEXT,
+        batch_key TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS eco_locations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE,
+        latitude REAL,
+        longitude REAL,
+        radius_meters INTEGER,
+        challenge_types TEXT,
+        description TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_stats (
+        user_id TEXT PRIMARY KEY,
+        submissions INTEGER NOT NULL DEFAULT 0,
+        verified INTEGER NOT NULL DEFAULT 0,
+        last_timestamp DATETIME
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS manipulation_rechecks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        image_hash TEXT,
+        user_id TEXT,
+        is_edited INTEGER,
+        timestamp DATETIME,
+        result TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS challenge_daily_stats (
+        challenge_type TEXT NOT NULL,
+        day DATE NOT NULL,
+        submissions INTEGER NOT NULL DEFAULT 0,
+        verified INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (challenge_type, day)
+    )
+    """
+]
+
+# Created after migrations, since they may index migrated columns
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_verifications_user_time ON verifications (user_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_verifications_image_hash ON verifications (image_hash)",
+    # Batch rows are keyed by run and record so a resumed run cannot store them twice
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_verifications_batch_key ON verifications (batch_key)",
+    "CREATE INDEX IF NOT EXISTS idx_verifications_challenge_time ON verifications (challenge_type, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_user_stats_verified ON user_stats (verified DESC, user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_manipulation_rechecks_image_hash ON manipulation_rechecks (image_hash)"
+]
+
+# Aggregate tables kept up to date by the writer, rebuilt from history
+# when they are first added to an existing database
+AGGREGATE_TABLES = ("user_stats", "challenge_daily_stats")
+
+REBUILD_AGGREGATES = [
+    "DELETE FROM user_stats",
+    "DELETE FROM challenge_daily_stats",
+    """
+    INSERT INTO user_stats (user_id, submissions, verified, last_timestamp)
+    SELECT user_id, COUNT(*), SUM(COALESCE(is_verified, 0)), MAX(timestamp)
+    FROM verifications
+    WHERE user_id IS NOT NULL
+    GROUP BY user_id
+    """,
+    """
+    INSERT INTO challenge_daily_stats (challenge_type, day, submissions, verified)
+    SELECT challenge_type, date(timestamp), COUNT(*), SUM(COALESCE(is_verified, 0))
+    FROM verifications
+    WHERE challenge_type IS NOT NULL AND date(timestamp) IS NOT NULL
+    GROUP BY challenge_type, date(timestamp)
+    """
+]
+
+# Columns added after the first release, applied to existing databases
+MIGRATIONS = {
+    "verifications": [("is_verified", "INTEGER"), ("batch_key", "TEXT")]
+}
+
+# Column constraints dropped after the first release. SQLite cannot drop a
+# constraint in place, so these tables are rebuilt: (table, column)
+DROPPED_UNIQUE = [("verifications", "image_hash")]
+
+def connect(db_path: Optional[str] = None, read_only: bool = False) -> sqlite3.Connection:
+    """
+    Open a connection with the configured journal and sync settings.
+
+    Args:
+        db_path: Database file (defaults to DATABASE_SETTINGS["path"])
+        read_only: Open the database read-only
+
+    Returns:
+        SQLite connection usable from any thread (one thread at a time)
+    """
+    db_path = Path(db_path or DATABASE_SETTINGS["path"])
+
+    if read_only:
+        conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        conn.execute(f"PRAGMA journal_mode={DATABASE_SETTINGS['journal_mode']}")
+
+    conn.execute(f"PRAGMA synchronous={DATABASE_SETTINGS['synchronous']}")
+    conn.execute(f"PRAGMA busy_timeout={int(DATABASE_SETTINGS['busy_timeout_ms'])}")
+    return conn
+
+def init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables, apply column migrations and create indexes."""
+    with conn:
+        existing_tables = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+
+        for statement in SCHEMA:
+            conn.execute(statement)
+
+        for table, columns in MIGRATIONS.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for name, column_type in columns:
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+        for table, column in DROPPED_UNIQUE:
+            if _has_unique_constraint(conn, table, column):
+                _rebuild_table(conn, table)
+
+        for statement in INDEXES:
+            conn.execute(statement)
+
+        if "verifications" in existing_tables and not existing_tables.issuperset(AGGREGATE_TABLES):
+            _rebuild_aggregates(conn)
+
+def _has_unique_constraint(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    """Whether a UNIQUE constraint (not a CREATE INDEX) covers exactly this column."""
+    for _, name, unique, origin, _ in conn.execute(f"PRAGMA index_list({table})"):
+        if unique and origin == "u":
+            columns = [row[2] for row in conn.execute(f"PRAGMA index_info({name})")]
+            if columns == [column]:
+                return True
+    return False
+
+def _rebuild_table(conn: sqlite3.Connection, table: str) -> None:
+    """Recreate a table from its current SCHEMA statement, keeping every row."""
+    statement = next(s for s in SCHEMA if f"EXISTS {table} (" in s)
+    columns = ", ".join(row[1] for row in conn.execute(f"PRAGMA table_info({table})"))
+
+    conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    conn.execute(statement)
+    conn.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_old")
+    conn.execute(f"DROP TABLE {table}_old")
+
+def rebuild_aggregates(conn: sqlite3.Connection) -> None:
+    """Recompute the aggregate tables from the full verification history."""
+    with conn:
+        _rebuild_aggregates(conn)
+
+def _rebuild_aggregates(conn: sqlite3.Connection) -> None:
+    for statement in REBUILD_AGGREGATES:
+        conn.execute(statement)
+
+class ReadConnectionPool:
+    """Fixed-size pool of read-only connections, reused across requests."""
+
+    def __init__(self, db_path: Optional[str] = None, size: Optional[int] = None):
+        """
+        Args:
+            db_path: Database file (defaults to DATABASE_SETTINGS["path"])
+            size: Number of connections (defaults to DATABASE_SETTINGS["read_pool_size"])
+        """
+        self.db_path = db_path or DATABASE_SETTINGS["path"]
+        self.size = size or DATABASE_SETTINGS["read_pool_size"]
+        self._pool: queue.Queue = queue.Queue(maxsize=self.size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, opening one if the pool is not full yet."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._created < self.size
+                if can_open:
+                    self._created += 1
+            conn = connect(self.db_path, read_only=True) if can_open else self._pool.get()
+
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
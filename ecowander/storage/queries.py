@@ -0,0 +1,188 @@
+"""
+Read queries over verification history.
+
+Every query here is served by an index or an aggregate table, so its cost
+depends on the size of the answer rather than on the size of the history:
+
+- per-user history uses idx_verifications_user_time
+- per-challenge history uses idx_verifications_challenge_time
+- per-user totals and the leaderboard read user_stats
+- per-challenge daily counts read challenge_daily_stats
+"""
+import json
+import sqlite3
+from typing import Dict, List, Optional
+
+SUBMISSION_COLUMNS = """
+    id, user_id, image_hash, challenge_type, confidence, location_score,
+    fraud_score, is_verified, timestamp, metadata
+"""
+
+def _fetch_all(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> List[Dict]:
+    """Run a query and return rows as dictionaries."""
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    return [dict(row) for row in cursor.execute(sql, params)]
+
+def _decode_submissions(rows: List[Dict]) -> List[Dict]:
+    for row in rows:
+        row["is_verified"] = bool(row["is_verified"])
+        row["metadata"] = json.loads(row["metadata"]) if row["metadata"] else None
+    return rows
+
+def recent_user_submissions(
+    conn: sqlite3.Connection,
+    user_id: str,
+    limit: int = 20,
+    before: Optional[str] = None
+) -> List[Dict]:
+    """
+    Get a user's most recent submissions, newest first.
+
+    Args:
+        conn: Database connection
+        user_id: User identifier
+        limit: Max rows to return
+        before: Only return submissions older than this ISO timestamp,
+            for paging through history
+
+    Returns:
+        List of submission dictionaries
+    """
+    sql = f"SELECT {SUBMISSION_COLUMNS} FROM verifications WHERE user_id = ?"
+    params: tuple = (user_id,)
+    if before is not None:
+        sql += " AND timestamp < ?"
+        params += (before,)
+    sql += " ORDER BY timestamp DESC LIMIT ?"
+
+    return _decode_submissions(_fetch_all(conn, sql, params + (limit,)))
+
+def recent_challenge_submissions(
+    conn: sqlite3.Connection,
+    challenge_type: str,
+    limit: int = 20,
+    before: Optional[str] = None
+) -> List[Dict]:
+    """
+    Get the most recent submissions for a challenge, newest first.
+
+    Args:
+        conn: Database connection
+        challenge_type: Challenge type
+        limit: Max rows to return
+        before: Only return submissions older than this ISO timestamp
+
+    Returns:
+        List of submission dictionaries
+    """
+    sql = f"SELECT {SUBMISSION_COLUMNS} FROM verifications WHERE challenge_type = ?"
+    params: tuple = (challenge_type,)
+    if before is not None:
+        sql += " AND timestamp < ?"
+        params += (before,)
+    sql += " ORDER BY timestamp DESC LIMIT ?"
+
+    return _decode_submissions(_fetch_all(conn, sql, params + (limit,)))
+
+def count_user_submissions_since(conn: sqlite3.Connection, user_id: str, since: str) -> int:
+    """
+    Count a user's submissions at or after a timestamp, e.g. for rate rules.
+
+    Args:
+        conn: Database connection
+        user_id: User identifier
+        since: ISO timestamp
+
+    Returns:
+        Number of submissions
+    """
+    row = conn.execute(
+        "SELECT COUNT(*) FROM verifications WHERE user_id = ? AND timestamp >= ?",
+        (user_id, since)
+    ).fetchone()
+    return row[0]
+
+def get_user_stats(conn: sqlite3.Connection, user_id: str) -> Optional[Dict]:
+    """
+    Get a user's submission and verified totals.
+
+    Args:
+        conn: Database connection
+        user_id: User identifier
+
+    Returns:
+        Dictionary with submissions, verified and last_timestamp, or None
+        if the user has no submissions
+    """
+    rows = _fetch_all(
+        conn,
+        "SELECT user_id, submissions, verified, last_timestamp FROM user_stats WHERE user_id = ?",
+        (user_id,)
+    )
+    return rows[0] if rows else None
+
+def leaderboard(conn: sqlite3.Connection, limit: int = 10) -> List[Dict]:
+    """
+    Get the users with the most verified submissions.
+
+    Args:
+        conn: Database connection
+        limit: Number of users to return
+
+    Returns:
+        List of user stats dictionaries, highest verified count first
+    """
+    return _fetch_all(
+        conn,
+        """
+        SELECT user_id, submissions, verified, last_timestamp
+        FROM user_stats
+        ORDER BY verified DESC, user_id
+        LIMIT ?
+        """,
+        (limit,)
+    )
+
+def challenge_daily_counts(
+    conn: sqlite3.Connection,
+    challenge_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+) -> List[Dict]:
+    """
+    Get submission and verified counts per challenge per day.
+
+    Args:
+        conn: Database connection
+        challenge_type: Restrict to one challenge type
+        since: First day to include (YYYY-MM-DD)
+        until: Last day to include (YYYY-MM-DD)
+
+    Returns:
+        List of dictionaries with challenge_type, day, submissions and
+        verified, ordered by challenge type and day
+    """
+    conditions = []
+    params: tuple = ()
+    if challenge_type is not None:
+        conditions.append("challenge_type = ?")
+        params += (challenge_type,)
+    if since is not None:
+        conditions.append("day >= ?")
+        params += (since,)
+    if until is not None:
+        conditions.append("day <= ?")
+        params += (until,)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return _fetch_all(
+        conn,
+        f"""
+        SELECT challenge_type, day, submissions, verified
+        FROM challenge_daily_stats
+        {where}
+        ORDER BY challenge_type, day
+        """,
+        params
+    )
@@ -0,0 +1,306 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+from ecowander.config.settings import DATABASE_SETTINGS
+from ecowander.storage.database import connect, init_schema
+
+logger = logging.getLogger(__name__)
+
+INSERT_VERIFICATION = """
+    INSERT INTO verifications (
+        user_id, image_hash, challenge_type, confidence,
+        location_score, fraud_score, is_verified, timestamp, metadata, batch_key
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (batch_key) DO NOTHING
+"""
+
+# Verdicts of manipulation checks deferred past the request (see
+# services.degradation), joined to verifications by image hash
+INSERT_RECHECK = """
+    INSERT INTO manipulation_rechecks (image_hash, user_id, is_edited, timestamp, result)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Resubmitted photos are kept in the history, so an earlier row with the
+# same hash marks a duplicate rather than blocking the insert
+FIND_IMAGE_HASH = "SELECT 1 FROM verifications WHERE image_hash = ? LIMIT 1"
+
+UPSERT_USER_STATS = """
+    INSERT INTO user_stats (user_id, submissions, verified, last_timestamp)
+    VALUES (?, 1, ?, ?)
+    ON CONFLICT (user_id) DO UPDATE SET
+        submissions = submissions + 1,
+        verified = verified + excluded.verified,
+        last_timestamp = MAX(
+            COALESCE(last_timestamp, excluded.last_timestamp),
+            COALESCE(excluded.last_timestamp, last_timestamp)
+        )
+"""
+
+UPSERT_CHALLENGE_DAILY_STATS = """
+    INSERT INTO challenge_daily_stats (challenge_type, day, submissions, verified)
+    SELECT ?, day, 1, ? FROM (SELECT date(?) AS day) WHERE day IS NOT NULL
+    ON CONFLICT (challenge_type, day) DO UPDATE SET
+        submissions = submissions + 1,
+        verified = verified + excluded.verified
+"""
+
+_STOP = object()
+
+class _RecheckRow(NamedTuple):
+    row: Tuple  # In INSERT_RECHECK column order
+
+def _json_default(value):
+    """Serialize NumPy scalars in result metadata."""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+def record_from_result(
+    result: Dict,
+    user_id: Optional[str] = None,
+    metadata: Optional[Dict] = None,
+    batch_key: Optional[str] = None
+) -> Tuple:
+    """
+    Map a verify_eco_action result to a verifications row.
+
+    Args:
+        result: Combined verification result
+        user_id: Submitting user
+        metadata: Submission metadata stored alongside the scores
+        batch_key: Unique key of a batch record (see batch.run_batch);
+            a row whose key is already stored is not written again
+
+    Returns:
+        Row tuple in INSERT_VERIFICATION column order
+    """
+    photo = result.get("photo_verification", {})
+    location = result.get("location_verification", {})
+    fraud = result.get("fraud_detection", {})
+
+    stored_metadata = {
+        "overall_score": result.get("overall_score"),
+        "predicted_class": photo.get("predicted_class"),
+        "distance_meters": location.get("distance_meters"),
+        "is_duplicate": fraud.get("is_duplicate"),
+        "model_version": result.get("model_version"),
+        "tier": result.get("tier"),
+        "submission": metadata
+    }
+
+    return (
+        user_id,
+        fraud.get("image_hash"),
+        result.get("challenge_type"),
+        photo.get("confidence"),
+        location.get("score"),
+        fraud.get("fraud_score"),
+        int(bool(result.get("is_verified"))),
+        result.get("timestamp"),
+        json.dumps(stored_metadata, default=_json_default),
+        batch_key
+    )
+
+def record_from_recheck(job, result: Dict) -> Tuple:
+    """
+    Map a deferred manipulation check to a manipulation_rechecks row.
+
+    Args:
+        job: RecheckJob that was checked
+        result: check_image_manipulation result
+
+    Returns:
+        Row tuple in INSERT_RECHECK column order
+    """
+    return (
+        job.image_hash,
+        job.user_id,
+        int(bool(result.get("is_edited"))),
+        datetime.now().isoformat(),
+        json.dumps(result, default=_json_default)
+    )
+
+class VerificationWriter:
+    """
+    Background writer that batches verification rows into transactions.
+
+    Rows queued with submit() are written by a single thread, grouped into
+    one transaction per ``batch_size`` rows or ``flush_interval`` seconds,
+    whichever comes first. With WAL and synchronous=NORMAL a transaction
+    costs no fsync, so throughput is bounded by the batch, not by the disk.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None
+    ):
+        """
+        Args:
+            db_path: Database file (defaults to DATABASE_SETTINGS["path"])
+            batch_size: Max rows per transaction
+            flush_interval: Max seconds a row waits for its batch to fill
+            max_pending: Max rows queued before submit() raises queue.Full
+        """
+        self.db_path = db_path or DATABASE_SETTINGS["path"]
+        self.batch_size = batch_size or DATABASE_SETTINGS["batch_size"]
+        self.flush_interval = flush_interval or DATABASE_SETTINGS["flush_interval"]
+        self.rows_written = 0
+        self.duplicates_written = 0  # rows whose image hash was already stored
+        self.rows_failed = 0
+        self.rows_replayed = 0  # rows skipped because their batch_key was already stored
+        self.rechecks_written = 0
+        self.batches_written = 0
+        self._queue: queue.Queue = queue.Queue(
+            maxsize=max_pending or DATABASE_SETTINGS["max_pending"]
+        )
+
+        # Create the schema up front so startup fails loudly on a bad path
+        conn = connect(self.db_path)
+        init_schema(conn)
+        conn.close()
+
+        self._thread = threading.Thread(
+            target=self._run, name="ecowander-db-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        result: Dict,
+        user_id: Optional[str] = None,
+        metadata: Optional[Dict] = None,
+        block: bool = False,
+        batch_key: Optional[str] = None
+    ) -> None:
+        """
+        Queue a verification result for writing.
+
+        Args:
+            result: Combined verification result
+            user_id: Submitting user
+            metadata: Submission metadata
+            block: Wait for queue space instead of raising
+            batch_key: Unique key making a replayed batch record a no-op
+
+        Raises:
+            queue.Full: If not blocking and the writer is max_pending rows behind
+        """
+        self._queue.put(record_from_result(result, user_id, metadata, batch_key), block=block)
+
+    def submit_recheck(self, job, result: Dict, block: bool = True) -> None:
+        """
+        Queue the verdict of a deferred manipulation check for writing.
+
+        Matches the ManipulationRecheckQueue handler signature. Blocks by
+        default, since it runs on a recheck worker rather than a request.
+
+        Args:
+            job: RecheckJob that was checked
+            result: check_image_manipulation result
+            block: Wait for queue space instead of raising
+
+        Raises:
+            queue.Full: If not blocking and the writer is max_pending rows behind
+        """
+        if result.get("is_edited"):
+            logger.warning(
+                "Deferred manipulation check flagged image %s (user %s) as edited",
+                job.image_hash, job.user_id
+            )
+        self._queue.put(_RecheckRow(record_from_recheck(job, result)), block=block)
+
+    def flush(self) -> None:
+        """Block until every queued row has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write remaining rows and stop the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        conn = connect(self.db_path)
+        stopping = False
+
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self._write_batch(conn, batch)
+            except sqlite3.Error:
+                self.rows_failed += len(batch)
+                logger.exception("Failed to write %d verification rows", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+        conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: list) -> None:
+        """
+        Write one batch of rows and their aggregate updates in a single transaction.
+
+        Every row is stored, including photos submitted before; rows whose
+        image hash is already in the history are counted as duplicates.
+        Only a batch record replayed after a resume (same batch_key) is
+        skipped, and left out of the aggregates. Rows are inserted one
+        statement at a time so that repeats within the batch are caught
+        too. Queued manipulation re-check verdicts are written in the same
+        transaction.
+        """
+        rechecks = [item.row for item in batch if isinstance(item, _RecheckRow)]
+        rows = [item for item in batch if not isinstance(item, _RecheckRow)]
+
+        inserted = []
+        duplicates = 0
+        with conn:
+            conn.executemany(INSERT_RECHECK, rechecks)
+            for row in rows:
+                # row: (user_id, image_hash, challenge_type, ..., is_verified, timestamp, metadata, batch_key)
+                seen = row[1] is not None and conn.execute(FIND_IMAGE_HASH, (row[1],)).fetchone()
+                if not conn.execute(INSERT_VERIFICATION, row).rowcount:
+                    continue
+                inserted.append(row)
+                if seen:
+                    duplicates += 1
+
+            conn.executemany(UPSERT_USER_STATS, [
+                (row[0], row[6], row[7]) for row in inserted if row[0] is not None
+            ])
+            conn.executemany(UPSERT_CHALLENGE_DAILY_STATS, [
+                (row[2], row[6], row[7]) for row in inserted if row[2] is not None
+            ])
+
+        self.rows_written += len(inserted)
+        self.rows_replayed += len(rows) - len(inserted)
+        self.duplicates_written += duplicates
+        self.rechecks_written += len(rechecks)
+        self.batches_written += 1
@@ -1,11 +1,51 @@
-from .photo_verifier import PhotoVerifier
-from .location_verifier import LocationVerifier
-from .fraud_detector import FraudDetector
-from .models import EcoActionVerifier
+"""
+Verification entry points.
+
+Exports are resolved lazily (PEP 562) so that importing one lightweight
+piece, such as ``ecowander.verification.models`` for the EcoLocation
+schema, does not load TensorFlow through photo_verifier.
+"""
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .photo_verifier import PhotoVerifier
+    from .location_verifier import LocationVerifier
+    from .fraud_detector import FraudDetector
+    from .models import EcoActionVerifier
+    from .results import EcoActionResult, FraudResult, LocationResult, PhotoResult
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    'PhotoVerifier': 'photo_verifier',
+    'LocationVerifier': 'location_verifier',
+    'FraudDetector': 'fraud_detector',
+    'EcoActionVerifier': 'models',
+    'PhotoResult': 'results',
+    'LocationResult': 'results',
+    'FraudResult': 'results',
+    'EcoActionResult': 'results'
+}
 
 __all__ = [
     'PhotoVerifier',
     'LocationVerifier', 
     'FraudDetector',
-    'EcoActionVerifier'
-]
\ No newline at end of file
+    'EcoActionVerifier',
+    'PhotoResult',
+    'LocationResult',
+    'FraudResult',
+    'EcoActionResult'
+]
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    # Cache so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
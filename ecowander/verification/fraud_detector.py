@@ -1,62 +1,234 @@
-import hashlib
-from PIL import Image
+import asyncio
+import functools
+import threading
+from ecowander.config.settings import DEGRADATION_SETTINGS
 from ecowander.services.hashing_service import (
     generate_image_hash,
     check_image_manipulation
 )
-from typing import Dict, Optional
+from ecowander.services.deadline import Deadline, DeadlineExceeded
+from ecowander.services.degradation import ManipulationRecheckQueue, RecheckJob
+from ecowander.services.executors import VerificationExecutors, get_default_executors
+from ecowander.services.hash_index import HashIndex
+from ecowander.services.image_source import ImageSource, as_shared_source
+from ecowander.verification.results import FraudResult
+from typing import Callable, Dict, Optional
 
 class FraudDetector:
-    def __init__(self):
+    def __init__(
+        self,
+        recheck_queue: Optional[ManipulationRecheckQueue] = None,
+        hash_index: Optional[HashIndex] = None
+    ):
+        """
+        Args:
+            recheck_queue: Where manipulation checks deferred under heavy
+                load (tier 2 and up) are sent
+            hash_index: Hashes of previously verified photos, built offline
+                by ecowander.index_builder (defaults to the index at
+                HASH_INDEX_SETTINGS["path"], if there is one)
+        """
+        # Hashes seen since startup; the index holds everything before
         self.known_hashes = set()
+        self.hash_index = hash_index if hash_index is not None else HashIndex.open_default()
+        self._hash_lock = threading.Lock()
+        self.recheck_queue = recheck_queue or ManipulationRecheckQueue()
         
     def detect_fraud(
         self,
-        image_path: str,
+        image_path: ImageSource,
         user_id: Optional[str] = None,
-        metadata: Optional[Dict] = None
-    ) -> Dict:
+        metadata: Optional[Dict] = None,
+        deadline: Optional[Deadline] = None,
+        tier: int = 0
+    ) -> FraudResult:
         """
         Detect potential fraud in submitted images.
         
         Args:
-            image_path: Path to the image file
+            image_path: Path, encoded image buffer or binary file-like object
             user_id: Optional user identifier
             metadata: Additional submission metadata
+            deadline: Request deadline checked before hashing and the
+                manipulation filter
+            tier: Quality tier; 1 filters a thumbnail, 2 and up defer the
+                manipulation filter to the re-check queue
             
         Returns:
-            Dictionary with fraud detection results
+            FraudResult with the fraud score and image hash, marked
+            timed_out if the deadline cut a check short
         """
+        deadline = deadline or Deadline()
         try:
-            # Generate image hash
-            img_hash = generate_image_hash(image_path)
+            if tier >= 2:
+                # Deferred checks read the image after this request returns
+                image_path = as_shared_source(image_path)
             
-            # Check for duplicates
-            is_duplicate = img_hash in self.known_hashes
-            if not is_duplicate:
-                self.known_hashes.add(img_hash)
+            # Generate image hash
+            img_hash = self._run_stage(deadline, "hash", generate_image_hash, image_path)
             
             # Check for manipulation
-            manipulation_result = check_image_manipulation(image_path)
+            if tier >= 2 and self._defer_manipulation(image_path, img_hash, user_id):
+                return self._build_result(img_hash, None, user_id, metadata, deferred=True)
+            manipulation_result = self._run_stage(
+                deadline, "manipulation", self._manipulation_check(tier), image_path
+            )
             
-            # Calculate fraud score (0 = clean, 1 = high fraud risk)
-            fraud_score = 0.0
-            if is_duplicate:
-                fraud_score = 0.9
-            elif manipulation_result["is_edited"]:
-                fraud_score = max(0.5, fraud_score + 0.4)
-            
-            return {
-                "fraud_score": fraud_score,
-                "image_hash": img_hash,
-                "is_duplicate": is_duplicate,
-                "manipulation_detected": manipulation_result,
-                "user_id": user_id,
-                "metadata": metadata
-            }
+            return self._build_result(img_hash, manipulation_result, user_id, metadata)
             
         except Exception as e:
-            return {
-                "fraud_score": 0.5,  # Default to medium risk if error
-                "error": str(e)
-            }
\ No newline at end of file
+            # Default to medium risk if error
+            return FraudResult(fraud_score=0.5, error=str(e))
+
+    async def detect_fraud_async(
+        self,
+        image_path: ImageSource,
+        user_id: Optional[str] = None,
+        metadata: Optional[Dict] = None,
+        executors: Optional[VerificationExecutors] = None,
+        deadline: Optional[Deadline] = None,
+        tier: int = 0
+    ) -> FraudResult:
+        """
+        Async counterpart of detect_fraud.
+        
+        Hashing and manipulation analysis run concurrently on the decode
+        pool, under the "detect_fraud" concurrency limit.
+        
+        Args:
+            image_path: Path, encoded image buffer or binary file-like object
+            user_id: Optional user identifier
+            metadata: Additional submission metadata
+            executors: Executor pools to use (defaults to the shared pools)
+            deadline: Request deadline
+            tier: Quality tier (see detect_fraud)
+            
+        Returns:
+            FraudResult with the fraud score and image hash, marked
+            timed_out if the deadline cut a check short
+        """
+        executors = executors or get_default_executors()
+        deadline = deadline or Deadline()
+        
+        async with executors.limit("detect_fraud"):
+            try:
+                # Hashing and manipulation analysis read the image concurrently
+                image_path = as_shared_source(image_path)
+                if tier >= 2:
+                    img_hash = await executors.run_decode(
+                        self._run_stage, deadline, "hash", generate_image_hash, image_path
+                    )
+                    if self._defer_manipulation(image_path, img_hash, user_id):
+                        return self._build_result(img_hash, None, user_id, metadata, deferred=True)
+                    manipulation_result = await executors.run_decode(
+                        self._run_stage, deadline, "manipulation",
+                        self._manipulation_check(tier), image_path
+                    )
+                else:
+                    img_hash, manipulation_result = await asyncio.gather(
+                        executors.run_decode(
+                            self._run_stage, deadline, "hash", generate_image_hash, image_path
+                        ),
+                        executors.run_decode(
+                            self._run_stage, deadline, "manipulation",
+                            self._manipulation_check(tier), image_path
+                        )
+                    )
+                
+                return self._build_result(img_hash, manipulation_result, user_id, metadata)
+                
+            except Exception as e:
+                # Default to medium risk if error
+                return FraudResult(fraud_score=0.5, error=str(e))
+
+    @staticmethod
+    def _run_stage(deadline: Deadline, stage: str, check: Callable, image_path: ImageSource):
+        """Run one check under the deadline; None if no budget was left for it."""
+        try:
+            with deadline.stage(stage):
+                return check(image_path)
+        except DeadlineExceeded:
+            return None
+
+    @staticmethod
+    def _manipulation_check(tier: int) -> Callable:
+        """Manipulation filter for a tier: full resolution at tier 0, else a thumbnail."""
+        if tier == 0:
+            return check_image_manipulation
+        return functools.partial(
+            check_image_manipulation, max_size=DEGRADATION_SETTINGS["thumbnail_size"]
+        )
+
+    def _defer_manipulation(
+        self,
+        image_path: ImageSource,
+        img_hash: Optional[str],
+        user_id: Optional[str]
+    ) -> bool:
+        """
+        Queue the full-resolution manipulation filter to run after the request.
+        
+        Returns:
+            False if the re-check queue is full and the caller should run
+            the (thumbnail) check itself
+        """
+        return self.recheck_queue.submit(RecheckJob(image_path, img_hash, user_id))
+
+    def _register_hash(self, img_hash: str) -> bool:
+        """Record hash as seen and return whether it was already known."""
+        # The index is read-only, so it is searched outside the lock
+        if self.hash_index is not None and img_hash in self.hash_index:
+            return True
+        with self._hash_lock:
+            is_duplicate = img_hash in self.known_hashes
+            if not is_duplicate:
+                self.known_hashes.add(img_hash)
+            return is_duplicate
+
+    def _build_result(
+        self,
+        img_hash: Optional[str],
+        manipulation_result: Optional[Dict],
+        user_id: Optional[str],
+        metadata: Optional[Dict],
+        deferred: bool = False
+    ) -> FraudResult:
+        """
+        Score a submission from its hash and manipulation analysis.
+        
+        Either may be None if the deadline skipped it; the result is then
+        marked timed_out and an unknown outcome counts as medium risk. A
+        deferred manipulation check is not counted against the submission.
+        """
+        if img_hash is None:
+            return FraudResult(
+                fraud_score=0.5,
+                manipulation_detected=manipulation_result,
+                user_id=user_id,
+                metadata=metadata,
+                timed_out="hash",
+                manipulation_deferred=deferred or None
+            )
+        
+        # Check for duplicates
+        is_duplicate = self._register_hash(img_hash)
+        
+        # Calculate fraud score (0 = clean, 1 = high fraud risk)
+        fraud_score = 0.0
+        if is_duplicate:
+            fraud_score = 0.9
+        elif manipulation_result is None and not deferred:
+            fraud_score = 0.5
+        elif manipulation_result is not None and manipulation_result["is_edited"]:
+            fraud_score = max(0.5, fraud_score + 0.4)
+        
+        return FraudResult(
+            fraud_score=fraud_score,
+            image_hash=img_hash,
+            is_duplicate=is_duplicate,
+            manipulation_detected=manipulation_result,
+            user_id=user_id,
+            metadata=metadata,
+            timed_out="manipulation" if manipulation_result is None and not deferred else None,
+            manipulation_deferred=deferred or None
+        )
@@ -1,10 +1,13 @@
-from geopy.distance import geodesic
 from ecowander.services.geo_utils import (
     get_image_location,
     get_nearest_eco_location
 )
 from ecowander.config.eco_locations import KNOWN_ECO_LOCATIONS
-from typing import Tuple, Dict, Optional
+from ecowander.services.deadline import Deadline, DeadlineExceeded
+from ecowander.services.executors import VerificationExecutors, get_default_executors
+from ecowander.services.image_source import ImageSource
+from ecowander.verification.results import LocationResult
+from typing import Tuple, Optional
 
 class LocationVerifier:
     def __init__(self, max_distance_meters: float = 100):
@@ -12,34 +15,38 @@ class LocationVerifier:
         
     def verify_location(
         self,
-        image_path: str,
+        image_path: ImageSource,
         user_location: Tuple[float, float],
-        timestamp: Optional[float] = None
-    ) -> Dict:
+        timestamp: Optional[float] = None,
+        deadline: Optional[Deadline] = None
+    ) -> LocationResult:
         """
         Verify location matches known eco-spots.
         
         Args:
-            image_path: Path to image with potential EXIF data
+            image_path: Path, encoded image buffer or binary file-like object with potential EXIF data
             user_location: Tuple of (lat, lng) from user
             timestamp: Optional timestamp for validation
+            deadline: Request deadline checked before reading EXIF
             
         Returns:
-            Dictionary with verification results
+            LocationResult with the score and nearest eco-spot, or a zero
+            score marked timed_out if the deadline ran out
         """
         try:
-            # Try to get location from image first
-            img_location = get_image_location(image_path)
-            actual_location = img_location or user_location
-            
-            if not actual_location:
-                raise ValueError("No location data provided")
-            
-            # Find nearest known location
-            nearest, distance = get_nearest_eco_location(
-                actual_location,
-                KNOWN_ECO_LOCATIONS
-            )
+            with (deadline or Deadline()).stage("location"):
+                # Try to get location from image first
+                img_location = get_image_location(image_path)
+                actual_location = img_location or user_location
+                
+                if not actual_location:
+                    raise ValueError("No location data provided")
+                
+                # Find nearest known location
+                nearest, distance = get_nearest_eco_location(
+                    actual_location,
+                    KNOWN_ECO_LOCATIONS
+                )
             
             # Calculate verification score
             if distance <= self.max_distance:
@@ -48,20 +55,45 @@ class LocationVerifier:
                 # Linear decay beyond max distance
                 score = max(0, 1 - (distance / (self.max_distance * 10)))
             
-            return {
-                "score": score,
-                "distance_meters": distance,
-                "nearest_eco_location": nearest,
-                "user_coordinates": actual_location,
-                "location_source": "image" if img_location else "user",
-                "timestamp_valid": self._validate_timestamp(timestamp)
-            }
+            return LocationResult(
+                score=score,
+                distance_meters=distance,
+                nearest_eco_location=nearest if isinstance(nearest, dict) else dict(nearest),
+                user_coordinates=actual_location,
+                location_source="image" if img_location else "user",
+                timestamp_valid=self._validate_timestamp(timestamp)
+            )
             
+        except DeadlineExceeded as e:
+            return LocationResult(score=0.0, timed_out=e.stage)
         except Exception as e:
-            return {
-                "score": 0.0,
-                "error": str(e)
-            }
+            return LocationResult(score=0.0, error=str(e))
+    
+    async def verify_location_async(
+        self,
+        image_path: ImageSource,
+        user_location: Tuple[float, float],
+        timestamp: Optional[float] = None,
+        executors: Optional[VerificationExecutors] = None,
+        deadline: Optional[Deadline] = None
+    ) -> LocationResult:
+        """
+        Async counterpart of verify_location; EXIF reading runs on the decode pool.
+        
+        Args:
+            image_path: Path, encoded image buffer or binary file-like object with potential EXIF data
+            user_location: Tuple of (lat, lng) from user
+            timestamp: Optional timestamp for validation
+            executors: Executor pools to use (defaults to the shared pools)
+            deadline: Request deadline
+            
+        Returns:
+            LocationResult with the score and nearest eco-spot
+        """
+        executors = executors or get_default_executors()
+        return await executors.run_decode(
+            self.verify_location, image_path, user_location, timestamp, deadline
+        )
     
     def _validate_timestamp(self, timestamp: Optional[float]) -> bool:
         """Validate if timestamp is recent (within 24 hours)."""
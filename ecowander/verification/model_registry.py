@@ -0,0 +1,433 @@
+"""
+Versioned photo models with zero-downtime swapping.
+
+Versions live side by side under MODEL_SETTINGS["model_dir"]::
+
+    models/
+        2024-03-01/eco_action_model.tflite
+        2024-03-01/label_map.txt
+        2024-04-12/eco_action_model.tflite
+        2024-04-12/label_map.txt
+
+A ModelRegistry serves one version at a time. A new version is loaded and
+warmed in the background while the current one keeps serving, then made
+active with a single reference swap. Requests lease the model they start
+on and finish on it, so a retired interpreter is only released once its
+in-flight requests have drained.
+"""
+import copy
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from ecowander.config.settings import MODEL_SETTINGS
+
+if TYPE_CHECKING:
+    from tensorflow import lite as tflite
+
+logger = logging.getLogger(__name__)
+
+def _tflite():
+    """Import TensorFlow Lite on first use; importing TensorFlow takes seconds."""
+    from tensorflow import lite
+    return lite
+
+class LoadedModel:
+    """A loaded and validated model version with its own interpreter and lock."""
+
+    def __init__(self, version: str, path: Path, interpreter: "tflite.Interpreter", labels: Tuple[str, ...]):
+        """
+        Args:
+            version: Version name results are tagged with
+            path: Model file the interpreter was loaded from
+            interpreter: Allocated TFLite interpreter
+            labels: Class labels, shared by every result of this version
+        """
+        self.version = version
+        self.path = path
+        self.interpreter = interpreter
+        self.labels = labels
+        self.input_details = interpreter.get_input_details()
+        self.output_details = interpreter.get_output_details()
+        # TFLite interpreters are not thread-safe; views from share() use this lock too
+        self._lock_owner = self
+        self._lock = threading.Lock()
+        # Reused for every inference; only written under lock
+        self.input_buffer = np.empty(self.input_details[0]['shape'], dtype=np.float32)
+        self.warmup_report: Optional[Dict] = None
+
+        # Lease bookkeeping, guarded by the owning registry's lock
+        self.in_flight = 0
+        self.retired = False
+        self.drained = threading.Event()
+
+    @property
+    def lock(self) -> threading.Lock:
+        return self._lock_owner._lock
+
+    @lock.setter
+    def lock(self, lock: threading.Lock) -> None:
+        self._lock_owner._lock = lock
+
+    def share(self) -> "LoadedModel":
+        """
+        A view of this model with its own lease bookkeeping.
+
+        The view shares the interpreter, its lock and the input buffer, so
+        each registry serving a preloaded model can retire and release its
+        view without pulling the interpreter from under the others.
+        """
+        view = copy.copy(self)
+        view.in_flight = 0
+        view.retired = False
+        view.drained = threading.Event()
+        return view
+
+    def wait_drained(self, timeout: Optional[float] = None) -> bool:
+        """Wait until a retired model has no requests left; returns False on timeout."""
+        return self.drained.wait(timeout)
+
+def _model_version(path: Path) -> str:
+    """Version name of a model file: its directory under model_dir, or a content digest."""
+    model_dir = Path(MODEL_SETTINGS["model_dir"]).resolve()
+    if path.resolve().parent.parent == model_dir:
+        return path.parent.name
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return f"sha256-{digest.hexdigest()[:12]}"
+
+def _load_interpreter(model_path: Path) -> "tflite.Interpreter":
+    """Load and validate a TFLite model."""
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model file missing at {model_path}")
+
+    logger.info("Loading model from: %s", model_path)
+    interpreter = _tflite().Interpreter(model_path=str(model_path))
+
+    # Validate model structure
+    interpreter.allocate_tensors()
+    input_details = interpreter.get_input_details()
+
+    if not input_details:
+        raise ValueError("Model has no input tensors")
+
+    expected_shape = (1, MODEL_SETTINGS["input_height"],
+                      MODEL_SETTINGS["input_width"], 3)
+    if tuple(input_details[0]['shape']) != expected_shape:
+        raise ValueError(f"Model expects input shape {expected_shape}")
+    if input_details[0]['dtype'] != np.float32:
+        raise ValueError(f"Model expects float32 input, got {input_details[0]['dtype']}")
+    if not interpreter.get_output_details():
+        raise ValueError("Model has no output tensors")
+
+    return interpreter
+
+def _load_label_map(model_path: Path) -> Tuple[str, ...]:
+    """Load and validate the label map next to a model file."""
+    label_path = model_path.with_name("label_map.txt")
+
+    if not label_path.exists():
+        raise FileNotFoundError(f"Label file missing at {label_path}")
+
+    with open(label_path, 'r') as f:
+        labels = tuple(line.strip().split(": ")[1] for line in f if ":" in line)
+
+    if len(labels) != 5:
+        raise ValueError(f"Expected 5 labels, got {len(labels)}")
+
+    return labels
+
+def load_model(model_path: Path, version: Optional[str] = None) -> LoadedModel:
+    """
+    Load a model file and its label map.
+
+    Args:
+        model_path: .tflite file; label_map.txt must sit beside it
+        version: Version name (defaults to the directory name under
+            model_dir, or a digest of the file)
+
+    Returns:
+        LoadedModel, not yet warmed up
+
+    Raises:
+        FileNotFoundError: If the model or label file is missing
+        ValueError: If the model or labels fail validation
+    """
+    model_path = Path(model_path)
+    interpreter = _load_interpreter(model_path)
+    labels = _load_label_map(model_path)
+
+    num_classes = interpreter.get_output_details()[0]['shape'][-1]
+    if num_classes != len(labels):
+        raise ValueError(f"Model outputs {num_classes} classes for {len(labels)} labels")
+
+    return LoadedModel(version or _model_version(model_path), model_path, interpreter, labels)
+
+def warmup_model(
+    model: LoadedModel,
+    iterations: Optional[int] = None,
+    batch_sizes: Optional[List[int]] = None
+) -> Dict:
+    """
+    Run synthetic inferences so the first real request is not a cold one.
+
+    Each batch size is warmed on its exact input shape, which allocates
+    tensors, initializes delegates and faults in the weight pages. The
+    model is left allocated for batch size 1, the shape verify_photo serves.
+
+    Args:
+        model: Model to warm up
+        iterations: Inferences per batch size (defaults to MODEL_SETTINGS)
+        batch_sizes: Batch sizes to warm (defaults to MODEL_SETTINGS)
+
+    Returns:
+        Dictionary with cold-start and warm latency per batch size
+    """
+    iterations = max(1, iterations or MODEL_SETTINGS["warmup_iterations"])
+    batch_sizes = batch_sizes or MODEL_SETTINGS["serving_batch_sizes"]
+    # Finish on the serving shape so it stays allocated
+    batch_sizes = [b for b in batch_sizes if b != 1] + [1]
+
+    interpreter = model.interpreter
+    input_detail = model.input_details[0]
+    rng = np.random.default_rng(0)
+    shapes = []
+
+    with model.lock:
+        for batch_size in batch_sizes:
+            shape = [batch_size, *input_detail['shape'][1:]]
+            if tuple(interpreter.get_input_details()[0]['shape']) != tuple(shape):
+                interpreter.resize_tensor_input(input_detail['index'], shape)
+                interpreter.allocate_tensors()
+
+            synthetic = rng.random(shape, dtype=np.float32)
+            timings = []
+            for _ in range(iterations + 1):
+                start = time.perf_counter()
+                interpreter.set_tensor(input_detail['index'], synthetic)
+                interpreter.invoke()
+                interpreter.get_tensor(model.output_details[0]['index'])
+                timings.append((time.perf_counter() - start) * 1000)
+
+            shapes.append({
+                "batch_size": batch_size,
+                "cold_ms": timings[0],
+                "warm_p50_ms": float(np.median(timings[1:])),
+                "warm_max_ms": max(timings[1:])
+            })
+
+    model.warmup_report = {"iterations": iterations, "shapes": shapes}
+    logger.info(
+        "Model %s warmed up: cold %.1f ms, warm %.1f ms",
+        model.version, shapes[-1]["cold_ms"], shapes[-1]["warm_p50_ms"]
+    )
+    return model.warmup_report
+
+# Models loaded by preload_model(), keyed by model path
+_PRELOADED_MODELS: Dict[str, LoadedModel] = {}
+
+def preload_model(warmup_iterations: Optional[int] = None, version: Optional[str] = None) -> None:
+    """
+    Load and warm the model in a parent process before forking workers.
+
+    TFLite maps the model file read-only, so the weights already sit in the
+    page cache shared by every process. Loading here also builds the tensor
+    arena and any delegate-packed weights once: forked workers inherit them
+    copy-on-write, and registries created in the workers serve views of
+    the preloaded model (LoadedModel.share) instead of loading their own.
+    A preloaded model stays loaded for the life of the process.
+
+    Args:
+        warmup_iterations: Warm inferences per batch size (see warmup_model)
+        version: Version to preload (defaults to MODEL_SETTINGS["model_version"])
+    """
+    model_path = model_path_for(version)
+    if str(model_path) in _PRELOADED_MODELS:
+        return
+
+    model = load_model(model_path)
+    warmup_model(model, warmup_iterations)
+    _PRELOADED_MODELS[str(model_path)] = model
+
+def _reset_preloaded_locks() -> None:
+    """Give forked children fresh locks; a parent thread may have held one at fork time."""
+    for model in _PRELOADED_MODELS.values():
+        model.lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_preloaded_locks)
+
+def model_path_for(version: Optional[str] = None) -> Path:
+    """
+    Model file of a version.
+
+    Args:
+        version: Directory name under MODEL_SETTINGS["model_dir"]; None
+            means MODEL_SETTINGS["model_version"], or model_path if that
+            is unset too
+
+    Returns:
+        Path of the .tflite file
+    """
+    version = version or MODEL_SETTINGS["model_version"]
+    if version is None:
+        return Path(MODEL_SETTINGS["model_path"])
+    return Path(MODEL_SETTINGS["model_dir"]) / version / Path(MODEL_SETTINGS["model_path"]).name
+
+class ModelRegistry:
+    """Serves one model version at a time and swaps versions without downtime."""
+
+    def __init__(self, version: Optional[str] = None):
+        """
+        Load the initial version, reusing a preloaded model if there is one.
+
+        Args:
+            version: Version to serve (see model_path_for)
+
+        Raises:
+            FileNotFoundError: If the model or label file is missing
+            ValueError: If the model or labels fail validation
+        """
+        self._lock = threading.Lock()
+        self._loader: Optional[ThreadPoolExecutor] = None
+        self.loading: Optional[Tuple[str, Future]] = None
+
+        model_path = model_path_for(version)
+        preloaded = _PRELOADED_MODELS.get(str(model_path))
+        self._active = preloaded.share() if preloaded is not None else load_model(model_path)
+
+    @property
+    def active(self) -> LoadedModel:
+        """The model new requests are served by."""
+        return self._active
+
+    @property
+    def version(self) -> str:
+        return self._active.version
+
+    def available_versions(self) -> List[str]:
+        """Versions found under MODEL_SETTINGS["model_dir"]."""
+        model_dir = Path(MODEL_SETTINGS["model_dir"])
+        if not model_dir.is_dir():
+            return []
+        model_name = Path(MODEL_SETTINGS["model_path"]).name
+        return sorted(
+            entry.name for entry in model_dir.iterdir()
+            if (entry / model_name).is_file()
+        )
+
+    @contextmanager
+    def lease(self) -> Iterator[LoadedModel]:
+        """
+        Use the active model for one request.
+
+        The request keeps the model it started on even if another version
+        is activated meanwhile; a retired model is released when its last
+        lease ends.
+        """
+        with self._lock:
+            model = self._active
+            model.in_flight += 1
+        try:
+            yield model
+        finally:
+            with self._lock:
+                model.in_flight -= 1
+                drained = model.retired and model.in_flight == 0
+            if drained:
+                self._release(model)
+
+    def activate(self, model: LoadedModel) -> LoadedModel:
+        """
+        Make a loaded model the active one.
+
+        Args:
+            model: Loaded (and normally warmed) model
+
+        Returns:
+            The retired model; see LoadedModel.wait_drained
+        """
+        with self._lock:
+            previous, self._active = self._active, model
+            previous.retired = True
+            drained = previous.in_flight == 0
+        if drained:
+            self._release(previous)
+
+        logger.info("Model %s active (was %s)", model.version, previous.version)
+        return previous
+
+    def swap(self, version: str, warmup_iterations: Optional[int] = None) -> LoadedModel:
+        """
+        Load, warm and activate a version, blocking until it is active.
+
+        Args:
+            version: Version under MODEL_SETTINGS["model_dir"]
+            warmup_iterations: Warm inferences per batch size
+
+        Returns:
+            The newly active model
+
+        Raises:
+            KeyError: If the version does not exist
+            FileNotFoundError: If its label file is missing
+            ValueError: If the model or labels fail validation
+        """
+        if version not in self.available_versions():
+            raise KeyError(f"Unknown model version '{version}'")
+
+        model = load_model(model_path_for(version), version)
+        warmup_model(model, warmup_iterations)
+        self.activate(model)
+        return model
+
+    def swap_in_background(self, version: str, warmup_iterations: Optional[int] = None) -> Future:
+        """
+        Start swapping to a version on a loader thread.
+
+        The current version keeps serving until the new one is warm.
+
+        Args:
+            version: Version under MODEL_SETTINGS["model_dir"]
+            warmup_iterations: Warm inferences per batch size
+
+        Returns:
+            Future resolving to the newly active model
+
+        Raises:
+            KeyError: If the version does not exist
+            RuntimeError: If another swap is still loading
+        """
+        if version not in self.available_versions():
+            raise KeyError(f"Unknown model version '{version}'")
+
+        with self._lock:
+            if self.loading is not None and not self.loading[1].done():
+                raise RuntimeError(f"Model version '{self.loading[0]}' is still loading")
+            if self._loader is None:
+                self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ecowander-model-loader")
+            future = self._loader.submit(self.swap, version, warmup_iterations)
+            self.loading = (version, future)
+
+        future.add_done_callback(self._log_swap_failure)
+        return future
+
+    def _log_swap_failure(self, future: Future) -> None:
+        if future.exception() is not None:
+            logger.error("Model swap failed: %s", future.exception())
+
+    def _release(self, model: LoadedModel) -> None:
+        """Drop a drained model so its interpreter can be freed (unless preloaded)."""
+        model.interpreter = None
+        model.input_buffer = None
+        model.drained.set()
+        logger.info("Model %s drained", model.version)
@@ -1,5 +1,21 @@
+import time
 from pydantic import BaseModel
-from typing import Optional, Dict, Tuple, List
+from typing import TYPE_CHECKING, Optional, Dict, Tuple, List
+from ecowander.config.settings import VERIFICATION_THRESHOLDS
+from ecowander.services.image_source import ImageSource, as_shared_source
+from ecowander.verification.results import (
+    EcoActionResult,
+    FraudResult,
+    LocationResult,
+    PhotoResult
+)
+
+if TYPE_CHECKING:
+    from ecowander.services.deadline import Deadline
+    from ecowander.services.executors import VerificationExecutors
+
+# The schemas below are also imported on their own (e.g. by the location
+# catalog), so EcoActionVerifier imports its dependencies where it uses them.
 
 class VerificationRequest(BaseModel):
     image_path: str
@@ -10,6 +26,7 @@ class VerificationRequest(BaseModel):
     metadata: Optional[Dict] = None
 
 class VerificationResult(BaseModel):
+    """Wire format of EcoActionResult.to_dict(), validated once per API response."""
     is_verified: bool
     overall_score: float
     photo_verification: Dict
@@ -17,6 +34,9 @@ class VerificationResult(BaseModel):
     fraud_detection: Dict
     timestamp: str
     challenge_type: str
+    model_version: Optional[str] = None
+    timed_out: List[str] = []
+    tier: int = 0
     
     class Config:
         json_encoders = {
@@ -31,16 +51,198 @@ class EcoLocation(BaseModel):
     description: Optional[str] = None
 
 class EcoActionVerifier:
-    def __init__(self):
+    def __init__(
+        self,
+        dummy_mode: bool = False,
+        executors: Optional["VerificationExecutors"] = None,
+        dummy_latency: Optional[float] = None
+    ):
+        """
+        Initialize the combined verifier.
+        
+        Args:
+            dummy_mode: If True, photo verification uses mock results
+            executors: VerificationExecutors for the async API (defaults to the shared pools)
+            dummy_latency: Simulated inference seconds in dummy mode (see PhotoVerifier)
+        """
         from .photo_verifier import PhotoVerifier
         from .location_verifier import LocationVerifier
         from .fraud_detector import FraudDetector
+        from ecowander.services.degradation import VerdictCache
         
-        self.photo_verifier = PhotoVerifier()
-        self.location_verifier = LocationVerifier()
+        self.thresholds = VERIFICATION_THRESHOLDS
+        self.executors = executors
+        self.photo_verifier = PhotoVerifier(dummy_mode=dummy_mode, dummy_latency=dummy_latency)
+        self.location_verifier = LocationVerifier(
+            max_distance_meters=self.thresholds["location_max_distance"]
+        )
         self.fraud_detector = FraudDetector()
+        # Model output by perceptual hash, reused at tier 3
+        self.verdict_cache = VerdictCache()
 
-    def verify_eco_action(self, image_path, user_location, challenge_type):
-        """Main verification method that combines all checks"""
-        # Implementation would go here
-        pass
\ No newline at end of file
+    @property
+    def is_ready(self) -> bool:
+        """Whether the photo model has been warmed up."""
+        return self.photo_verifier.is_ready
+
+    def warmup(self, iterations: Optional[int] = None) -> Dict:
+        """Warm up the photo model; see PhotoVerifier.warmup."""
+        return self.photo_verifier.warmup(iterations)
+
+    def verify_eco_action(
+        self,
+        image_path: ImageSource,
+        user_location: Tuple[float, float],
+        challenge_type: str,
+        user_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        metadata: Optional[Dict] = None,
+        deadline: Optional["Deadline"] = None,
+        tier: int = 0
+    ) -> EcoActionResult:
+        """
+        Main verification method that combines all checks.
+        
+        Args:
+            deadline: Budget shared by every check; checks it cuts short
+                are listed in the result's timed_out and the action is
+                not verified
+            tier: Quality tier chosen by DegradationController; 1 runs
+                the image analyses on thumbnails, 2 defers the manipulation
+                filter and 3 also reuses cached verdicts for known photos
+        
+        Returns:
+            EcoActionResult; call to_dict() for the JSON form
+            
+        Raises:
+            ImageRejected: If the image header fails validation; the checks
+                never decode an image with too many pixels or an unsupported
+                format (the upload byte limit is left to the API)
+        """
+        from ecowander.services.deadline import Deadline
+        from ecowander.services.image_validation import check_image
+        
+        deadline = deadline or Deadline()
+        # Every check reads the image; a one-shot stream is read into memory once
+        image_path = as_shared_source(image_path)
+        # The upload byte limit is enforced at upload admission (the API)
+        check_image(image_path, max_bytes=None)
+        
+        fraud_result = None
+        if tier >= 3:
+            # The hash is needed first, to look up a cached verdict
+            fraud_result = self.fraud_detector.detect_fraud(image_path, user_id, metadata, deadline, tier)
+        
+        photo_result = self.photo_verifier.verify_photo(
+            image_path, challenge_type, deadline, tier, self._cached_verdict(fraud_result, tier)
+        )
+        location_result = self.location_verifier.verify_location(
+            image_path, user_location, timestamp, deadline
+        )
+        if fraud_result is None:
+            fraud_result = self.fraud_detector.detect_fraud(image_path, user_id, metadata, deadline, tier)
+        
+        return self._combine_results(
+            photo_result, location_result, fraud_result, challenge_type, tier
+        )
+
+    async def verify_eco_action_async(
+        self,
+        image_path: ImageSource,
+        user_location: Tuple[float, float],
+        challenge_type: str,
+        user_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        metadata: Optional[Dict] = None,
+        deadline: Optional["Deadline"] = None,
+        tier: int = 0
+    ) -> EcoActionResult:
+        """
+        Async counterpart of verify_eco_action; the three checks run
+        concurrently, except at tier 3 where the photo check waits for the
+        image hash.
+        """
+        import asyncio
+        from ecowander.services.deadline import Deadline
+        from ecowander.services.executors import get_default_executors
+        from ecowander.services.image_validation import check_image
+        
+        executors = self.executors or get_default_executors()
+        deadline = deadline or Deadline()
+        
+        # The three checks read the image concurrently
+        image_path = as_shared_source(image_path)
+        
+        async with executors.limit("verify_eco_action"):
+            await executors.run_decode(check_image, image_path, max_bytes=None)
+            
+            location_task = self.location_verifier.verify_location_async(
+                image_path, user_location, timestamp, executors=executors, deadline=deadline
+            )
+            fraud_task = self.fraud_detector.detect_fraud_async(
+                image_path, user_id, metadata, executors=executors, deadline=deadline, tier=tier
+            )
+            
+            if tier >= 3:
+                fraud_result, location_result = await asyncio.gather(fraud_task, location_task)
+                photo_result = await self.photo_verifier.verify_photo_async(
+                    image_path, challenge_type, executors=executors, deadline=deadline,
+                    tier=tier, cached=self._cached_verdict(fraud_result, tier)
+                )
+            else:
+                photo_result, location_result, fraud_result = await asyncio.gather(
+                    self.photo_verifier.verify_photo_async(
+                        image_path, challenge_type, executors=executors, deadline=deadline, tier=tier
+                    ),
+                    location_task,
+                    fraud_task
+                )
+        
+        return self._combine_results(
+            photo_result, location_result, fraud_result, challenge_type, tier
+        )
+
+    def _cached_verdict(self, fraud_result: Optional[FraudResult], tier: int):
+        """Cached model output for the photo at tier 3, if its hash has been seen."""
+        if tier < 3 or fraud_result is None or fraud_result.image_hash is None:
+            return None
+        return self.verdict_cache.get(fraud_result.image_hash, self.photo_verifier.model_version)
+
+    def _combine_results(
+        self,
+        photo_result: PhotoResult,
+        location_result: LocationResult,
+        fraud_result: FraudResult,
+        challenge_type: str,
+        tier: int = 0
+    ) -> EcoActionResult:
+        """Combine per-check results into the overall verdict."""
+        # Every fresh classification is cached, so tier 3 has verdicts to reuse
+        if fraud_result.image_hash is not None and not photo_result.cached:
+            self.verdict_cache.put(fraud_result.image_hash, photo_result)
+        
+        confidence = photo_result.confidence
+        location_score = float(location_result.score)
+        fraud_score = float(fraud_result.fraud_score)
+        
+        photo_ok = (
+            bool(photo_result.is_valid) and
+            confidence >= self.thresholds["photo_min_confidence"]
+        )
+        location_ok = location_score >= 1.0  # Within location_max_distance
+        fraud_ok = fraud_score <= self.thresholds["fraud_max_score"]
+        # A check the deadline cut short has not passed
+        complete = not (
+            photo_result.timed_out or location_result.timed_out or fraud_result.timed_out
+        )
+        
+        return EcoActionResult(
+            is_verified=photo_ok and location_ok and fraud_ok and complete,
+            overall_score=(confidence + location_score + (1 - fraud_score)) / 3,
+            photo_verification=photo_result,
+            location_verification=location_result,
+            fraud_detection=fraud_result,
+            challenge_type=challenge_type,
+            created_at=time.time(),
+            tier=tier
+        )
@@ -0,0 +1,192 @@
+"""
+Result records passed between verification stages.
+
+Each stage returns a slotted dataclass rather than a dict. Records support
+read-only mapping access (``result["confidence"]``, ``result.get(...)``) for
+code written against the old dict results, and are turned into plain,
+JSON-ready dicts by to_dict() only where a result leaves the process: the
+API response, batch output and database rows.
+
+A check cut short by its request deadline returns a partial record whose
+timed_out field names the stage that was skipped. The combined result also
+records the quality tier it was produced at (see services.degradation).
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, FrozenSet, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+class ResultRecord:
+    """Read-only mapping access and serialization for result dataclasses."""
+
+    __slots__ = ()
+
+    # Mapping keys, in to_dict() order
+    _keys: ClassVar[Tuple[str, ...]] = ()
+    # Keys left out entirely while their value is None
+    _omit_if_none: ClassVar[FrozenSet[str]] = frozenset()
+
+    def _has(self, key: str) -> bool:
+        return key in self._keys and (
+            key not in self._omit_if_none or getattr(self, key) is not None
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if not self._has(key):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._has(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if self._has(key) else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return tuple(key for key in self._keys if self._has(key))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the record, with nested records converted too."""
+        result = {}
+        for key in self.keys():
+            value = getattr(self, key)
+            result[key] = value.to_dict() if isinstance(value, ResultRecord) else value
+        return result
+
+def _isoformat(created_at: float) -> str:
+    return datetime.fromtimestamp(created_at).isoformat()
+
+@dataclass(slots=True, eq=False)
+class PhotoResult(ResultRecord):
+    """
+    Photo classification result.
+
+    Scores stay in the model's output array next to the verifier's shared
+    label tuple; the per-class dict is only built when asked for. Scores
+    are None if the deadline ran out before inference. cached is set when
+    the scores were reused from an earlier classification of the same photo.
+    """
+    labels: Tuple[str, ...]
+    scores: Optional["np.ndarray"]
+    created_at: float
+    is_valid: bool = False  # Updated by challenge rules
+    pink_pixel_ratio: Optional[float] = None
+    seasonal_valid: Optional[bool] = None
+    model_version: Optional[str] = None
+    timed_out: Optional[str] = None
+    cached: Optional[bool] = None
+
+    _keys: ClassVar[Tuple[str, ...]] = (
+        "predicted_class", "confidence", "class_scores", "timestamp", "is_valid",
+        "pink_pixel_ratio", "seasonal_valid", "model_version", "timed_out", "cached"
+    )
+    _omit_if_none: ClassVar[FrozenSet[str]] = frozenset(
+        {"pink_pixel_ratio", "seasonal_valid", "timed_out", "cached"}
+    )
+
+    @property
+    def predicted_class(self) -> Optional[str]:
+        if self.scores is None:
+            return None
+        return self.labels[int(self.scores.argmax())]
+
+    @property
+    def confidence(self) -> float:
+        return 0.0 if self.scores is None else float(self.scores.max())
+
+    @property
+    def class_scores(self) -> Dict[str, float]:
+        if self.scores is None:
+            return {}
+        return dict(zip(self.labels, self.scores.tolist()))
+
+    @property
+    def timestamp(self) -> str:
+        return _isoformat(self.created_at)
+
+@dataclass(slots=True, eq=False)
+class LocationResult(ResultRecord):
+    """Location check result; only score and error are set if the check failed."""
+    score: float
+    distance_meters: Optional[float] = None
+    nearest_eco_location: Optional[Dict] = None
+    user_coordinates: Optional[Tuple[float, float]] = None
+    location_source: Optional[str] = None
+    timestamp_valid: Optional[bool] = None
+    error: Optional[str] = None
+    timed_out: Optional[str] = None
+
+    _keys: ClassVar[Tuple[str, ...]] = (
+        "score", "distance_meters", "nearest_eco_location", "user_coordinates",
+        "location_source", "timestamp_valid", "error", "timed_out"
+    )
+    _omit_if_none: ClassVar[FrozenSet[str]] = frozenset(_keys[1:])
+
+@dataclass(slots=True, eq=False)
+class FraudResult(ResultRecord):
+    """
+    Fraud check result; only fraud_score and error are set if the check failed.
+
+    A check cut short by the deadline keeps whatever it computed (the hash
+    and duplicate flag if hashing ran) and is scored as medium risk. Under
+    heavy load the manipulation filter is deferred to a background re-check
+    (manipulation_deferred) and only the duplicate check is scored.
+    """
+    fraud_score: float
+    image_hash: Optional[str] = None
+    is_duplicate: Optional[bool] = None
+    manipulation_detected: Optional[Dict] = None
+    user_id: Optional[str] = None
+    metadata: Optional[Dict] = None
+    error: Optional[str] = None
+    timed_out: Optional[str] = None
+    manipulation_deferred: Optional[bool] = None
+
+    _keys: ClassVar[Tuple[str, ...]] = (
+        "fraud_score", "image_hash", "is_duplicate", "manipulation_detected",
+        "user_id", "metadata", "error", "timed_out", "manipulation_deferred"
+    )
+
+    def _has(self, key: str) -> bool:
+        if self.error is not None:
+            return key in ("fraud_score", "error")
+        if key in ("timed_out", "manipulation_deferred"):
+            return getattr(self, key) is not None
+        return key in self._keys and key != "error"
+
+@dataclass(slots=True, eq=False)
+class EcoActionResult(ResultRecord):
+    """Combined verdict of EcoActionVerifier."""
+    is_verified: bool
+    overall_score: float
+    photo_verification: PhotoResult
+    location_verification: LocationResult
+    fraud_detection: FraudResult
+    challenge_type: str
+    created_at: float
+    tier: int = 0  # Quality tier the checks ran at
+
+    _keys: ClassVar[Tuple[str, ...]] = (
+        "is_verified", "overall_score", "photo_verification", "location_verification",
+        "fraud_detection", "timestamp", "challenge_type", "model_version", "timed_out", "tier"
+    )
+
+    @property
+    def timed_out(self) -> List[str]:
+        """Stages skipped because the request deadline ran out."""
+        return [
+            result.timed_out
+            for result in (self.photo_verification, self.location_verification, self.fraud_detection)
+            if result.timed_out is not None
+        ]
+
+    @property
+    def model_version(self) -> Optional[str]:
+        """Version of the photo model that produced the verdict."""
+        return self.photo_verification.model_version
+
+    @property
+    def timestamp(self) -> str:
+        return _isoformat(self.created_at)
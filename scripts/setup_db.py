@@ -2,47 +2,18 @@
 """
 Initialize the EcoWander verification database.
 """
-import sqlite3
 from pathlib import Path
-from ecowander.config import settings
+from ecowander.config.settings import DATABASE_SETTINGS
+from ecowander.storage.database import connect, init_schema
 
-DB_PATH = Path(__file__).parent.parent / "data" / "ecowander.db"
+DB_PATH = Path(DATABASE_SETTINGS["path"])
 
 def init_database():
     """Initialize SQLite database with required tables."""
     try:
-        DB_PATH.parent.mkdir(exist_ok=True)
-        
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            
-            # Create verification records table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS verifications (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT,
-                    image_hash TEXT UNIQUE,
-                    challenge_type TEXT,
-                    confidence REAL,
-                    location_score REAL,
-                    fraud_score REAL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    metadata TEXT
-                )
-            """)
-            
-            # Create eco_locations table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS eco_locations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE,
-                    latitude REAL,
-                    longitude REAL,
-                    radius_meters INTEGER,
-                    challenge_types TEXT,
-                    description TEXT
-                )
-            """)
+        with connect(str(DB_PATH)) as conn:
+            # Create verification records and eco_locations tables
+            init_schema(conn)
             
             conn.commit()
             print(f"Database initialized at {DB_PATH}")
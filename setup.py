@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 setup(
     name="ecowander",
     version="0.1",
-    packages=find_packages(),
+    packages=find_packages(exclude=("tests", "tests.*", "benchmarks", "benchmarks.*")),
     install_requires=[
         # List your dependencies here (same as requirements.txt)
     ],
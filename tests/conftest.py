@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+import pytest
+from PIL import Image
+
+@pytest.fixture
+def sample_image_path(tmp_path):
+    """Small synthetic JPEG with a colour gradient."""
+    path = tmp_path / "sample.jpg"
+    img = Image.new("RGB", (320, 240))
+    img.putdata([(x % 256, y % 256, (x + y) % 256) for y in range(240) for x in range(320)])
+    img.save(path, "JPEG")
+    return str(path)
+
+class FakeInterpreter:
+    """Stand-in for tflite.Interpreter with the production model's tensor layout."""
+
+    def __init__(self, model_path=None, model_content=None, num_threads=None):
+        import numpy as np
+        self.model_path = model_path
+        self.invocations = 0
+        self._input_shape = np.array([1, 224, 224, 3], dtype=np.int32)
+        self._input = None
+        self._output = None
+
+    def allocate_tensors(self):
+        import numpy as np
+        self._input = np.zeros(self._input_shape, dtype=np.float32)
+
+    def get_input_details(self):
+        import numpy as np
+        return [{"index": 0, "shape": self._input_shape.copy(), "dtype": np.float32}]
+
+    def get_output_details(self):
+        import numpy as np
+        return [{"index": 1, "shape": np.array([self._input_shape[0], 5]), "dtype": np.float32}]
+
+    def resize_tensor_input(self, index, shape):
+        import numpy as np
+        self._input_shape = np.array(shape, dtype=np.int32)
+
+    def set_tensor(self, index, value):
+        import numpy as np
+        assert tuple(value.shape) == tuple(self._input_shape)
+        self._input = np.array(value, dtype=np.float32)
+
+    def invoke(self):
+        import numpy as np
+        self.invocations += 1
+        # Deterministic scores derived from the mean colour of each image
+        means = self._input.reshape(self._input.shape[0], -1, 3).mean(axis=1)
+        logits = np.concatenate([means, means[:, :2] * 0.5], axis=1) + 0.1
+        self._output = (logits / logits.sum(axis=1, keepdims=True)).astype(np.float32)
+
+    def get_tensor(self, index):
+        return self._output.copy()
+
+@pytest.fixture
+def fake_model(tmp_path, monkeypatch):
+    """Point MODEL_SETTINGS at a dummy model file served by FakeInterpreter."""
+    from ecowander.config.settings import MODEL_SETTINGS
+    from ecowander.verification import model_registry
+
+    model_dir = tmp_path / "models"
+    model_dir.mkdir()
+    model_path = model_dir / "eco_action_model.tflite"
+    model_path.write_bytes(b"TFL3")
+    (model_dir / "label_map.txt").write_text(
+        "0: invalid_action\n1: valid_recycling\n2: valid_composting\n"
+        "3: valid_conservation\n4: cherry_blossom_activity\n"
+    )
+
+    monkeypatch.setitem(MODEL_SETTINGS, "model_path", str(model_path))
+    monkeypatch.setitem(MODEL_SETTINGS, "model_dir", str(model_dir))
+    monkeypatch.setattr(model_registry, "_tflite", lambda: SimpleNamespace(Interpreter=FakeInterpreter))
+    monkeypatch.setattr(model_registry, "_PRELOADED_MODELS", {})
+    return model_path
+
+@pytest.fixture
+def model_versions(fake_model):
+    """Two versions, v1 and v2, under the fake model directory."""
+    for version in ("v1", "v2"):
+        version_dir = fake_model.parent / version
+        version_dir.mkdir()
+        (version_dir / fake_model.name).write_bytes(fake_model.read_bytes())
+        (version_dir / "label_map.txt").write_text(fake_model.with_name("label_map.txt").read_text())
+    return ["v1", "v2"]
@@ -0,0 +1,245 @@
+import asyncio
+import io
+import time
+import pytest
+from PIL import Image
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+from ecowander.api.admission import AdmissionController, AdmissionRejected
+from ecowander.api.endpoints import create_app
+from ecowander.config.settings import APP_SETTINGS, DATABASE_SETTINGS
+from ecowander.services.degradation import DegradationController
+from ecowander.services.profiling import SlowRequestProfiler
+from ecowander.verification.models import EcoActionVerifier
+
+PARAMS = {"lat": 35.682839, "lng": 139.759455, "challenge_type": "recycling"}
+
+def encode_image(size=(64, 48), fmt="JPEG"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 120, 150)).save(buffer, fmt)
+    return buffer.getvalue()
+
+@pytest.fixture
+def client():
+    app = create_app(verifier=EcoActionVerifier(dummy_mode=True))
+    return TestClient(app)
+
+class TestVerifyEndpoint:
+    def test_verify_upload(self, client):
+        response = client.post("/verify", params=PARAMS, content=encode_image(),
+                               headers={"Content-Type": "image/jpeg"})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["challenge_type"] == "recycling"
+        assert body["location_verification"]["score"] == 1.0
+        assert body["fraud_detection"]["is_duplicate"] is False
+
+    def test_rejects_oversized_body(self, client, monkeypatch):
+        monkeypatch.setitem(APP_SETTINGS, "max_image_size", 100)
+        response = client.post("/verify", params=PARAMS, content=encode_image())
+        assert response.status_code == 413
+
+    def test_rejects_decompression_bomb(self, client):
+        buffer = io.BytesIO()
+        Image.new("1", (6000, 5000)).save(buffer, "PNG")
+        response = client.post("/verify", params=PARAMS, content=buffer.getvalue())
+        assert response.status_code == 413
+
+    def test_rejects_pixel_count_from_header(self, client, monkeypatch):
+        monkeypatch.setitem(APP_SETTINGS, "max_image_pixels", 1000)
+        response = client.post("/verify", params=PARAMS, content=encode_image())
+        assert response.status_code == 413
+        assert "pixels" in response.json()["detail"]
+
+    def test_rejects_unsupported_format(self, client):
+        response = client.post("/verify", params=PARAMS, content=encode_image(fmt="GIF"))
+        assert response.status_code == 415
+
+    def test_rejects_garbage(self, client):
+        response = client.post("/verify", params=PARAMS, content=b"not an image")
+        assert response.status_code == 400
+
+    def test_expired_deadline_returns_partial_result(self, client, monkeypatch):
+        from ecowander.config.settings import DEADLINE_SETTINGS
+        monkeypatch.setitem(DEADLINE_SETTINGS, "request_timeout", 0)
+        response = client.post("/verify", params=PARAMS, content=encode_image())
+        assert response.status_code == 200
+        body = response.json()
+        assert "location" in body["timed_out"]
+        assert body["is_verified"] is False
+        assert client.get("/stats/stages").json()["stages"]["location"]["skipped"] >= 1
+
+    def test_response_records_quality_tier(self):
+        app = create_app(
+            verifier=EcoActionVerifier(dummy_mode=True),
+            degradation=DegradationController(forced_tier=1)
+        )
+        client = TestClient(app)
+        response = client.post("/verify", params=PARAMS, content=encode_image())
+        assert response.status_code == 200
+        assert response.json()["tier"] == 1
+        stats = client.get("/stats/degradation").json()
+        assert stats["tier"] == 1
+        assert stats["requests_per_tier"] == {"1": 1}
+        assert stats["verdict_cache"]["size"] == 1
+
+    def test_deferred_manipulation_verdict_is_stored(self, tmp_path):
+        import sqlite3
+        from ecowander.storage.writer import VerificationWriter
+
+        db_path = str(tmp_path / "ecowander.db")
+        writer = VerificationWriter(db_path, flush_interval=0.01)
+        verifier = EcoActionVerifier(dummy_mode=True)
+        recheck_queue = verifier.fraud_detector.recheck_queue
+        app = create_app(
+            verifier=verifier, writer=writer, degradation=DegradationController(forced_tier=2)
+        )
+        with TestClient(app) as client:
+            deadline = time.monotonic() + 5
+            while recheck_queue.handler is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            response = client.post("/verify", params=PARAMS, content=encode_image())
+            assert response.json()["fraud_detection"]["manipulation_deferred"] is True
+            recheck_queue.join()
+        writer.close()
+
+        with sqlite3.connect(db_path) as conn:
+            image_hash = conn.execute("SELECT image_hash FROM manipulation_rechecks").fetchone()[0]
+        assert image_hash == response.json()["fraud_detection"]["image_hash"]
+
+    def test_dump_profiled_requests(self):
+        app = create_app(
+            verifier=EcoActionVerifier(dummy_mode=True),
+            profiler=SlowRequestProfiler(sample_every=1)
+        )
+        client = TestClient(app)
+        client.post("/verify", params=PARAMS, content=encode_image())
+        captures = client.get("/debug/profiles").json()["captures"]
+        assert len(captures) == 1
+        assert captures[0]["profiled"] is True
+        assert captures[0]["metadata"]["image"] == {
+            "format": "JPEG", "width": 64, "height": 48, "bytes": len(encode_image())
+        }
+        assert "hash" in captures[0]["stage_timings"]
+
+    def test_queue_full_returns_429(self):
+        admission = AdmissionController(max_in_flight=1, max_queue=0)
+        admission.in_flight = 1
+        app = create_app(verifier=EcoActionVerifier(dummy_mode=True), admission=admission)
+        response = TestClient(app).post("/verify", params=PARAMS, content=encode_image())
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+
+    def test_upload_in_progress_uses_capacity(self):
+        admission = AdmissionController(max_in_flight=1, max_queue=0)
+        # Admitted, still streaming its body: no slot or queue place taken yet
+        admission.admitted = 1
+        app = create_app(verifier=EcoActionVerifier(dummy_mode=True), admission=admission)
+        response = TestClient(app).post("/verify", params=PARAMS, content=encode_image())
+        assert response.status_code == 429
+
+class TestAdmissionController:
+    def test_queue_timeout_returns_503(self):
+        admission = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=0.01)
+
+        async def contend():
+            async with admission.slot():
+                with pytest.raises(AdmissionRejected) as exc_info:
+                    async with admission.slot():
+                        pass
+            return exc_info.value
+
+        rejected = asyncio.run(contend())
+        assert rejected.status_code == 503
+        assert admission.in_flight == 0
+        assert admission.queued == 0
+
+    def test_admitted_requests_bound_uploads(self):
+        admission = AdmissionController(max_in_flight=1, max_queue=1)
+
+        async def upload():
+            async with admission.admit():
+                async with admission.admit():
+                    with pytest.raises(AdmissionRejected) as exc_info:
+                        async with admission.admit():
+                            pass
+            return exc_info.value
+
+        assert asyncio.run(upload()).status_code == 429
+        assert admission.admitted == 0
+
+    def test_admitted_request_may_queue_at_capacity(self):
+        admission = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5)
+
+        async def request(started: asyncio.Event, release: asyncio.Event):
+            async with admission.admit():
+                async with admission.slot():
+                    started.set()
+                    await release.wait()
+
+        async def contend():
+            first_started, second_started, release = asyncio.Event(), asyncio.Event(), asyncio.Event()
+            first = asyncio.create_task(request(first_started, release))
+            await first_started.wait()
+            second = asyncio.create_task(request(second_started, asyncio.Event()))
+            await asyncio.sleep(0.01)
+            assert admission.queued == 1
+            # Pool and queue are both taken: a third request is refused at admission
+            with pytest.raises(AdmissionRejected):
+                async with admission.admit():
+                    pass
+            release.set()
+            await first
+            await asyncio.wait_for(second_started.wait(), 1)
+            second.cancel()
+
+        asyncio.run(contend())
+        assert (admission.admitted, admission.in_flight, admission.queued) == (0, 0, 0)
+
+class TestReadiness:
+    def test_ready_with_warm_verifier(self, client):
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+    def test_not_ready_until_warmed(self, fake_model):
+        verifier = EcoActionVerifier()
+        client = TestClient(create_app(verifier=verifier))
+        assert client.get("/ready").status_code == 503
+        response = client.post("/verify", params=PARAMS, content=encode_image())
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+
+        verifier.warmup(1)
+        assert client.get("/ready").json()["warmup"]["shapes"][0]["batch_size"] == 1
+        assert client.post("/verify", params=PARAMS, content=encode_image()).status_code == 200
+
+    def test_startup_warms_verifier(self, fake_model, monkeypatch):
+        monkeypatch.setitem(DATABASE_SETTINGS, "persist_results", False)
+        verifier = EcoActionVerifier()
+        with TestClient(create_app(verifier=verifier)) as client:
+            deadline = time.monotonic() + 5
+            while not verifier.is_ready and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert client.get("/ready").status_code == 200
+
+class TestModelSwap:
+    def test_dummy_verifier_has_no_registry(self, client):
+        assert client.get("/model").status_code == 503
+
+    def test_swap_model_version(self, model_versions, monkeypatch):
+        from ecowander.config.settings import MODEL_SETTINGS
+        monkeypatch.setitem(MODEL_SETTINGS, "model_version", "v1")
+        verifier = EcoActionVerifier()
+        verifier.warmup(1)
+        client = TestClient(create_app(verifier=verifier))
+        assert client.get("/model").json() == {"version": "v1", "available": model_versions, "loading": None}
+
+        assert client.post("/model/v3").status_code == 404
+        assert client.post("/model/v2").status_code == 202
+        verifier.photo_verifier.registry.loading[1].result(timeout=10)
+        assert client.get("/ready").json()["model_version"] == "v2"
+
+        response = client.post("/verify", params=PARAMS, content=encode_image())
+        assert response.json()["model_version"] == "v2"
+        assert response.json()["photo_verification"]["model_version"] == "v2"
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+import pytest
+from ecowander.services.executors import VerificationExecutors
+from ecowander.verification import fraud_detector as fraud_module
+from ecowander.verification.fraud_detector import FraudDetector
+from ecowander.verification.models import EcoActionVerifier
+from ecowander.verification.photo_verifier import PhotoVerifier
+from ecowander.config.eco_locations import KNOWN_ECO_LOCATIONS
+
+@pytest.fixture
+def executors():
+    pools = VerificationExecutors(decode_workers=4, inference_workers=1)
+    yield pools
+    pools.shutdown()
+
+class TestAsyncAPI:
+    def test_verify_photo_async_dummy(self, executors, sample_image_path):
+        verifier = PhotoVerifier(dummy_mode=True)
+        result = asyncio.run(verifier.verify_photo_async(
+            sample_image_path, "cherry_blossom", executors=executors
+        ))
+        assert result["predicted_class"] == "cherry_blossom_activity"
+
+    def test_dummy_latency_runs_on_inference_pool(self, executors, monkeypatch):
+        verifier = PhotoVerifier(dummy_mode=True, dummy_latency=0.05)
+        calls = []
+        run_inference = executors.run_inference
+
+        async def tracking_run_inference(fn, *args):
+            calls.append(fn)
+            return await run_inference(fn, *args)
+
+        monkeypatch.setattr(executors, "run_inference", tracking_run_inference)
+        start = time.perf_counter()
+        result = asyncio.run(verifier.verify_photo_async(None, "recycling", executors=executors))
+        assert time.perf_counter() - start >= 0.05
+        assert calls == [verifier._dummy_verification]
+        assert "predicted_class" in result
+
+    def test_detect_fraud_async_duplicates(self, executors, sample_image_path):
+        detector = FraudDetector()
+
+        async def submit_twice():
+            first = await detector.detect_fraud_async(sample_image_path, executors=executors)
+            second = await detector.detect_fraud_async(sample_image_path, executors=executors)
+            return first, second
+
+        first, second = asyncio.run(submit_twice())
+        assert first["is_duplicate"] is False
+        assert second["is_duplicate"] is True
+        assert first["image_hash"] == second["image_hash"]
+
+    def test_verify_eco_action_async(self, executors, sample_image_path):
+        verifier = EcoActionVerifier(dummy_mode=True, executors=executors)
+        result = asyncio.run(verifier.verify_eco_action_async(
+            sample_image_path,
+            KNOWN_ECO_LOCATIONS[0].coordinates,
+            "recycling",
+            user_id="user-1"
+        ))
+        assert result["location_verification"]["score"] == 1.0
+        assert result["fraud_detection"]["user_id"] == "user-1"
+        assert 0 <= result["overall_score"] <= 1
+        assert result["challenge_type"] == "recycling"
+
+    def test_concurrency_limit(self, monkeypatch, sample_image_path):
+        pools = VerificationExecutors(decode_workers=8, concurrency_limits={"detect_fraud": 2})
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_hash(image_path):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return "0" * 64
+
+        monkeypatch.setattr(fraud_module, "generate_image_hash", slow_hash)
+        detector = FraudDetector()
+
+        async def submit_many():
+            await asyncio.gather(*[
+                detector.detect_fraud_async(sample_image_path, executors=pools)
+                for _ in range(8)
+            ])
+
+        try:
+            asyncio.run(submit_many())
+        finally:
+            pools.shutdown()
+        assert peak == 2
+
+    def test_unknown_limit(self, executors):
+        async def get_limit():
+            return executors.limit("not_configured")
+
+        with pytest.raises(KeyError):
+            asyncio.run(get_limit())
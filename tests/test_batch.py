@@ -0,0 +1,110 @@
+import json
+import pytest
+from PIL import Image
+from ecowander.batch import iter_directory, iter_manifest, run_batch
+
+@pytest.fixture
+def image_dir(tmp_path):
+    root = tmp_path / "images"
+    (root / "nested").mkdir(parents=True)
+    for i in range(6):
+        folder = root / "nested" if i % 2 else root
+        Image.new("RGB", (64, 48), (i * 40, 120, 200)).save(folder / f"img_{i}.jpg")
+    (root / "notes.txt").write_text("not an image")
+    return root
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+class TestBatch:
+    def test_iter_manifest_csv(self, tmp_path):
+        manifest = tmp_path / "manifest.csv"
+        manifest.write_text("path,latitude,lng,challenge,user\na.jpg,35.0,135.0,recycling,u1\n")
+        records = list(iter_manifest(str(manifest)))
+        assert records == [{
+            "image_path": str(tmp_path / "a.jpg"),
+            "lat": "35.0",
+            "lng": "135.0",
+            "challenge_type": "recycling",
+            "user_id": "u1"
+        }]
+
+    def test_iter_directory_is_sorted(self, image_dir):
+        names = [r["image_path"].split("/")[-1] for r in iter_directory(str(image_dir))]
+        assert names == ["img_0.jpg", "img_2.jpg", "img_4.jpg", "img_1.jpg", "img_3.jpg", "img_5.jpg"]
+
+    def test_run_batch_in_order(self, image_dir, tmp_path):
+        output = tmp_path / "results.jsonl"
+        summary = run_batch(
+            iter_directory(str(image_dir)), str(output),
+            workers=0, dummy_mode=True,
+            defaults={"lat": 35.682839, "lng": 139.759455, "challenge_type": "recycling"}
+        )
+        results = read_records(output)
+        assert summary["processed"] == 6
+        assert [r["record"] for r in results] == list(range(6))
+        assert all(r["result"]["location_verification"]["score"] == 1.0 for r in results)
+
+    def test_resume_after_interruption(self, image_dir, tmp_path):
+        output = tmp_path / "results.jsonl"
+        records = list(iter_directory(str(image_dir)))
+
+        def interrupted():
+            yield from records[:5]
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            run_batch(interrupted(), str(output), workers=0, dummy_mode=True,
+                      max_in_flight=2, checkpoint_every=2)
+
+        summary = run_batch(iter(records), str(output), workers=0, dummy_mode=True,
+                            resume=True, checkpoint_every=2)
+        results = read_records(output)
+        assert summary["skipped"] > 0
+        assert [r["record"] for r in results] == list(range(6))
+        assert [r["image_path"] for r in results] == [r["image_path"] for r in records]
+
+
+    def test_run_batch_persists_results(self, image_dir, tmp_path):
+        import sqlite3
+        from ecowander.storage.writer import VerificationWriter
+
+        db_path = str(tmp_path / "results.db")
+        output = tmp_path / "results.jsonl"
+        writer = VerificationWriter(db_path)
+        run_batch(iter_directory(str(image_dir)), str(output),
+                  workers=0, dummy_mode=True, writer=writer)
+        writer.close()
+
+        # Every result is stored, even when flat test images share a hash
+        records = list(read_records(output))
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM verifications").fetchone()[0] == len(records)
+
+    def test_resume_does_not_store_records_twice(self, image_dir, tmp_path):
+        import sqlite3
+        from ecowander.storage.writer import VerificationWriter
+
+        db_path = str(tmp_path / "results.db")
+        output = tmp_path / "results.jsonl"
+        records = list(iter_directory(str(image_dir)))
+        defaults = {"challenge_type": "recycling"}
+        writer = VerificationWriter(db_path)
+
+        def interrupted():
+            yield from records[:5]
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            run_batch(interrupted(), str(output), workers=0, dummy_mode=True, max_in_flight=2,
+                      checkpoint_every=3, defaults=defaults, writer=writer)
+        run_batch(iter(records), str(output), workers=0, dummy_mode=True, resume=True,
+                  checkpoint_every=3, defaults=defaults, writer=writer)
+        writer.close()
+
+        # Records after the checkpoint were verified again but stored once
+        assert writer.rows_replayed > 0
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM verifications").fetchone()[0] == len(records)
+            assert conn.execute("SELECT SUM(submissions) FROM challenge_daily_stats").fetchone()[0] == len(records)
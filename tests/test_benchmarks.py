@@ -0,0 +1,153 @@
+import asyncio
+import io
+import json
+import pytest
+from PIL import Image
+from benchmarks.compare import compare_results
+from benchmarks.corpus import (
+    DEFAULT_GPS,
+    ImageSpec,
+    encode_image,
+    image_specs,
+    synthetic_catalog
+)
+from benchmarks.import_time import import_profile, run_import_benchmarks
+from benchmarks.loadgen import HttpTarget, InProcessTarget, Workload, build_plan, run_load
+from benchmarks.run import main, run_benchmarks
+from ecowander.services.geo_utils import get_image_location
+
+class TestCorpus:
+    def test_images_are_deterministic(self):
+        spec = ImageSpec("640px", "JPEG", False)
+        assert encode_image(spec, seed=3) == encode_image(spec, seed=3)
+        assert encode_image(spec, seed=3) != encode_image(spec, seed=4)
+
+    @pytest.mark.parametrize("spec", image_specs(["640px"]), ids=lambda s: s.name)
+    def test_spec_matches_image(self, spec):
+        data = encode_image(spec)
+        with Image.open(io.BytesIO(data)) as img:
+            assert img.format == spec.format
+            assert img.size == spec.size
+
+        location = get_image_location(data)
+        if spec.gps:
+            assert location == pytest.approx(DEFAULT_GPS, abs=1e-5)
+        else:
+            assert location is None
+
+    def test_catalog_is_deterministic(self):
+        catalog = synthetic_catalog(50, seed=1)
+        assert len(catalog) == 50
+        assert catalog == synthetic_catalog(50, seed=1)
+
+class TestCompare:
+    def make(self, **medians):
+        return {"results": {name: {"p50_ms": value} for name, value in medians.items()}}
+
+    def test_flags_regressions_beyond_threshold(self):
+        baseline = self.make(a=10.0, b=10.0, c=10.0, gone=1.0)
+        current = self.make(a=13.0, b=11.0, c=5.0, extra=1.0)
+        report = compare_results(current, baseline, threshold=0.25)
+        assert [e["name"] for e in report["regressions"]] == ["a"]
+        assert [e["name"] for e in report["improvements"]] == ["c"]
+        assert [e["name"] for e in report["unchanged"]] == ["b"]
+        assert report["missing"] == ["gone"]
+        assert report["new"] == ["extra"]
+
+    def test_skipped_baseline_entries_are_ignored(self):
+        baseline = {"results": {"inference[batch1]": {"skipped": "model unavailable"}}}
+        report = compare_results(baseline, baseline)
+        assert report["missing"] == [] and report["regressions"] == []
+
+class TestRun:
+    def test_run_benchmarks(self):
+        results = run_benchmarks(
+            resolutions=["640px"], catalog_sizes=[10], min_time=0.0, include_model=False
+        )
+        names = set(results["results"])
+        assert "generate_image_hash[jpeg-640px-gps]" in names
+        assert "preprocess_image[png-640px-nogps]" in names
+        assert results["results"]["get_nearest_eco_location[10]"]["locations"] == 10
+        assert results["results"]["inference[batch1]"] == {"skipped": "model unavailable"}
+
+    def test_main_writes_json_and_compares(self, tmp_path):
+        output = tmp_path / "results.json"
+        argv = ["-o", str(output), "--resolutions", "640px", "--catalog-sizes", "10",
+                "--min-time", "0", "--no-model"]
+        assert main(argv) == 0
+
+        baseline = json.loads(output.read_text())
+        for entry in baseline["results"].values():
+            if "p50_ms" in entry:
+                entry["p50_ms"] /= 100
+        (tmp_path / "baseline.json").write_text(json.dumps(baseline))
+        assert main(argv + ["--baseline", str(tmp_path / "baseline.json")]) == 1
+
+SMALL_WORKLOAD = Workload(requests=24, duplicate_rate=0.25, resolution_mix={"640px": 1.0})
+
+class TestLoadgen:
+    def test_plan_is_deterministic(self):
+        plan = build_plan(SMALL_WORKLOAD, seed=2)
+        assert [s.image for s in plan] == [s.image for s in build_plan(SMALL_WORKLOAD, seed=2)]
+        assert {s.spec.resolution for s in plan} == {"640px"}
+        assert any(s.duplicate for s in plan)
+
+    def test_unique_images_cap(self):
+        plan = build_plan(SMALL_WORKLOAD._replace(duplicate_rate=0.0, unique_images=2))
+        assert len({s.image for s in plan}) <= 4
+
+    def test_in_process_run(self):
+        from ecowander.services.executors import VerificationExecutors
+        from ecowander.verification.models import EcoActionVerifier
+
+        executors = VerificationExecutors(decode_workers=4, inference_workers=1)
+        verifier = EcoActionVerifier(dummy_mode=True, executors=executors, dummy_latency=0.005)
+        plan = build_plan(SMALL_WORKLOAD)
+        try:
+            report = asyncio.run(run_load(InProcessTarget(verifier), plan, concurrency=4))
+        finally:
+            executors.shutdown()
+
+        assert report["completed"] == len(plan)
+        assert report["errors"] == {}
+        assert report["duplicates_detected"] == report["duplicates_sent"]
+        assert report["latency"]["p50_ms"] <= report["latency"]["p99_ms"]
+        assert report["client"]["peak_rss_mb"] > 0
+
+    def test_rate_paces_arrivals(self):
+        async def instant(submission):
+            return {"status": "ok"}
+
+        plan = build_plan(SMALL_WORKLOAD._replace(requests=10))
+        report = asyncio.run(run_load(instant, plan, concurrency=10, rate=100))
+        assert report["duration_seconds"] >= 0.09
+
+    def test_http_target(self):
+        import httpx
+        from ecowander.api.endpoints import create_app
+        from ecowander.verification.models import EcoActionVerifier
+
+        app = create_app(verifier=EcoActionVerifier(dummy_mode=True))
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+            target = HttpTarget("http://test", client=client)
+            try:
+                return await run_load(target, build_plan(SMALL_WORKLOAD._replace(requests=4)), concurrency=2)
+            finally:
+                await target.close()
+
+        report = asyncio.run(run())
+        assert report["completed"] == 4
+
+class TestImportTime:
+    def test_profile_lists_imported_packages(self):
+        profile = import_profile("ecowander.services.geo_utils")
+        assert profile["ms"] > 0
+        assert "ecowander" in profile["packages"]
+        assert "geopy" not in profile["packages"]
+
+    def test_no_eager_heavy_imports(self):
+        results = run_import_benchmarks(repeats=1)["results"]
+        forbidden = {name: r["forbidden_imports"] for name, r in results.items() if r["forbidden_imports"]}
+        assert forbidden == {}
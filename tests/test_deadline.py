@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from ecowander.services.deadline import Deadline, DeadlineExceeded, StageStats
+from ecowander.verification.fraud_detector import FraudDetector
+from ecowander.verification.location_verifier import LocationVerifier
+from ecowander.verification.models import EcoActionVerifier
+from ecowander.verification.photo_verifier import PhotoVerifier
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def stats():
+    return StageStats()
+
+class TestDeadline:
+    def test_stage_records_time_and_overrun(self, stats):
+        clock = FakeClock()
+        deadline = Deadline(1.0, min_stage_budget={"decode": 0.1}, stats=stats, clock=clock)
+        with deadline.stage("decode"):
+            clock.now += 1.5
+        assert deadline.timings["decode"] == pytest.approx(1500)
+
+        snapshot = stats.snapshot()["decode"]
+        assert (snapshot["runs"], snapshot["overruns"]) == (1, 1)
+        assert snapshot["max_overrun_ms"] == pytest.approx(500)
+
+    def test_skips_stage_without_minimum_budget(self, stats):
+        clock = FakeClock()
+        deadline = Deadline(1.0, min_stage_budget={"inference": 0.5}, stats=stats, clock=clock)
+        clock.now += 0.6
+        with pytest.raises(DeadlineExceeded) as excinfo:
+            with deadline.stage("inference"):
+                pytest.fail("stage ran without budget")
+        assert excinfo.value.stage == "inference"
+        assert stats.snapshot()["inference"]["skipped"] == 1
+
+    def test_no_timeout_never_expires(self, stats):
+        deadline = Deadline(stats=stats)
+        assert not deadline.expired
+        deadline.check("decode")
+
+class TestPartialResults:
+    def test_expired_deadline_skips_every_check(self, sample_image_path, stats):
+        verifier = EcoActionVerifier(dummy_mode=True, dummy_latency=0.01)
+        result = verifier.verify_eco_action(
+            sample_image_path, (35.68, 139.76), "recycling", deadline=Deadline(0, stats=stats)
+        )
+        assert sorted(result.timed_out) == ["hash", "inference", "location"]
+        assert result.is_verified is False
+
+        body = result.to_dict()
+        assert body["photo_verification"]["timed_out"] == "inference"
+        assert body["photo_verification"]["class_scores"] == {}
+        assert body["location_verification"] == {"score": 0.0, "timed_out": "location"}
+        assert body["fraud_detection"]["fraud_score"] == 0.5
+        assert set(stats.snapshot()) == {"hash", "inference", "location", "manipulation"}
+
+    def test_fraud_keeps_hash_when_filter_is_skipped(self, sample_image_path, stats):
+        deadline = Deadline(10, min_stage_budget={"manipulation": 60}, stats=stats)
+        result = FraudDetector().detect_fraud(sample_image_path, deadline=deadline)
+        assert result.timed_out == "manipulation"
+        assert result.image_hash
+        assert result.is_duplicate is False
+        assert result.fraud_score == 0.5
+
+    def test_async_checks_honour_deadline(self, sample_image_path, stats):
+        deadline = Deadline(10, min_stage_budget={"location": 60}, stats=stats)
+        verifier = EcoActionVerifier(dummy_mode=True)
+        result = asyncio.run(verifier.verify_eco_action_async(
+            sample_image_path, (35.68, 139.76), "recycling", deadline=deadline
+        ))
+        assert result.timed_out == ["location"]
+        assert result["photo_verification"]["predicted_class"] is not None
+        assert "location" not in deadline.timings
+        assert {"hash", "manipulation"} <= set(deadline.timings)
+
+    def test_real_model_skips_inference(self, fake_model, sample_image_path, stats):
+        verifier = PhotoVerifier()
+        deadline = Deadline(10, min_stage_budget={"inference": 60}, stats=stats)
+        result = verifier.verify_photo(sample_image_path, "recycling", deadline)
+        assert result.timed_out == "inference"
+        assert result.predicted_class is None
+        assert verifier.model.invocations == 0
+        assert stats.snapshot()["decode"]["runs"] == 1
+
+    def test_location_within_budget(self, stats):
+        result = LocationVerifier().verify_location(None, (35.68, 139.76), deadline=Deadline(10, stats=stats))
+        assert result.timed_out is None
+        assert stats.snapshot()["location"]["runs"] == 1
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+from ecowander.services.degradation import (
+    DegradationController,
+    ManipulationRecheckQueue,
+    RecheckJob,
+    VerdictCache
+)
+from ecowander.services.hashing_service import check_image_manipulation
+from ecowander.verification.fraud_detector import FraudDetector
+from ecowander.verification.models import EcoActionVerifier
+
+LOCATION = (35.68, 139.76)
+
+class TestDegradationController:
+    def test_tier_follows_queue_depth(self):
+        controller = DegradationController(queue_depth_thresholds=(2, 4, 6), forced_tier=None)
+        assert [controller.select(depth) for depth in (0, 2, 5, 100)] == [0, 1, 2, 3]
+        assert controller.stats()["requests_per_tier"] == {0: 1, 1: 1, 2: 1, 3: 1}
+
+    def test_tier_follows_recent_latency(self):
+        controller = DegradationController(
+            queue_depth_thresholds=(10, 20, 30), latency_thresholds_ms=(100, 200, 300), latency_window=10
+        )
+        for _ in range(10):
+            controller.observe(250)
+        assert controller.select(0) == 2
+        for _ in range(10):
+            controller.observe(10)
+        assert controller.select(0) == 0
+
+    def test_forced_tier(self):
+        assert DegradationController(forced_tier=3).select(0) == 3
+
+class TestVerdictCache:
+    def test_keyed_by_hash_and_model_version(self, sample_image_path):
+        result = EcoActionVerifier(dummy_mode=True).photo_verifier.verify_photo(sample_image_path)
+        cache = VerdictCache(max_size=1)
+        cache.put("abc", result)
+        assert cache.get("abc", result.model_version).scores is result.scores
+        assert cache.get("abc", "other-version") is None
+
+    def test_evicts_least_recently_used(self, sample_image_path):
+        result = EcoActionVerifier(dummy_mode=True).photo_verifier.verify_photo(sample_image_path)
+        cache = VerdictCache(max_size=1)
+        cache.put("first", result)
+        cache.put("second", result)
+        assert cache.get("first", result.model_version) is None
+        assert cache.stats() == {"size": 1, "hits": 0, "misses": 1}
+
+class TestDegradedChecks:
+    def test_thumbnail_manipulation_check(self, sample_image_path):
+        result = check_image_manipulation(sample_image_path, max_size=32)
+        assert max(result["analyzed_size"]) <= 32
+        assert "edge_variance" in result
+
+    def test_manipulation_deferred_to_recheck_queue(self, sample_image_path):
+        checked = []
+        done = threading.Event()
+
+        def handler(job, result):
+            checked.append((job, result))
+            done.set()
+
+        detector = FraudDetector(recheck_queue=ManipulationRecheckQueue(handler, max_size=4))
+        result = detector.detect_fraud(sample_image_path, user_id="user-1", tier=2)
+        assert result.manipulation_deferred is True
+        assert result.manipulation_detected is None
+        assert result.timed_out is None
+        assert result.fraud_score == 0.0
+
+        assert done.wait(10)
+        job, manipulation = checked[0]
+        assert (job.image_hash, job.user_id) == (result.image_hash, "user-1")
+        assert "analyzed_size" not in manipulation
+
+    def test_full_recheck_queue_checks_inline(self, sample_image_path):
+        recheck_queue = ManipulationRecheckQueue(max_size=1)
+        started, blocker = threading.Event(), threading.Event()
+
+        def handler(job, result):
+            started.set()
+            blocker.wait(10)
+
+        recheck_queue.handler = handler
+        recheck_queue.submit(RecheckJob(sample_image_path, None, None))
+        # The worker holds the first job, so the second fills the queue
+        assert started.wait(10)
+        assert recheck_queue.submit(RecheckJob(sample_image_path, None, None))
+
+        try:
+            result = FraudDetector(recheck_queue=recheck_queue).detect_fraud(sample_image_path, tier=2)
+            assert result.manipulation_deferred is None
+            assert "analyzed_size" in result.manipulation_detected
+            assert recheck_queue.stats()["rejected"] >= 1
+        finally:
+            blocker.set()
+
+    def test_recheck_queue_bounded_by_buffer_bytes(self, sample_image_path):
+        blocker = threading.Event()
+        recheck_queue = ManipulationRecheckQueue(
+            lambda job, result: blocker.wait(10), max_size=10, max_bytes=100
+        )
+        try:
+            assert recheck_queue.submit(RecheckJob(b"x" * 80, None, None))
+            assert not recheck_queue.submit(RecheckJob(b"x" * 80, None, None))
+            # Paths hold no buffer
+            assert recheck_queue.submit(RecheckJob(sample_image_path, None, None))
+            assert recheck_queue.stats()["pending_bytes"] == 80
+        finally:
+            blocker.set()
+        recheck_queue.join()
+        assert recheck_queue.stats()["pending_bytes"] == 0
+        assert recheck_queue.stats()["rejected"] == 1
+
+class TestTieredVerification:
+    def test_result_records_tier(self, sample_image_path):
+        result = EcoActionVerifier(dummy_mode=True).verify_eco_action(
+            sample_image_path, LOCATION, "recycling", tier=1
+        )
+        assert result.to_dict()["tier"] == 1
+        assert "analyzed_size" in result.fraud_detection.manipulation_detected
+
+    def test_tier_three_reuses_cached_verdict(self, sample_image_path):
+        verifier = EcoActionVerifier(dummy_mode=True)
+        first = verifier.verify_eco_action(sample_image_path, LOCATION, "recycling")
+        second = verifier.verify_eco_action(sample_image_path, LOCATION, "recycling", tier=3)
+        assert second.photo_verification.cached is True
+        assert second.photo_verification.predicted_class == first.photo_verification.predicted_class
+        assert second.to_dict()["photo_verification"]["cached"] is True
+        assert "cached" not in first.to_dict()["photo_verification"]
+
+    def test_async_tier_three_reuses_cached_verdict(self, sample_image_path):
+        verifier = EcoActionVerifier(dummy_mode=True)
+        verifier.verify_eco_action(sample_image_path, LOCATION, "cherry_blossom")
+        result = asyncio.run(verifier.verify_eco_action_async(
+            sample_image_path, LOCATION, "cherry_blossom", tier=3
+        ))
+        assert result.tier == 3
+        assert result.photo_verification.cached is True
+        assert result.photo_verification.predicted_class == "cherry_blossom_activity"
+        assert result.fraud_detection.manipulation_deferred is True
@@ -0,0 +1,115 @@
+import json
+import os
+import pytest
+from PIL import Image
+from ecowander.config.settings import APP_SETTINGS
+from ecowander.index_builder import build_hash_index, main
+from ecowander.services.hash_index import HashIndex, write_hash_index
+from ecowander.services.hashing_service import generate_image_hash
+from ecowander.verification.fraud_detector import FraudDetector
+
+@pytest.fixture
+def archive(tmp_path):
+    root = tmp_path / "archive"
+    (root / "2024").mkdir(parents=True)
+    for i in range(5):
+        folder = root / "2024" if i % 2 else root
+        image = Image.new("RGB", (96, 64), (i * 50, 100, 200))
+        image.paste((255, 255, 255), (i * 10, 0, i * 10 + 20, 32))
+        image.save(folder / f"photo_{i}.jpg")
+    return root
+
+def image_paths(root):
+    return sorted(str(path) for path in root.rglob("*.jpg"))
+
+class TestHashIndex:
+    def test_lookup_sorted_records(self, tmp_path):
+        path = str(tmp_path / "index.bin")
+        # Records ending in NUL bytes must not match shorter keys
+        assert write_hash_index(path, [b"\x01\x00", b"\x00\x01", b"\x01\x00"], 2) == 2
+        index = HashIndex(path)
+        assert len(index) == 2
+        assert "0100" in index and "0001" in index
+        assert "0101" not in index and "01" not in index and "zz" not in index
+        index.close()
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "index.bin"
+        path.write_bytes(b"not an index at all, just some bytes")
+        with pytest.raises(ValueError):
+            HashIndex(str(path))
+
+class TestIndexBuilder:
+    def test_build_in_process_pool(self, archive, tmp_path):
+        index_path = str(tmp_path / "index.bin")
+        summary = build_hash_index(image_paths(archive), index_path, workers=2, chunk_size=2)
+        assert (summary["files"], summary["hashed"], summary["failed"]) == (5, 5, 0)
+
+        index = HashIndex(index_path)
+        assert all(generate_image_hash(path) in index for path in image_paths(archive))
+        index.close()
+
+    def test_incremental_hashes_only_new_files(self, archive, tmp_path):
+        index_path = str(tmp_path / "index.bin")
+        build_hash_index(image_paths(archive), index_path, workers=0)
+
+        new_photo = archive / "new.png"
+        Image.new("RGB", (64, 64), (10, 200, 10)).save(new_photo)
+        summary = build_hash_index(image_paths(archive) + [str(new_photo)], index_path,
+                                   workers=0, incremental=True)
+        assert (summary["hashed"], summary["skipped"]) == (1, 5)
+
+        index = HashIndex(index_path)
+        assert generate_image_hash(str(new_photo)) in index
+        assert generate_image_hash(image_paths(archive)[0]) in index
+        index.close()
+
+    def test_incremental_drops_changed_and_deleted_files(self, archive, tmp_path):
+        index_path = str(tmp_path / "index.bin")
+        paths = image_paths(archive)
+        build_hash_index(paths, index_path, workers=0)
+        changed, deleted = paths[0], paths[1]
+        old_hashes = [generate_image_hash(changed), generate_image_hash(deleted)]
+
+        Image.new("RGB", (96, 64), (0, 0, 0)).save(changed)
+        os.utime(changed, ns=(0, 0))
+        os.remove(deleted)
+        summary = build_hash_index(image_paths(archive), index_path, workers=0, incremental=True)
+        assert (summary["hashed"], summary["skipped"], summary["dropped"]) == (1, 3, 2)
+
+        index = HashIndex(index_path)
+        assert generate_image_hash(changed) in index
+        assert not any(old_hash in index for old_hash in old_hashes)
+        index.close()
+        listed = (tmp_path / "index.bin.files").read_text().splitlines()
+        assert sorted(line.split("\t", 3)[3] for line in listed) == image_paths(archive)
+
+    def test_counts_unreadable_files(self, archive, tmp_path):
+        (archive / "broken.jpg").write_bytes(b"not a jpeg")
+        (archive / "notes.jpg").write_bytes(b"GIF89a" + bytes(32))
+        Image.new("RGB", (8, 8)).save(archive / "animation.jpg", "GIF")
+        summary = build_hash_index(image_paths(archive), str(tmp_path / "index.bin"), workers=0)
+        assert (summary["hashed"], summary["failed"]) == (5, 3)
+        assert summary["failures"] == {"invalid": 2, "format": 1}
+
+    def test_ignores_upload_limits(self, archive, tmp_path, monkeypatch):
+        monkeypatch.setitem(APP_SETTINGS, "max_image_size", 10)
+        monkeypatch.setitem(APP_SETTINGS, "max_image_pixels", 10)
+        monkeypatch.setitem(APP_SETTINGS, "max_image_dimension", 10)
+        summary = build_hash_index(image_paths(archive), str(tmp_path / "index.bin"), workers=0)
+        assert (summary["hashed"], summary["failed"]) == (5, 0)
+
+    def test_cli(self, archive, tmp_path, capsys):
+        index_path = tmp_path / "index.bin"
+        assert main([str(archive), "-o", str(index_path), "--workers", "0"]) == 0
+        assert json.loads(capsys.readouterr().err)["image_hashes"] >= 1
+        assert index_path.with_name("index.bin.files").read_text().count("\n") == 5
+
+    def test_fraud_detector_flags_indexed_photos(self, archive, tmp_path):
+        index_path = str(tmp_path / "index.bin")
+        build_hash_index(image_paths(archive), index_path, workers=0)
+
+        detector = FraudDetector(hash_index=HashIndex(index_path))
+        result = detector.detect_fraud(image_paths(archive)[0])
+        assert result.is_duplicate is True
+        assert result.fraud_score == 0.9
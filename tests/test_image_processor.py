@@ -0,0 +1,57 @@
+import io
+import numpy as np
+import pytest
+from PIL import Image
+from ecowander.services.image_processor import (
+    ImagePreprocessor,
+    RESIZE_FILTER,
+    process_image_for_model
+)
+
+def encode(img, fmt="JPEG"):
+    buffer = io.BytesIO()
+    img.save(buffer, fmt)
+    return buffer.getvalue()
+
+@pytest.fixture
+def large_jpeg():
+    gradient = np.linspace(0, 255, 4000, dtype=np.uint8)
+    pixels = np.stack([np.tile(gradient, (3000, 1))] * 3, axis=-1)
+    return encode(Image.fromarray(pixels))
+
+class TestImagePreprocessor:
+    def test_decode_large_jpeg_matches_full_decode(self, large_jpeg):
+        decoded = ImagePreprocessor((224, 224)).decode(large_jpeg)
+        assert decoded.pixels.shape == (224, 224, 3)
+        assert decoded.pixels.dtype == np.uint8
+        assert decoded.original_size == (4000, 3000)
+        assert decoded.format == "JPEG"
+
+        with Image.open(io.BytesIO(large_jpeg)) as img:
+            reference = np.asarray(img.convert("RGB").resize((224, 224), RESIZE_FILTER))
+        assert np.abs(decoded.pixels.astype(int) - reference).mean() < 2
+
+    def test_stretches_instead_of_cropping(self):
+        pixels = np.full((100, 400, 3), 255, dtype=np.uint8)
+        pixels[:, :20] = (255, 0, 0)  # Red strip on the far left
+        decoded = ImagePreprocessor((50, 50)).decode(encode(Image.fromarray(pixels), "PNG"))
+        assert tuple(decoded.pixels[25, 0]) == (255, 0, 0)
+
+    def test_rejects_disallowed_format(self):
+        gif = encode(Image.new("RGB", (10, 10)), "GIF")
+        with pytest.raises(ValueError):
+            ImagePreprocessor(allowed_formats=("JPEG", "PNG")).decode(gif)
+
+    def test_to_model_input_fills_buffer(self):
+        preprocessor = ImagePreprocessor((4, 4))
+        buffer = np.zeros((1, 4, 4, 3), dtype=np.float32)
+        pixels = np.full((4, 4, 3), 255, dtype=np.uint8)
+        result = preprocessor.to_model_input(pixels, out=buffer)
+        assert result is buffer
+        assert np.all(buffer == 1.0)
+
+    def test_process_image_for_model(self, sample_image_path):
+        result = process_image_for_model(sample_image_path, target_size=(64, 32))
+        assert result.shape == (1, 32, 64, 3)
+        assert result.dtype == np.float32
+        assert 0.0 <= result.min() and result.max() <= 1.0
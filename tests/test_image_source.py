@@ -0,0 +1,77 @@
+import io
+import pytest
+from ecowander.services.geo_utils import get_image_location
+from ecowander.services.hashing_service import check_image_manipulation, generate_image_hash
+from ecowander.services.image_processor import process_image_for_model
+from ecowander.services.image_source import (
+    BufferReader,
+    as_shared_source,
+    describe_image_source,
+    open_image_source
+)
+from ecowander.verification.models import EcoActionVerifier
+
+@pytest.fixture
+def image_bytes(sample_image_path):
+    with open(sample_image_path, "rb") as f:
+        return f.read()
+
+class NonSeekableStream(io.RawIOBase):
+    def __init__(self, data):
+        self._inner = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        return self._inner.readinto(b)
+
+class TestImageSource:
+    def test_buffer_reader_is_zero_copy_view(self):
+        data = bytearray(b"0123456789")
+        reader = BufferReader(data)
+        assert reader.read(4) == b"0123"
+        data[4:6] = b"ab"
+        assert reader.read(2) == b"ab"
+        assert reader.seek(-2, io.SEEK_END) == 8
+        assert reader.read() == b"89"
+
+    def test_all_source_types_hash_identically(self, sample_image_path, image_bytes):
+        expected = generate_image_hash(sample_image_path)
+        sources = [
+            image_bytes,
+            bytearray(image_bytes),
+            memoryview(image_bytes),
+            io.BytesIO(image_bytes),
+            NonSeekableStream(image_bytes)
+        ]
+        for source in sources:
+            assert generate_image_hash(source) == expected
+
+    def test_stream_is_rewound_between_readers(self, sample_image_path, image_bytes):
+        stream = io.BytesIO(image_bytes)
+        assert generate_image_hash(stream) == generate_image_hash(stream)
+        assert "edge_variance" in check_image_manipulation(stream)
+        assert get_image_location(stream) is None
+        assert process_image_for_model(stream).shape == (1, 224, 224, 3)
+
+    def test_as_shared_source(self, image_bytes):
+        assert as_shared_source(image_bytes) is image_bytes
+        assert as_shared_source(io.BytesIO(image_bytes)) == image_bytes
+
+    def test_verify_eco_action_reads_stream_once(self, sample_image_path, image_bytes):
+        result = EcoActionVerifier(dummy_mode=True).verify_eco_action(
+            NonSeekableStream(image_bytes), (35.68, 139.76), "recycling"
+        )
+        assert "error" not in result.fraud_detection
+        assert result.fraud_detection.image_hash == generate_image_hash(sample_image_path)
+        assert result.photo_verification.predicted_class is not None
+
+    def test_open_path_closes_file(self, sample_image_path):
+        with open_image_source(sample_image_path) as f:
+            pass
+        assert f.closed
+
+    def test_describe(self, image_bytes):
+        assert describe_image_source(memoryview(image_bytes)) == f"<{len(image_bytes)}-byte buffer>"
+        assert describe_image_source("photo.jpg") == "photo.jpg"
@@ -0,0 +1,105 @@
+import io
+import pytest
+from PIL import Image
+from ecowander.config.settings import APP_SETTINGS
+from ecowander.services.hashing_service import check_image_manipulation, generate_image_hash
+from ecowander.services.image_processor import ImagePreprocessor
+from ecowander.services.image_validation import ImageRejected, check_image, read_image_header
+
+def encode(img, fmt="PNG"):
+    buffer = io.BytesIO()
+    img.save(buffer, fmt)
+    return buffer.getvalue()
+
+@pytest.fixture(scope="module")
+def pixel_bomb():
+    """30 MP bilevel PNG: tiny on disk, 90 MB once decoded to RGB."""
+    return encode(Image.new("1", (6000, 5000)))
+
+@pytest.fixture
+def no_decode(monkeypatch):
+    """Fail the test if any pixel data is decoded."""
+    def load(self):
+        raise AssertionError("image was decoded")
+    monkeypatch.setattr(Image.Image, "load", load)
+
+class TestImageValidation:
+    def test_reads_header(self):
+        header = read_image_header(encode(Image.new("RGB", (64, 48)), "JPEG"))
+        assert (header.format, header.width, header.height, header.mode) == ("JPEG", 64, 48, "RGB")
+        assert header.byte_size > 0
+
+    def test_rejects_pixel_budget_without_decoding(self, pixel_bomb, no_decode):
+        with pytest.raises(ImageRejected) as excinfo:
+            check_image(pixel_bomb)
+        assert excinfo.value.reason == "pixels"
+
+    def test_rejects_decompression_bomb_on_open(self):
+        with pytest.raises(ImageRejected) as excinfo:
+            check_image(encode(Image.new("1", (8000, 8000))))
+        assert excinfo.value.reason == "pixels"
+
+    def test_rejects_dimensions(self):
+        with pytest.raises(ImageRejected) as excinfo:
+            check_image(encode(Image.new("1", (9000, 10))))
+        assert excinfo.value.reason == "dimensions"
+
+    def test_rejects_format_and_mode(self, monkeypatch):
+        with pytest.raises(ImageRejected) as excinfo:
+            check_image(encode(Image.new("RGB", (8, 8)), "GIF"))
+        assert excinfo.value.reason == "format"
+
+        monkeypatch.setitem(APP_SETTINGS, "allowed_image_modes", ["RGB"])
+        with pytest.raises(ImageRejected) as excinfo:
+            check_image(encode(Image.new("L", (8, 8))))
+        assert excinfo.value.reason == "mode"
+
+    def test_rejects_bytes(self, monkeypatch):
+        monkeypatch.setitem(APP_SETTINGS, "max_image_size", 10)
+        with pytest.raises(ImageRejected) as excinfo:
+            check_image(encode(Image.new("RGB", (8, 8))))
+        assert excinfo.value.reason == "bytes"
+
+    def test_none_disables_a_limit(self, monkeypatch):
+        monkeypatch.setitem(APP_SETTINGS, "max_image_size", 10)
+        monkeypatch.setitem(APP_SETTINGS, "max_image_dimension", 4)
+        header = check_image(encode(Image.new("RGB", (8, 8))), max_bytes=None, max_dimension=None)
+        assert header.width == 8
+
+    def test_hashing_skips_upload_byte_limit(self, monkeypatch):
+        monkeypatch.setitem(APP_SETTINGS, "max_image_size", 10)
+        data = encode(Image.new("RGB", (64, 64), (40, 90, 200)))
+        assert len(generate_image_hash(data)) == 64
+        assert "error" not in check_image_manipulation(data)
+        with pytest.raises(ImageRejected) as excinfo:
+            generate_image_hash(data, max_bytes=10)
+        assert excinfo.value.reason == "bytes"
+
+    def test_rejects_garbage(self):
+        with pytest.raises(ImageRejected) as excinfo:
+            check_image(b"not an image")
+        assert excinfo.value.reason == "invalid"
+
+    def test_pipeline_stages_refuse_to_decode(self, pixel_bomb, no_decode):
+        with pytest.raises(ImageRejected):
+            ImagePreprocessor().decode(pixel_bomb)
+        with pytest.raises(ImageRejected):
+            generate_image_hash(pixel_bomb)
+        assert "error" in check_image_manipulation(pixel_bomb)
+
+    def test_verifier_skips_upload_byte_limit(self, monkeypatch):
+        import asyncio
+        from ecowander.verification.models import EcoActionVerifier
+        monkeypatch.setitem(APP_SETTINGS, "max_image_size", 10)
+        data = encode(Image.new("RGB", (64, 48), (40, 90, 200)), "JPEG")
+        verifier = EcoActionVerifier(dummy_mode=True)
+        assert verifier.verify_eco_action(data, (35.68, 139.76), "recycling").fraud_detection.image_hash
+        result = asyncio.run(verifier.verify_eco_action_async(data, (35.68, 139.76), "recycling"))
+        assert result.fraud_detection.image_hash
+
+    def test_verifier_checks_header_first(self, pixel_bomb, no_decode):
+        from ecowander.verification.models import EcoActionVerifier
+        with pytest.raises(ImageRejected):
+            EcoActionVerifier(dummy_mode=True).verify_eco_action(
+                pixel_bomb, (35.68, 139.76), "recycling"
+            )
@@ -0,0 +1,110 @@
+import pytest
+from ecowander.verification import model_registry
+from ecowander.verification.photo_verifier import PhotoVerifier, preload_model
+
+class TestPreloadModel:
+    def test_workers_reuse_preloaded_interpreter(self, fake_model):
+        preload_model(warmup_iterations=2)
+        preloaded = model_registry._PRELOADED_MODELS[str(fake_model)]
+        assert preloaded.interpreter.invocations == 3  # One cold and two warm runs
+
+        first = PhotoVerifier()
+        second = PhotoVerifier()
+        assert first.model is preloaded.interpreter
+        assert second.model is preloaded.interpreter
+        assert first._inference_lock is second._inference_lock
+        assert first.is_ready
+
+    def test_swap_keeps_preloaded_model_for_other_registries(self, model_versions, sample_image_path):
+        preload_model()
+        model_path = str(model_registry.model_path_for())
+        preloaded = model_registry._PRELOADED_MODELS[model_path]
+        first = PhotoVerifier()
+        second = PhotoVerifier()
+
+        first.registry.swap("v2", warmup_iterations=1)
+        assert first.verify_photo(sample_image_path).model_version == "v2"
+        assert second.verify_photo(sample_image_path).model_version == preloaded.version
+        assert preloaded.interpreter is not None
+        assert model_registry._PRELOADED_MODELS[model_path] is preloaded
+        assert PhotoVerifier().model is preloaded.interpreter
+
+    def test_preload_is_idempotent(self, fake_model):
+        preload_model()
+        model = model_registry._PRELOADED_MODELS[str(fake_model)]
+        preload_model()
+        assert model_registry._PRELOADED_MODELS[str(fake_model)] is model
+
+    def test_fork_resets_locks(self, fake_model):
+        preload_model()
+        model = model_registry._PRELOADED_MODELS[str(fake_model)]
+        model.lock.acquire()
+        model_registry._reset_preloaded_locks()
+        assert not model.lock.locked()
+
+    def test_without_preload_loads_own_model(self, fake_model):
+        first = PhotoVerifier()
+        second = PhotoVerifier()
+        assert first.model is not second.model
+
+class TestWarmup:
+    def test_warmup_reports_latency_per_batch_size(self, fake_model):
+        verifier = PhotoVerifier()
+        assert not verifier.is_ready
+
+        report = verifier.warmup(iterations=2, batch_sizes=[4, 1])
+        assert verifier.is_ready
+        assert [s["batch_size"] for s in report["shapes"]] == [4, 1]
+        assert all(s["cold_ms"] >= 0 and s["warm_p50_ms"] >= 0 for s in report["shapes"])
+        # The serving shape is restored after warming larger batches
+        assert tuple(verifier.model.get_input_details()[0]["shape"]) == (1, 224, 224, 3)
+
+    def test_rejects_label_count_mismatch(self, fake_model):
+        fake_model.with_name("label_map.txt").write_text("0: a\n1: b\n2: c\n3: d\n4: e\n5: f\n")
+        with pytest.raises(RuntimeError):
+            PhotoVerifier()
+
+class TestInference:
+    def test_reuses_input_buffer(self, fake_model, sample_image_path):
+        verifier = PhotoVerifier()
+        buffer = verifier._input_buffer
+        first = verifier.verify_photo(sample_image_path)
+        second = verifier.verify_photo(sample_image_path)
+        assert verifier._input_buffer is buffer
+        assert first["class_scores"] == second["class_scores"]
+        assert 0.0 <= buffer.min() and buffer.max() <= 1.0
+
+class TestModelRegistry:
+    def test_results_are_tagged_with_version(self, model_versions, sample_image_path, monkeypatch):
+        from ecowander.config.settings import MODEL_SETTINGS
+        monkeypatch.setitem(MODEL_SETTINGS, "model_version", "v1")
+        verifier = PhotoVerifier()
+        assert verifier.registry.available_versions() == model_versions
+        assert verifier.verify_photo(sample_image_path)["model_version"] == "v1"
+
+        verifier.registry.swap("v2", warmup_iterations=1)
+        assert verifier.is_ready
+        assert verifier.verify_photo(sample_image_path).model_version == "v2"
+
+    def test_unversioned_model_uses_digest(self, fake_model):
+        assert PhotoVerifier().model_version.startswith("sha256-")
+
+    def test_swap_drains_in_flight_requests(self, model_versions):
+        registry = model_registry.ModelRegistry("v1")
+        with registry.lease() as old:
+            new = registry.swap("v2", warmup_iterations=1)
+            assert registry.active is new
+            # The running request still holds the old interpreter
+            assert old.interpreter is not None
+            assert not old.wait_drained(timeout=0)
+        assert old.wait_drained(timeout=0)
+        assert old.interpreter is None
+
+    def test_swap_in_background(self, model_versions):
+        registry = model_registry.ModelRegistry("v1")
+        future = registry.swap_in_background("v2", warmup_iterations=1)
+        assert future.result(timeout=10).version == "v2"
+        assert registry.version == "v2"
+
+        with pytest.raises(KeyError):
+            registry.swap_in_background("v3")
@@ -0,0 +1,68 @@
+import json
+import pstats
+import tracemalloc
+from ecowander.services.deadline import Deadline, StageStats
+from ecowander.services.profiling import RequestProfile, SlowRequestProfiler
+from ecowander.verification.models import EcoActionVerifier
+
+def busy_work():
+    return sorted(str(i) for i in range(20000))
+
+class TestSlowRequestProfiler:
+    def test_samples_one_in_n_requests(self):
+        profiler = SlowRequestProfiler(sample_every=3)
+        sampled = [profiler.start() is not None for _ in range(6)]
+        assert sampled == [False, False, True, False, False, True]
+        assert SlowRequestProfiler(sample_every=0).start() is None
+
+    def test_captures_slow_requests_without_profile(self):
+        profiler = SlowRequestProfiler(sample_every=0, slow_threshold_ms=100)
+        assert profiler.finish(None, 50) is None
+        capture = profiler.finish(None, 150, {"decode": 120.0}, {"image": {"bytes": 10}})
+        summary = capture.to_dict(10)
+        assert summary["profiled"] is False
+        assert summary["stage_timings"] == {"decode": 120.0}
+        assert "functions" not in summary
+
+    def test_keeps_slowest_captures(self):
+        profiler = SlowRequestProfiler(slow_threshold_ms=0, top_k=2)
+        for elapsed in (30, 10, 50, 20):
+            profiler.finish(None, elapsed)
+        assert [capture.elapsed_ms for capture in profiler.captures()] == [50, 30]
+
+    def test_profiles_stages(self):
+        profiler = SlowRequestProfiler(sample_every=1, slow_threshold_ms=None)
+        profile = profiler.start()
+        deadline = Deadline(profile=profile, stats=StageStats())
+        with deadline.stage("decode"):
+            busy_work()
+        capture = profiler.finish(profile, 5.0, deadline.timings)
+
+        functions = capture.to_dict(50)["functions"]
+        assert any("busy_work" in row["function"] for row in functions)
+        assert set(capture.stage_timings) == {"decode"}
+
+    def test_traces_memory(self):
+        was_tracing = tracemalloc.is_tracing()
+        profile = RequestProfile(trace_memory=True)
+        with profile.stage("decode"):
+            data = busy_work()
+        profile.finish(top_allocations=5)
+        assert data and profile.allocations
+        assert profile.peak_memory_kb > 0
+        assert tracemalloc.is_tracing() == was_tracing
+
+    def test_profiles_verification_stages(self, sample_image_path, tmp_path):
+        profiler = SlowRequestProfiler(sample_every=1)
+        profile = profiler.start()
+        deadline = Deadline(profile=profile, stats=StageStats())
+        EcoActionVerifier(dummy_mode=True).verify_eco_action(
+            sample_image_path, (35.68, 139.76), "recycling", deadline=deadline
+        )
+        profiler.finish(profile, 10.0, deadline.timings)
+
+        summaries = profiler.dump(str(tmp_path), top_functions=1000)
+        assert {"hash", "manipulation", "location"} <= set(summaries[0]["stage_timings"])
+        assert any("generate_image_hash" in row["function"] for row in summaries[0]["functions"])
+        assert pstats.Stats(summaries[0]["profile_path"]).total_calls > 0
+        assert json.loads((tmp_path / "captures.json").read_text())[0]["profiled"] is True
@@ -0,0 +1,71 @@
+import json
+import pickle
+import time
+import numpy as np
+import pytest
+from ecowander.api.schemas import VerificationResponse
+from ecowander.verification.models import EcoActionVerifier
+from ecowander.verification.results import FraudResult, LocationResult, PhotoResult
+
+LABELS = ("invalid_action", "valid_recycling", "valid_composting",
+          "valid_conservation", "cherry_blossom_activity")
+
+def photo_result(**kwargs):
+    scores = np.array([0.1, 0.7, 0.1, 0.05, 0.05], dtype=np.float32)
+    return PhotoResult(LABELS, scores, time.time(), **kwargs)
+
+class TestResults:
+    def test_photo_result_mapping_access(self):
+        result = photo_result()
+        assert result["predicted_class"] == "valid_recycling"
+        assert result["confidence"] == pytest.approx(0.7)
+        assert result["class_scores"]["invalid_action"] == pytest.approx(0.1)
+        assert result.get("is_valid") is False
+        assert "pink_pixel_ratio" not in result
+        assert result.get("pink_pixel_ratio", "absent") == "absent"
+        with pytest.raises(KeyError):
+            result["scores"]
+
+    def test_optional_keys_appear_once_set(self):
+        result = photo_result(pink_pixel_ratio=0.2, seasonal_valid=True)
+        assert result.to_dict()["pink_pixel_ratio"] == 0.2
+        assert {"pink_pixel_ratio", "seasonal_valid"} <= set(result.keys())
+
+    def test_failed_checks_keep_error_shape(self):
+        assert LocationResult(score=0.0, error="No location data provided").to_dict() == {
+            "score": 0.0, "error": "No location data provided"
+        }
+        assert FraudResult(fraud_score=0.5, error="boom").to_dict() == {
+            "fraud_score": 0.5, "error": "boom"
+        }
+        # A successful fraud check always reports user_id and metadata
+        assert FraudResult(fraud_score=0.0, image_hash="ab").to_dict() == {
+            "fraud_score": 0.0, "image_hash": "ab", "is_duplicate": None,
+            "manipulation_detected": None, "user_id": None, "metadata": None
+        }
+
+    def test_records_use_slots(self):
+        with pytest.raises(AttributeError):
+            photo_result().extra = 1
+
+    def test_verifier_results_share_labels(self, sample_image_path):
+        verifier = EcoActionVerifier(dummy_mode=True)
+        first = verifier.verify_eco_action(sample_image_path, (35.68, 139.76), "recycling")
+        second = verifier.verify_eco_action(sample_image_path, (35.68, 139.76), "recycling")
+        assert first.photo_verification.labels is second.photo_verification.labels
+        assert first["fraud_detection"]["is_duplicate"] is False
+
+    def test_serializes_to_validated_response(self, sample_image_path):
+        result = EcoActionVerifier(dummy_mode=True).verify_eco_action(
+            sample_image_path, (35.68, 139.76), "cherry_blossom", user_id="user-1"
+        )
+        body = json.loads(json.dumps(result.to_dict()))
+        response = VerificationResponse.model_validate(body)
+        assert response.photo_verification["predicted_class"] == "cherry_blossom_activity"
+        assert response.fraud_detection["user_id"] == "user-1"
+        assert response.timestamp == result.timestamp
+
+    def test_pickles_for_worker_processes(self):
+        result = pickle.loads(pickle.dumps(photo_result(is_valid=True)))
+        assert result.to_dict()["predicted_class"] == "valid_recycling"
+        assert result.is_valid is True
@@ -0,0 +1,187 @@
+import json
+import sqlite3
+import pytest
+from ecowander.storage import queries
+from ecowander.storage.database import ReadConnectionPool, connect, init_schema
+from ecowander.storage.writer import VerificationWriter, record_from_result
+
+def make_result(image_hash, is_verified=True, challenge_type="recycling",
+                timestamp="2026-04-01T10:00:00"):
+    return {
+        "is_verified": is_verified,
+        "overall_score": 0.8,
+        "photo_verification": {"confidence": 0.9, "predicted_class": "valid_recycling"},
+        "location_verification": {"score": 1.0, "distance_meters": 12.0},
+        "fraud_detection": {"fraud_score": 0.0, "image_hash": image_hash, "is_duplicate": False},
+        "timestamp": timestamp,
+        "challenge_type": challenge_type
+    }
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "ecowander.db")
+
+class TestVerificationWriter:
+    def test_batches_rows_into_transactions(self, db_path):
+        writer = VerificationWriter(db_path, batch_size=50, flush_interval=1.0)
+        for i in range(120):
+            writer.submit(make_result(f"hash-{i}"), user_id="user-1")
+        writer.close()
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM verifications").fetchone()[0] == 120
+        assert writer.rows_written == 120
+        assert writer.batches_written <= 4
+
+    def test_uses_wal(self, db_path):
+        VerificationWriter(db_path).close()
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_duplicate_hashes_are_kept_and_counted(self, db_path):
+        writer = VerificationWriter(db_path, flush_interval=0.01)
+        writer.submit(make_result("same"), user_id="u1")
+        writer.flush()
+        writer.submit(make_result("same"), user_id="u2")
+        writer.submit(make_result("same"), user_id="u2")
+        writer.close()
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM verifications").fetchone()[0] == 3
+            assert queries.get_user_stats(conn, "u2")["submissions"] == 2
+        assert (writer.rows_written, writer.duplicates_written, writer.rows_failed) == (3, 2, 0)
+
+    def test_stores_deferred_manipulation_verdicts(self, db_path):
+        from ecowander.services.degradation import RecheckJob
+        writer = VerificationWriter(db_path, flush_interval=0.01)
+        writer.submit_recheck(RecheckJob(b"", "abc", "u1"), {"is_edited": True, "edge_variance": 812.5})
+        writer.close()
+
+        with sqlite3.connect(db_path) as conn:
+            row = conn.execute(
+                "SELECT image_hash, user_id, is_edited, result FROM manipulation_rechecks"
+            ).fetchone()
+        assert row[:3] == ("abc", "u1", 1)
+        assert json.loads(row[3])["edge_variance"] == 812.5
+        assert writer.rechecks_written == 1
+
+    def test_record_from_result(self):
+        row = record_from_result(make_result("abc", is_verified=False), user_id="u1")
+        assert row[:7] == ("u1", "abc", "recycling", 0.9, 1.0, 0.0, 0)
+
+class TestDatabase:
+    def test_migrates_old_schema(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE verifications (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT,
+                    image_hash TEXT UNIQUE, challenge_type TEXT, confidence REAL,
+                    location_score REAL, fraud_score REAL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, metadata TEXT
+                )
+            """)
+            conn.execute("""
+                INSERT INTO verifications (user_id, image_hash, challenge_type, timestamp)
+                VALUES ('u1', 'a', 'recycling', '2026-03-01T09:00:00'),
+                       ('u1', 'b', 'recycling', '2026-03-02T09:00:00')
+            """)
+        conn = connect(db_path)
+        init_schema(conn)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(verifications)")}
+        assert {"is_verified", "batch_key"} <= columns
+
+        # Aggregates are backfilled from the existing history
+        assert queries.get_user_stats(conn, "u1")["submissions"] == 2
+        assert len(queries.challenge_daily_counts(conn, "recycling")) == 2
+
+    def test_drops_unique_image_hash(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE verifications (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT,
+                    image_hash TEXT UNIQUE, challenge_type TEXT, confidence REAL,
+                    location_score REAL, fraud_score REAL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, metadata TEXT
+                )
+            """)
+            conn.execute("INSERT INTO verifications (user_id, image_hash) VALUES ('u1', 'a')")
+        conn = connect(db_path)
+        init_schema(conn)
+        with conn:
+            conn.execute("INSERT INTO verifications (user_id, image_hash) VALUES ('u2', 'a')")
+
+        rows = conn.execute("SELECT user_id FROM verifications WHERE image_hash = 'a' ORDER BY id")
+        assert [row[0] for row in rows] == ["u1", "u2"]
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT 1 FROM verifications WHERE image_hash = 'a'")
+        assert "idx_verifications_image_hash" in str(plan.fetchall())
+
+    def test_read_pool_reuses_connections(self, db_path):
+        init_schema(connect(db_path))
+        pool = ReadConnectionPool(db_path, size=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            assert second is first
+        with pytest.raises(sqlite3.OperationalError):
+            second.execute("CREATE TABLE nope (id INTEGER)")
+        pool.close()
+
+@pytest.fixture
+def history(db_path):
+    writer = VerificationWriter(db_path, flush_interval=0.01)
+    for i in range(10):
+        writer.submit(
+            make_result(f"hash-{i}", is_verified=i % 3 != 0,
+                        challenge_type="recycling" if i % 2 else "cleanup",
+                        timestamp=f"2026-04-0{1 + i // 4}T10:{i:02d}:00"),
+            user_id=f"user-{i % 3}"
+        )
+    # A resubmitted photo is still a submission
+    writer.submit(make_result("hash-0"), user_id="user-0")
+    writer.close()
+    conn = connect(db_path, read_only=True)
+    yield conn
+    conn.close()
+
+class TestQueries:
+    def test_aggregates_count_inserted_rows(self, history):
+        stats = queries.get_user_stats(history, "user-0")
+        assert stats == {
+            "user_id": "user-0",
+            "submissions": 5,
+            "verified": 1,
+            "last_timestamp": "2026-04-03T10:09:00"
+        }
+        assert queries.get_user_stats(history, "nobody") is None
+
+    def test_leaderboard(self, history):
+        board = queries.leaderboard(history, limit=2)
+        assert [(row["user_id"], row["verified"]) for row in board] == [("user-1", 3), ("user-2", 3)]
+
+    def test_challenge_daily_counts(self, history):
+        counts = queries.challenge_daily_counts(history, "recycling", since="2026-04-02")
+        assert [(row["day"], row["submissions"]) for row in counts] == [
+            ("2026-04-02", 2), ("2026-04-03", 1)
+        ]
+
+    def test_recent_user_submissions(self, history):
+        rows = queries.recent_user_submissions(history, "user-1", limit=2)
+        assert [row["image_hash"] for row in rows] == ["hash-7", "hash-4"]
+        assert rows[0]["metadata"]["overall_score"] == 0.8
+
+        older = queries.recent_user_submissions(history, "user-1", before=rows[-1]["timestamp"])
+        assert [row["image_hash"] for row in older] == ["hash-1"]
+
+    def test_count_user_submissions_since(self, history):
+        assert queries.count_user_submissions_since(history, "user-2", "2026-04-02") == 2
+
+    @pytest.mark.parametrize("sql, index", [
+        ("SELECT * FROM verifications WHERE user_id = 'u' ORDER BY timestamp DESC LIMIT 5",
+         "idx_verifications_user_time"),
+        ("SELECT * FROM verifications WHERE challenge_type = 'c' ORDER BY timestamp DESC LIMIT 5",
+         "idx_verifications_challenge_time")
+    ])
+    def test_history_queries_use_indexes(self, history, sql, index):
+        plan = " ".join(row[3] for row in history.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        assert index in plan
+        assert "TEMP B-TREE" not in plan